@@ -0,0 +1,12 @@
+import os
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'SafePulseUg.settings')
+
+# ─────────────────────────────────────────────────────────────
+# CELERY APP — reads CELERY_* settings, finds apps/*/tasks.py
+# Run a worker with: celery -A SafePulseUg worker -l info
+# ─────────────────────────────────────────────────────────────
+app = Celery('SafePulseUg')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
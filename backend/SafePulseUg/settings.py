@@ -41,6 +41,7 @@ DJANGO_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -118,6 +119,29 @@ DATABASES = {
 }
 
 
+# ─────────────────────────────────────────────────────────────
+# CACHE — Redis when REDIS_CACHE_URL is set (production),
+# per-process memory otherwise (local dev and tests)
+# ─────────────────────────────────────────────────────────────
+REDIS_CACHE_URL = env('REDIS_CACHE_URL', default='')
+
+if REDIS_CACHE_URL:
+    CACHES = {
+        'default': {
+            'BACKEND':    'django.core.cache.backends.redis.RedisCache',
+            'LOCATION':   REDIS_CACHE_URL,
+            'KEY_PREFIX': 'safepulse',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND':  'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'safepulse',
+        }
+    }
+
+
 # ─────────────────────────────────────────────────────────────
 # CUSTOM USER MODEL
 # ─────────────────────────────────────────────────────────────
@@ -254,6 +278,80 @@ CELERY_RESULT_SERIALIZER  = 'json'
 CELERY_TIMEZONE           = 'Africa/Kampala'
 CELERY_TASK_TRACK_STARTED = True
 CELERY_TASK_TIME_LIMIT    = 30 * 60
+# Run tasks inline (no worker/broker) — local dev and tests only
+CELERY_TASK_ALWAYS_EAGER  = env.bool('CELERY_TASK_ALWAYS_EAGER', default=False)
+
+# Periodic tasks — run with: celery -A SafePulseUg beat -l info
+CELERY_BEAT_SCHEDULE = {
+    'refresh-hotspot-scores': {
+        'task':     'dashboard.refresh_hotspot_scores',
+        'schedule': env.int('HOTSPOT_REFRESH_MINUTES', default=15) * 60,
+    },
+    'detect-crime-anomalies': {
+        'task':     'dashboard.detect_anomalies',
+        'schedule': 60 * 60,
+    },
+    'refresh-crime-forecasts': {
+        'task':     'dashboard.refresh_forecasts',
+        'schedule': 24 * 60 * 60,
+    },
+    'fail-stale-analyses': {
+        'task':     'analysis.fail_stale_analyses',
+        'schedule': 5 * 60,
+    },
+    'fail-stale-imports': {
+        'task':     'crimes.fail_stale_imports',
+        'schedule': 5 * 60,
+    },
+}
+
+# Long bulk imports checkpoint per chunk and re-queue themselves,
+# so a single task run stays well inside the time limit.
+CRIME_IMPORT_CHUNK_SIZE   = env.int('CRIME_IMPORT_CHUNK_SIZE', default=1000)
+# A running import that commits no chunk for this long has lost its worker
+CRIME_IMPORT_STALE_MINUTES = env.int('CRIME_IMPORT_STALE_MINUTES', default=10)
+
+
+# ─────────────────────────────────────────────────────────────
+# DASHBOARD
+# ─────────────────────────────────────────────────────────────
+# Threads used by /api/dashboard/bundle/ to run independent
+# widget queries concurrently. 1 (default) runs them in order on
+# the request's connection; more adds up to that many long-lived
+# connections per process. Compare the bundle's per-widget
+# query_ms against the database round trip before raising it.
+DASHBOARD_BUNDLE_WORKERS  = env.int('DASHBOARD_BUNDLE_WORKERS', default=1)
+
+# Seconds a cached dashboard payload lives (0 disables the cache);
+# any CrimeReport write invalidates it sooner
+DASHBOARD_CACHE_TTL            = env.int('DASHBOARD_CACHE_TTL',            default=300)
+# Relative date ranges snap now() to buckets of this many seconds
+DASHBOARD_CACHE_BUCKET_SECONDS = env.int('DASHBOARD_CACHE_BUCKET_SECONDS', default=60)
+
+# Hotspot risk: a crime's weight halves every HOTSPOT_HALF_LIFE_DAYS;
+# grid cells are HOTSPOT_GRID_DEGREES square (0.05° ≈ 5.5 km)
+HOTSPOT_HALF_LIFE_DAYS         = env.float('HOTSPOT_HALF_LIFE_DAYS', default=30.0)
+HOTSPOT_GRID_DEGREES           = env.float('HOTSPOT_GRID_DEGREES',   default=0.05)
+
+# Anomaly detection: the last ANOMALY_DETECT_DAYS days of each
+# district × category series are flagged at ANOMALY_Z_THRESHOLD
+ANOMALY_DETECT_DAYS            = env.int('ANOMALY_DETECT_DAYS',      default=7)
+ANOMALY_Z_THRESHOLD            = env.float('ANOMALY_Z_THRESHOLD',    default=3.0)
+ANOMALY_MIN_COUNT              = env.int('ANOMALY_MIN_COUNT',        default=3)
+
+# Weekly forecasts: FORECAST_HORIZON_WEEKS ahead, with a central
+# FORECAST_INTERVAL prediction interval (0.8 → 10th–90th percentile)
+FORECAST_HORIZON_WEEKS         = env.int('FORECAST_HORIZON_WEEKS',   default=4)
+FORECAST_INTERVAL              = env.float('FORECAST_INTERVAL',      default=0.8)
+
+# Live feed (SSE) — Redis pub/sub fans events out across workers;
+# without it events only reach streams in the publishing process.
+# Each open stream holds a worker thread: run gunicorn with
+# --worker-class gthread and enough --threads for idle dashboards.
+LIVE_EVENTS_REDIS_URL          = env('LIVE_EVENTS_REDIS_URL', default=REDIS_CACHE_URL)
+LIVE_EVENTS_HEARTBEAT_SECONDS  = env.int('LIVE_EVENTS_HEARTBEAT_SECONDS', default=15)
+# Streams end after this long; EventSource reconnects and resumes
+LIVE_EVENTS_STREAM_SECONDS     = env.int('LIVE_EVENTS_STREAM_SECONDS',    default=300)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -262,6 +360,27 @@ CELERY_TASK_TIME_LIMIT    = 30 * 60
 GROQ_API_KEY = env('GROQ_API_KEY', default='')
 GROQ_MODEL   = env('GROQ_MODEL',   default='llama-3.3-70b-versatile')
 
+# One pooled HTTP client per process, kept alive between requests
+GROQ_HTTP_MAX_CONNECTIONS   = env.int('GROQ_HTTP_MAX_CONNECTIONS',     default=20)
+GROQ_HTTP_KEEPALIVE_SECONDS = env.float('GROQ_HTTP_KEEPALIVE_SECONDS', default=60.0)
+GROQ_HTTP_TIMEOUT_SECONDS   = env.float('GROQ_HTTP_TIMEOUT_SECONDS',   default=60.0)
+
+# Client-side pacing against the Groq quota, shared by every worker
+# through Redis (per process without it). Calls queue for up to
+# GROQ_LIMITER_MAX_WAIT_SECONDS; 429s back off exponentially with
+# jitter, never sooner than Retry-After.
+GROQ_REQUESTS_PER_MINUTE      = env.int('GROQ_REQUESTS_PER_MINUTE',        default=30)
+GROQ_TOKENS_PER_MINUTE        = env.int('GROQ_TOKENS_PER_MINUTE',          default=12000)
+GROQ_LIMITER_REDIS_URL        = env('GROQ_LIMITER_REDIS_URL',              default=REDIS_CACHE_URL)
+GROQ_LIMITER_MAX_WAIT_SECONDS = env.float('GROQ_LIMITER_MAX_WAIT_SECONDS', default=120.0)
+GROQ_MAX_RETRIES              = env.int('GROQ_MAX_RETRIES',                default=3)
+GROQ_BACKOFF_BASE_SECONDS     = env.float('GROQ_BACKOFF_BASE_SECONDS',     default=2.0)
+GROQ_BACKOFF_MAX_SECONDS      = env.float('GROQ_BACKOFF_MAX_SECONDS',      default=60.0)
+
+# Agent tools answer within about this many tokens; bigger results
+# become grouped counts plus a page of the most relevant cases
+AGENT_TOOL_TOKEN_BUDGET       = env.int('AGENT_TOOL_TOKEN_BUDGET',         default=2000)
+
 # ─────────────────────────────────────────────────────────────
 # GOOGLE GEMINI AI — BACKUP
 # ─────────────────────────────────────────────────────────────
@@ -1,6 +1,11 @@
 import logging
+import threading
 import time
+import groq
+import httpx
 from django.conf            import settings
+from django.core.signals    import setting_changed
+from django.dispatch        import receiver
 from langchain_groq         import ChatGroq
 from langgraph.prebuilt     import create_react_agent
 
@@ -8,6 +13,7 @@ from langgraph.prebuilt     import create_react_agent
 # from langchain_google_genai import ChatGoogleGenerativeAI
 
 from .prompts   import SYSTEM_PROMPT
+from .ratelimit import RateLimitCallback, backoff_seconds, limiter, retry_after_seconds
 from .tools     import ALL_TOOLS
 
 logger = logging.getLogger('apps.analysis')
@@ -16,12 +22,16 @@ logger = logging.getLogger('apps.analysis')
 # ─────────────────────────────────────────────────────────────
 # BUILD LLM — Groq (Primary: Free & Fast)
 # ─────────────────────────────────────────────────────────────
-def get_llm():
+def get_llm(http_client=None):
     return ChatGroq(
         api_key     = settings.GROQ_API_KEY,
         model_name  = settings.GROQ_MODEL,
         temperature = 0.3,
         max_tokens  = 4096,
+        http_client = http_client,
+        # Retries and pacing happen here (invoke_with_retry + limiter)
+        max_retries = 0,
+        callbacks   = [RateLimitCallback()],
     )
 
 
@@ -35,42 +45,105 @@ def get_llm():
 #     )
 
 
+# ─────────────────────────────────────────────────────────────
+# SHARED AGENT — one client and compiled graph per process
+# Built on first use and reused by every request: the httpx
+# client keeps connections to Groq alive between chat turns and
+# the ReAct graph is compiled once. It is rebuilt when the Groq
+# model or key changes, or after reset_agent().
+# ─────────────────────────────────────────────────────────────
+_agent_lock  = threading.Lock()
+_agent_cache = {'key': None, 'agent': None}
+
+
+def agent_settings_key():
+    return (settings.GROQ_MODEL, settings.GROQ_API_KEY)
+
+
+def get_agent():
+    key = agent_settings_key()
+    if _agent_cache['key'] == key:
+        return _agent_cache['agent']
+
+    with _agent_lock:
+        if _agent_cache['key'] != key:
+            http_client = httpx.Client(
+                limits  = httpx.Limits(
+                    max_connections           = settings.GROQ_HTTP_MAX_CONNECTIONS,
+                    max_keepalive_connections = settings.GROQ_HTTP_MAX_CONNECTIONS,
+                    keepalive_expiry          = settings.GROQ_HTTP_KEEPALIVE_SECONDS,
+                ),
+                timeout = settings.GROQ_HTTP_TIMEOUT_SECONDS,
+            )
+            try:
+                agent = create_react_agent(get_llm(http_client), ALL_TOOLS)
+            except Exception:
+                http_client.close()
+                raise
+            # The old client is not closed: requests still running on
+            # the previous agent finish on it, then it is collected
+            _agent_cache.update(key=key, agent=agent)
+            logger.info(f"Groq agent built | model: {settings.GROQ_MODEL}")
+        return _agent_cache['agent']
+
+
+def reset_agent():
+    # Next request rebuilds the client and graph (e.g. after a settings change)
+    with _agent_lock:
+        _agent_cache.update(key=None, agent=None)
+
+
+@receiver(setting_changed)
+def reset_agent_on_setting_change(setting, **kwargs):
+    if setting.startswith('GROQ_'):
+        reset_agent()
+
+
+def timed_agent():
+    # The shared agent, logging how long this request waited for it
+    started = time.perf_counter()
+    agent   = get_agent()
+    logger.info(f"Agent setup: {(time.perf_counter() - started) * 1000:.1f} ms")
+    return agent
+
+
 # ─────────────────────────────────────────────────────────────
 # HELPER — Run with retry on rate limit
+# Calls are already paced by the shared limiter; a 429 that
+# still gets through pauses every worker for Retry-After, and
+# this call retries after a jittered exponential backoff.
 # ─────────────────────────────────────────────────────────────
-def invoke_with_retry(agent, messages, max_retries=3, wait_seconds=30):
+def is_rate_limit(error):
+    return isinstance(error, groq.RateLimitError) or getattr(error, 'status_code', None) == 429
+
+
+def invoke_with_retry(agent, messages, max_retries=None):
     """
     Invoke the agent with automatic retry on rate limit (429) errors.
     """
+    max_retries = max_retries or settings.GROQ_MAX_RETRIES
     for attempt in range(1, max_retries + 1):
         try:
             return agent.invoke({"messages": messages})
 
         except Exception as e:
-            error_str = str(e)
+            if not is_rate_limit(e):
+                raise
 
-            is_rate_limit = (
-                '429'                in error_str or
-                'rate_limit'         in error_str.lower() or
-                'RESOURCE_EXHAUSTED' in error_str or
-                'Too Many Requests'  in error_str
-            )
-
-            if is_rate_limit and attempt < max_retries:
-                logger.warning(
-                    f"Rate limit hit (attempt {attempt}/{max_retries}). "
-                    f"Waiting {wait_seconds}s before retry..."
-                )
-                time.sleep(wait_seconds)
-                continue
-
-            elif is_rate_limit and attempt == max_retries:
+            if attempt == max_retries:
                 raise Exception(
                     f"Rate limit exceeded after {max_retries} attempts. "
                     f"Please wait a minute and try again."
                 )
-            else:
-                raise e
+
+            retry_after = retry_after_seconds(e)
+            limiter.rate_limited(retry_after)
+            delay       = backoff_seconds(attempt, retry_after)
+            logger.warning(
+                f"Rate limit hit (attempt {attempt}/{max_retries}). "
+                f"Retry-After: {retry_after}; waiting {delay:.1f}s before retry..."
+            )
+            time.sleep(delay)
 
     raise Exception("Max retries reached.")
 
@@ -86,8 +159,7 @@ def run_agent(prompt: str) -> dict:
     try:
         logger.info(f"Running Groq agent | model: {settings.GROQ_MODEL} | prompt: {prompt[:80]}...")
 
-        llm   = get_llm()
-        agent = create_react_agent(llm, ALL_TOOLS)
+        agent = timed_agent()
 
         messages = [
             {"role": "system", "content": SYSTEM_PROMPT},
@@ -113,6 +185,21 @@ def run_agent(prompt: str) -> dict:
         }
 
 
+# ─────────────────────────────────────────────────────────────
+# HELPER — System prompt, prior turns, then the new message
+# ─────────────────────────────────────────────────────────────
+def history_messages(prompt: str, history: list) -> list:
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+    for msg in history:
+        if msg['role'] in ('user', 'assistant'):
+            messages.append({
+                "role":    msg['role'],
+                "content": msg['content'],
+            })
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
 # ─────────────────────────────────────────────────────────────
 # RUN AGENT — With conversation history
 # ─────────────────────────────────────────────────────────────
@@ -124,22 +211,8 @@ def run_agent_with_history(prompt: str, history: list) -> dict:
     try:
         logger.info(f"Running Groq agent with {len(history)} history messages...")
 
-        llm   = get_llm()
-        agent = create_react_agent(llm, ALL_TOOLS)
-
-        # System prompt first
-        messages = [{"role": "system", "content": SYSTEM_PROMPT}]
-
-        # Add history
-        for msg in history:
-            if msg['role'] in ('user', 'assistant'):
-                messages.append({
-                    "role":    msg['role'],
-                    "content": msg['content'],
-                })
-
-        # Current message
-        messages.append({"role": "user", "content": prompt})
+        agent    = timed_agent()
+        messages = history_messages(prompt, history)
 
         result   = invoke_with_retry(agent, messages)
         response = result["messages"][-1].content
@@ -157,4 +230,89 @@ def run_agent_with_history(prompt: str, history: list) -> dict:
             "success":  False,
             "response": None,
             "error":    str(e),
-        }
\ No newline at end of file
+        }
+
+
+# ─────────────────────────────────────────────────────────────
+# STREAM AGENT — With conversation history, event by event
+# Yields (event, data) as the ReAct loop runs:
+#   ('tool',  {'name', 'args', 'label'})   a tool is being called
+#   ('token', {'text'})                    assistant text as it arrives
+#   ('done',  {'response', 'first_token_ms', 'total_ms'})
+#   ('error', {'error'})
+# A rate limit before anything was sent is retried like
+# invoke_with_retry; after that the stream ends with an error.
+# ─────────────────────────────────────────────────────────────
+TOOL_LABELS = {
+    'get_all_crimes':          'Looking through recent crime reports',
+    'get_crimes_by_category':  'Querying {category} crimes',
+    'get_crimes_by_district':  'Querying crimes in {district}',
+    'get_crimes_by_status':    'Querying {crime_status} cases',
+    'get_recent_crimes':       'Querying crimes from the last {days} days',
+    'get_crime_summary_stats': 'Computing crime statistics',
+    'get_single_crime':        'Looking up case {case_number}',
+}
+
+
+def tool_label(name, args):
+    try:
+        return TOOL_LABELS[name].format(**args) + '…'
+    except (KeyError, IndexError):
+        return f"Running {name}…"
+
+
+def stream_agent_with_history(prompt: str, history: list):
+    started     = time.perf_counter()
+    first_token = None
+    response    = ''
+    try:
+        logger.info(f"Streaming Groq agent with {len(history)} history messages...")
+        agent    = timed_agent()
+        messages = history_messages(prompt, history)
+
+        max_retries = settings.GROQ_MAX_RETRIES
+        for attempt in range(1, max_retries + 1):
+            sent = False
+            try:
+                stream = agent.stream({"messages": messages}, stream_mode=["messages", "updates"])
+                for mode, payload in stream:
+                    if mode == "updates":
+                        # A finished agent step: its tool calls, or the answer
+                        for message in (payload.get("agent") or {}).get("messages", []):
+                            for call in getattr(message, "tool_calls", None) or []:
+                                sent = True
+                                yield 'tool', {
+                                    'name':  call['name'],
+                                    'args':  call['args'],
+                                    'label': tool_label(call['name'], call['args']),
+                                }
+                            if not getattr(message, "tool_calls", None):
+                                response = message.content
+                        continue
+
+                    chunk, metadata = payload
+                    if metadata.get("langgraph_node") != "agent" or not isinstance(chunk.content, str) or not chunk.content:
+                        continue
+                    if first_token is None:
+                        first_token = time.perf_counter()
+                    sent = True
+                    yield 'token', {'text': chunk.content}
+                break
+
+            except Exception as e:
+                if sent or not is_rate_limit(e) or attempt == max_retries:
+                    raise
+                retry_after = retry_after_seconds(e)
+                limiter.rate_limited(retry_after)
+                delay       = backoff_seconds(attempt, retry_after)
+                logger.warning(f"Rate limit hit while streaming (attempt {attempt}/{max_retries}); waiting {delay:.1f}s")
+                time.sleep(delay)
+
+        total_ms       = round((time.perf_counter() - started) * 1000, 1)
+        first_token_ms = round((first_token - started) * 1000, 1) if first_token else None
+        logger.info(f"✅ Groq agent stream completed | first token: {first_token_ms} ms | total: {total_ms} ms")
+        yield 'done', {'response': response, 'first_token_ms': first_token_ms, 'total_ms': total_ms}
+
+    except Exception as e:
+        logger.error(f"Groq agent stream error: {e}")
+        yield 'error', {'error': str(e)}
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-17 04:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('analysis', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='analysisresult',
+            name='started_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
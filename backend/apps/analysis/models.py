@@ -56,6 +56,7 @@ class AnalysisResult(models.Model):
 
     # ── Timestamps ───────────────────────────────────────────
     created_at      = models.DateTimeField(auto_now_add=True)
+    started_at      = models.DateTimeField(null=True, blank=True)   # claimed by a worker
     completed_at    = models.DateTimeField(null=True, blank=True)
 
     class Meta:
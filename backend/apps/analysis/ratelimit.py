@@ -0,0 +1,313 @@
+import logging
+import random
+import threading
+import time
+from uuid                       import UUID
+import redis
+from django.conf                import settings
+from langchain_core.callbacks   import BaseCallbackHandler
+
+logger = logging.getLogger('apps.analysis')
+
+
+# ─────────────────────────────────────────────────────────────
+# LLM RATE LIMITER — Groq requests/min and tokens/min
+# Two token buckets refill continuously at the configured quota.
+# Every LLM call takes one request and its estimated tokens
+# before it is sent, waiting until both buckets can pay; the
+# estimate is corrected with the real usage once it returns.
+# With Redis the buckets are shared by every worker process (one
+# Lua script checks and takes both atomically); without it, or
+# while Redis is unreachable, each process limits itself.
+# A 429 pauses the shared buckets for Retry-After, so workers
+# stop together instead of retrying in lockstep.
+# ─────────────────────────────────────────────────────────────
+BUCKET_KEY = 'safepulse:llm:bucket'
+PAUSE_KEY  = 'safepulse:llm:pause'
+STATS_KEY  = 'safepulse:llm:stats'
+STAT_NAMES = ('calls', 'waited_calls', 'wait_seconds', 'rate_limited', 'timeouts')
+
+
+class RateLimitTimeout(Exception):
+    pass
+
+
+def refill(requests, tokens, elapsed, rpm, tpm):
+    return (
+        min(rpm, requests + elapsed * rpm / 60),
+        min(tpm, tokens + elapsed * tpm / 60),
+    )
+
+
+def shortfall_seconds(requests, tokens, needed, rpm, tpm):
+    # Seconds until both buckets can pay; 0 when they already can
+    wait = 0.0
+    if requests < 1:
+        wait = (1 - requests) * 60 / rpm
+    if tokens < needed:
+        wait = max(wait, (needed - tokens) * 60 / tpm)
+    return wait
+
+
+# ── In-process buckets ───────────────────────────────────────
+class LocalBuckets:
+
+    def __init__(self):
+        self.lock         = threading.Lock()
+        self.state        = None               # (requests, tokens, at)
+        self.paused_until = 0.0
+        self.stats        = dict.fromkeys(STAT_NAMES, 0.0)
+
+    def take(self, needed, rpm, tpm):
+        with self.lock:
+            now = time.monotonic()
+            if now < self.paused_until:
+                return self.paused_until - now
+            requests, tokens, at = self.state or (rpm, tpm, now)
+            requests, tokens     = refill(requests, tokens, now - at, rpm, tpm)
+            wait = shortfall_seconds(requests, tokens, needed, rpm, tpm)
+            if not wait:
+                requests, tokens = requests - 1, tokens - needed
+            self.state = (requests, tokens, now)
+            return wait
+
+    def adjust(self, delta):
+        with self.lock:
+            if self.state:
+                requests, tokens, at = self.state
+                self.state = (requests, tokens + delta, at)
+
+    def pause(self, seconds):
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def record(self, **counts):
+        with self.lock:
+            for name, value in counts.items():
+                self.stats[name] += value
+
+    def read_stats(self):
+        with self.lock:
+            return dict(self.stats)
+
+
+# ── Redis buckets ────────────────────────────────────────────
+TAKE_SCRIPT = """
+local clock = redis.call('TIME')
+local now   = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local pause = redis.call('PTTL', KEYS[2])
+if pause > 0 then
+    return tostring(pause / 1000)
+end
+
+local rpm, tpm, needed = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+local state    = redis.call('HMGET', KEYS[1], 'requests', 'tokens', 'at')
+local requests = tonumber(state[1]) or rpm
+local tokens   = tonumber(state[2]) or tpm
+local elapsed  = math.max(0, now - (tonumber(state[3]) or now))
+requests = math.min(rpm, requests + elapsed * rpm / 60)
+tokens   = math.min(tpm, tokens + elapsed * tpm / 60)
+
+local wait = 0
+if requests < 1 then
+    wait = (1 - requests) * 60 / rpm
+end
+if tokens < needed then
+    wait = math.max(wait, (needed - tokens) * 60 / tpm)
+end
+if wait == 0 then
+    requests = requests - 1
+    tokens   = tokens - needed
+end
+redis.call('HSET', KEYS[1], 'requests', tostring(requests), 'tokens', tostring(tokens), 'at', tostring(now))
+redis.call('EXPIRE', KEYS[1], 120)
+return tostring(wait)
+"""
+
+ADJUST_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('HINCRBYFLOAT', KEYS[1], 'tokens', ARGV[1])
+end
+"""
+
+
+class RedisBuckets:
+
+    def __init__(self, url):
+        self.client        = redis.Redis.from_url(url, socket_timeout=2)
+        self.take_script   = self.client.register_script(TAKE_SCRIPT)
+        self.adjust_script = self.client.register_script(ADJUST_SCRIPT)
+
+    def take(self, needed, rpm, tpm):
+        return float(self.take_script(keys=[BUCKET_KEY, PAUSE_KEY], args=[rpm, tpm, needed]))
+
+    def adjust(self, delta):
+        self.adjust_script(keys=[BUCKET_KEY], args=[delta])
+
+    def pause(self, seconds):
+        # Only ever extends an existing pause
+        milliseconds = max(1, int(seconds * 1000))
+        if self.client.pttl(PAUSE_KEY) < milliseconds:
+            self.client.set(PAUSE_KEY, 1, px=milliseconds)
+
+    def record(self, **counts):
+        pipe = self.client.pipeline(transaction=False)
+        for name, value in counts.items():
+            pipe.hincrbyfloat(STATS_KEY, name, value)
+        pipe.execute()
+
+    def read_stats(self):
+        stored = self.client.hgetall(STATS_KEY)
+        return {name: float(stored.get(name.encode(), 0)) for name in STAT_NAMES}
+
+
+# ─────────────────────────────────────────────────────────────
+# LIMITER — Redis when available, this process otherwise
+# ─────────────────────────────────────────────────────────────
+class Limiter:
+
+    def __init__(self, url=None):
+        self.local  = LocalBuckets()
+        self.shared = RedisBuckets(url) if url else None
+
+    def call(self, method, *args, **kwargs):
+        if self.shared:
+            try:
+                return getattr(self.shared, method)(*args, **kwargs)
+            except redis.RedisError as e:
+                logger.warning(f"LLM limiter: Redis unavailable ({e}); limiting this process only")
+        return getattr(self.local, method)(*args, **kwargs)
+
+    def acquire(self, tokens):
+        """
+        Blocks until one request and `tokens` tokens are available
+        (a call larger than the whole minute's budget waits for a
+        full bucket). Returns the seconds waited.
+        """
+        rpm, tpm = settings.GROQ_REQUESTS_PER_MINUTE, settings.GROQ_TOKENS_PER_MINUTE
+        needed   = min(tokens, tpm)
+        started  = time.monotonic()
+        deadline = started + settings.GROQ_LIMITER_MAX_WAIT_SECONDS
+        waited   = 0.0
+        while True:
+            wait = self.call('take', needed, rpm, tpm)
+            if not wait:
+                break
+            if time.monotonic() + wait > deadline:
+                self.call('record', timeouts=1)
+                raise RateLimitTimeout(
+                    'The AI service is at its rate limit. Please wait a minute and try again.'
+                )
+            # A little jitter so queued callers don't all retry at once
+            time.sleep(wait + random.uniform(0, min(wait, 1.0)))
+            waited = time.monotonic() - started
+
+        self.call('record', calls=1, waited_calls=int(waited > 0), wait_seconds=waited)
+        if waited:
+            logger.info(f"LLM limiter: waited {waited:.2f}s for {needed} tokens")
+        return waited
+
+    def adjust(self, delta):
+        if delta:
+            self.call('adjust', delta)
+
+    def rate_limited(self, retry_after=None):
+        # A 429 got through: everyone holds off for Retry-After
+        if retry_after:
+            self.call('pause', retry_after)
+        self.call('record', rate_limited=1)
+
+    def stats(self):
+        stats = self.call('read_stats')
+        calls = stats['calls']
+        return {
+            'requests_per_minute':  settings.GROQ_REQUESTS_PER_MINUTE,
+            'tokens_per_minute':    settings.GROQ_TOKENS_PER_MINUTE,
+            'shared':               self.shared is not None,
+            'calls':                int(calls),
+            'waited_calls':         int(stats['waited_calls']),
+            'rate_limited':         int(stats['rate_limited']),
+            'timeouts':             int(stats['timeouts']),
+            'wait_seconds_total':   round(stats['wait_seconds'], 3),
+            'wait_seconds_average': round(stats['wait_seconds'] / calls, 3) if calls else 0.0,
+        }
+
+
+limiter = Limiter(settings.GROQ_LIMITER_REDIS_URL)
+
+
+# ─────────────────────────────────────────────────────────────
+# BACKOFF — after a 429
+# ─────────────────────────────────────────────────────────────
+def retry_after_seconds(error):
+    response = getattr(error, 'response', None)
+    value    = response.headers.get('retry-after') if response is not None else None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_seconds(attempt, retry_after=None):
+    """
+    Full-jitter exponential backoff, never shorter than the
+    provider's Retry-After.
+    """
+    ceiling = min(settings.GROQ_BACKOFF_MAX_SECONDS, settings.GROQ_BACKOFF_BASE_SECONDS * 2 ** (attempt - 1))
+    jitter  = random.uniform(0, ceiling)
+    return retry_after + jitter if retry_after is not None else jitter
+
+
+# ─────────────────────────────────────────────────────────────
+# CALLBACK — meters every chat model call the agent makes
+# ─────────────────────────────────────────────────────────────
+def estimate_tokens(messages, max_tokens=0):
+    # ~4 characters per token, plus the completion Groq reserves
+    characters = sum(len(str(message.content)) for batch in messages for message in batch)
+    return characters // 4 + 4 * sum(len(batch) for batch in messages) + (max_tokens or 0)
+
+
+def used_tokens(response):
+    """
+    Tokens the call really used: llm_output's token_usage, or the
+    messages' usage_metadata for streamed generations (which
+    usually leave llm_output empty). None when neither is reported.
+    """
+    usage = (response.llm_output or {}).get('token_usage') or {}
+    if usage.get('total_tokens'):
+        return usage['total_tokens']
+    totals = []
+    for batch in response.generations:
+        for generation in batch:
+            metadata = getattr(getattr(generation, 'message', None), 'usage_metadata', None) or {}
+            totals.append(metadata.get('total_tokens') or 0)
+    return sum(totals) or None
+
+
+class RateLimitCallback(BaseCallbackHandler):
+    raise_error = True
+
+    def __init__(self):
+        self.estimates = {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id: UUID, **kwargs):
+        params     = kwargs.get('invocation_params') or {}
+        max_tokens = params.get('max_tokens') or 0
+        estimate   = estimate_tokens(messages, max_tokens)
+        limiter.acquire(estimate)
+        self.estimates[run_id] = (estimate, max_tokens)
+
+    def on_llm_end(self, response, *, run_id: UUID, **kwargs):
+        if run_id not in self.estimates:
+            return
+        estimate, max_tokens = self.estimates.pop(run_id)
+        used = used_tokens(response)
+        if used is None:
+            # No usage reported: swap the reserved completion for the
+            # length of what actually came back
+            text = sum(len(generation.text) for batch in response.generations for generation in batch)
+            used = estimate - max_tokens + text // 4
+        limiter.adjust(estimate - used)
+
+    def on_llm_error(self, error, *, run_id: UUID, **kwargs):
+        self.estimates.pop(run_id, None)
@@ -26,6 +26,7 @@ class AnalysisResultSerializer(serializers.ModelSerializer):
             'status',
             'error_message',
             'created_at',
+            'started_at',
             'completed_at',
         ]
 
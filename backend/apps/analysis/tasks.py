@@ -0,0 +1,94 @@
+import logging
+from datetime                   import timedelta
+from celery                     import shared_task
+from django.conf                import settings
+from django.db                  import transaction
+from django.db.models           import Q
+from django.utils               import timezone
+
+from apps.dashboard.live        import publish
+from .agent                     import run_agent
+from .models                    import AnalysisResult, AnalysisStatus
+
+logger = logging.getLogger('apps.analysis')
+
+
+# ─────────────────────────────────────────────────────────────
+# ENQUEUE — safe to call from a request (after commit)
+# ─────────────────────────────────────────────────────────────
+def enqueue_analysis(analysis_id):
+    try:
+        run_analysis_task.delay(analysis_id)
+    except Exception as e:
+        logger.error(f"Could not queue analysis {analysis_id}: {e}")
+        AnalysisResult.objects.filter(pk=analysis_id).update(
+            status        = AnalysisStatus.FAILED,
+            error_message = f'Could not queue analysis: {e}',
+            completed_at  = timezone.now(),
+        )
+        publish('analysis', {'id': analysis_id, 'status': AnalysisStatus.FAILED})
+
+
+# ─────────────────────────────────────────────────────────────
+# TASK — Run the AI agent for a queued analysis
+# PENDING → PROCESSING → COMPLETED / FAILED. Only a pending
+# analysis is claimed, so a redelivered task never runs twice.
+# ─────────────────────────────────────────────────────────────
+@shared_task(name='analysis.run_analysis')
+def run_analysis_task(analysis_id):
+    claimed = AnalysisResult.objects.filter(pk=analysis_id, status=AnalysisStatus.PENDING).update(
+        status     = AnalysisStatus.PROCESSING,
+        started_at = timezone.now(),
+    )
+    if not claimed:
+        logger.warning(f"Analysis {analysis_id} is not pending; skipping")
+        return
+    analysis = AnalysisResult.objects.select_related('crime_report').get(pk=analysis_id)
+    publish('analysis', {'id': analysis.pk, 'status': AnalysisStatus.PROCESSING})
+
+    result = run_agent(analysis.prompt)
+
+    with transaction.atomic():
+        if result['success']:
+            analysis.ai_summary   = result['response']
+            analysis.status       = AnalysisStatus.COMPLETED
+            analysis.completed_at = timezone.now()
+            analysis.save(update_fields=['ai_summary', 'status', 'completed_at'])
+            if analysis.crime_report:
+                analysis.crime_report.is_analyzed = True
+                analysis.crime_report.save()
+            logger.info(f"Analysis {analysis.pk} completed")
+        else:
+            analysis.status        = AnalysisStatus.FAILED
+            analysis.error_message = result['error']
+            analysis.completed_at  = timezone.now()
+            analysis.save(update_fields=['status', 'error_message', 'completed_at'])
+        publish('analysis', {'id': analysis.pk, 'status': analysis.status})
+    return analysis.status
+
+
+# ─────────────────────────────────────────────────────────────
+# TASK — Fail analyses whose worker died (every 5 min, Celery beat)
+# A run cannot outlive CELERY_TASK_TIME_LIMIT, so anything still
+# PROCESSING after that never reports back on its own.
+# ─────────────────────────────────────────────────────────────
+@shared_task(name='analysis.fail_stale_analyses')
+def fail_stale_analyses_task():
+    cutoff = timezone.now() - timedelta(seconds=settings.CELERY_TASK_TIME_LIMIT)
+    stale  = list(
+        AnalysisResult.objects
+        .filter(status=AnalysisStatus.PROCESSING)
+        .filter(Q(started_at__lt=cutoff) | Q(started_at__isnull=True, created_at__lt=cutoff))
+        .values_list('pk', flat=True)
+    )
+    if not stale:
+        return 0
+    AnalysisResult.objects.filter(pk__in=stale, status=AnalysisStatus.PROCESSING).update(
+        status        = AnalysisStatus.FAILED,
+        error_message = 'Analysis timed out: the worker stopped before it finished.',
+        completed_at  = timezone.now(),
+    )
+    for pk in stale:
+        publish('analysis', {'id': pk, 'status': AnalysisStatus.FAILED})
+    logger.warning(f"Marked {len(stale)} stale analyses as failed: {stale}")
+    return len(stale)
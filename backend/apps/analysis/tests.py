@@ -1,3 +1,200 @@
-from django.test import TestCase
+import uuid
+from datetime                   import timedelta
+from unittest                   import mock
+from django.test                import TestCase, override_settings
+from django.urls                import reverse
+from django.utils               import timezone
+from rest_framework.test        import APIClient
+from langchain_core.messages    import AIMessage, HumanMessage
+from langchain_core.outputs     import ChatGeneration, LLMResult
 
-# Create your tests here.
+from apps.accounts.models       import OfficerUser
+from apps.analysis              import ratelimit, tools
+from apps.analysis.models       import AnalysisResult, AnalysisStatus, ConversationMessage
+from apps.analysis.tasks        import fail_stale_analyses_task
+from apps.crimes.models         import CrimeReport
+
+
+# ─────────────────────────────────────────────────────────────
+# STALE ANALYSES — a dead worker's job is failed, not left spinning
+# ─────────────────────────────────────────────────────────────
+@override_settings(CELERY_TASK_TIME_LIMIT=30 * 60)
+class StaleAnalysisTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+
+    def analysis(self, status_, started_minutes_ago):
+        return AnalysisResult.objects.create(
+            requested_by = self.officer,
+            prompt       = 'p',
+            status       = status_,
+            started_at   = timezone.now() - timedelta(minutes=started_minutes_ago),
+        )
+
+    def test_fails_only_processing_past_the_time_limit(self):
+        stale   = self.analysis(AnalysisStatus.PROCESSING, 45)
+        running = self.analysis(AnalysisStatus.PROCESSING, 5)
+        done    = self.analysis(AnalysisStatus.COMPLETED, 45)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(fail_stale_analyses_task(), 1)
+
+        stale.refresh_from_db()
+        self.assertEqual(stale.status, AnalysisStatus.FAILED)
+        self.assertIn('timed out', stale.error_message)
+        self.assertIsNotNone(stale.completed_at)
+        self.assertEqual(AnalysisResult.objects.get(pk=running.pk).status, AnalysisStatus.PROCESSING)
+        self.assertEqual(AnalysisResult.objects.get(pk=done.pk).status, AnalysisStatus.COMPLETED)
+
+
+# ─────────────────────────────────────────────────────────────
+# STREAMED CHAT — only answered turns stay in the conversation
+# ─────────────────────────────────────────────────────────────
+class AgentChatStreamTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def stream(self, events, read=None):
+        # Reads the whole reply, or only `read` events before disconnecting
+        with mock.patch('apps.analysis.views.stream_agent_with_history', return_value=iter(events)):
+            response = self.client.post(reverse('agent-chat-stream'), {'message': 'Robberies in Gulu?'}, format='json')
+            content  = iter(response.streaming_content)
+            chunks   = list(content) if read is None else [next(content) for _ in range(read)]
+            response.close()
+        return b''.join(chunks).decode()
+
+    def test_answered_turn_is_saved(self):
+        body = self.stream([('token', {'text': 'Two.'}), ('done', {'response': 'Two.'})])
+
+        self.assertIn('event: done', body)
+        self.assertEqual(
+            list(ConversationMessage.objects.values_list('role', 'content')),
+            [('user', 'Robberies in Gulu?'), ('assistant', 'Two.')],
+        )
+
+    def test_failed_turn_drops_the_question(self):
+        body = self.stream([('error', {'error': 'Rate limited'})])
+
+        self.assertIn('event: error', body)
+        self.assertFalse(ConversationMessage.objects.exists())
+
+    def test_disconnect_drops_the_question(self):
+        body = self.stream([('token', {'text': 'Two'}), ('done', {'response': 'Two.'})], read=2)
+
+        self.assertIn('event: token', body)
+        self.assertFalse(ConversationMessage.objects.exists())
+
+
+# ─────────────────────────────────────────────────────────────
+# LLM RATE LIMITER — in-process buckets and usage refunds
+# ─────────────────────────────────────────────────────────────
+@override_settings(GROQ_REQUESTS_PER_MINUTE=30, GROQ_TOKENS_PER_MINUTE=12000, GROQ_LIMITER_MAX_WAIT_SECONDS=0)
+class LocalLimiterTests(TestCase):
+
+    def setUp(self):
+        self.limiter = ratelimit.Limiter()
+
+    def tokens(self):
+        return self.limiter.local.state[1]
+
+    def test_acquire_takes_and_adjust_refunds(self):
+        self.assertEqual(self.limiter.acquire(5000), 0.0)
+        self.assertAlmostEqual(self.tokens(), 7000, delta=5)
+
+        self.limiter.adjust(4000)
+        self.assertAlmostEqual(self.tokens(), 11000, delta=5)
+        self.assertEqual(self.limiter.stats()['calls'], 1)
+
+    def test_acquire_times_out_when_the_bucket_is_short(self):
+        self.limiter.acquire(10000)
+        with self.assertRaises(ratelimit.RateLimitTimeout):
+            self.limiter.acquire(5000)
+        self.assertEqual(self.limiter.stats()['timeouts'], 1)
+
+    def test_streamed_call_refunds_from_usage_metadata(self):
+        callback = ratelimit.RateLimitCallback()
+        messages = [[HumanMessage(content='x' * 400)]]
+        reply    = AIMessage(content='Two robberies.', usage_metadata={
+            'input_tokens': 104, 'output_tokens': 6, 'total_tokens': 110,
+        })
+        run_id   = uuid.uuid4()
+
+        with mock.patch.object(ratelimit, 'limiter', self.limiter):
+            callback.on_chat_model_start({}, messages, run_id=run_id, invocation_params={'max_tokens': 4096})
+            self.assertAlmostEqual(self.tokens(), 12000 - 104 - 4096, delta=5)
+            # Streamed generations leave llm_output empty
+            callback.on_llm_end(LLMResult(generations=[[ChatGeneration(message=reply)]]), run_id=run_id)
+
+        self.assertAlmostEqual(self.tokens(), 12000 - 110, delta=5)
+
+
+# ─────────────────────────────────────────────────────────────
+# AGENT TOOLS — listings stay within the token budget
+# ─────────────────────────────────────────────────────────────
+@override_settings(AGENT_TOOL_TOKEN_BUDGET=2000)
+class CrimeListingBudgetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        severities = ['low', 'medium', 'high', 'critical']
+        CrimeReport.objects.bulk_create([
+            CrimeReport(
+                case_number   = f'UPF-TEST-{i:03d}',
+                title         = f'Case {i}',
+                category      = 'robbery' if i < 200 else 'arson',
+                severity      = severities[i % 4],
+                district      = 'Kampala',
+                description   = 'Armed men entered the shop and took cash and phones. ' * 3,
+                location      = f'Location {i % 7}',
+                date_occurred = timezone.now(),
+            )
+            for i in range(203)
+        ])
+
+    def listing(self, category, **args):
+        # limit=100 so the token budget, not the page size, sets the cut
+        return tools.get_crimes_by_category.invoke({'category': category, 'limit': 100, **args})
+
+    def cases(self, text):
+        return [line for line in text.splitlines() if line.startswith('- Case:')]
+
+    def test_small_result_is_listed_in_full(self):
+        text = self.listing('arson')
+
+        self.assertTrue(text.startswith('Found 3 '))
+        self.assertEqual(len(self.cases(text)), 3)
+        self.assertNotIn('BY STATUS', text)
+
+    def test_first_page_leads_with_counts(self):
+        text = self.listing('robbery')
+
+        self.assertLessEqual(len(text), 2000 * tools.CHARS_PER_TOKEN)
+        self.assertIn('BY STATUS', text)
+        self.assertIn('TOP LOCATIONS', text)
+        self.assertIn('critical', self.cases(text)[0])
+        self.assertIn(f'offset={len(self.cases(text))}', text)
+
+    def test_later_pages_spend_the_budget_on_rows(self):
+        first  = self.listing('robbery')
+        offset = len(self.cases(first))
+
+        # COUNT and the page of rows; no GROUP BY queries
+        with self.assertNumQueries(2):
+            text = self.listing('robbery', offset=offset)
+
+        self.assertLessEqual(len(text), 2000 * tools.CHARS_PER_TOKEN)
+        self.assertNotIn('BY STATUS', text)
+        self.assertGreater(len(self.cases(text)), offset)
+        self.assertIn(f'Showing cases {offset + 1}–', text)
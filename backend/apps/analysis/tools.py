@@ -1,35 +1,139 @@
 import logging
-from datetime                   import datetime, timedelta
+from datetime                   import timedelta
+from django.conf                import settings
+from django.db.models           import Case, Count, IntegerField, Value, When
+from django.db.models.functions import TruncMonth
 from django.utils               import timezone
 from langchain_core.tools       import tool          # ← updated import
 
 logger = logging.getLogger('apps.analysis')
 
 
+# ─────────────────────────────────────────────────────────────
+# TOKEN BUDGET — every tool answer must fit AGENT_TOOL_TOKEN_BUDGET
+# A listing that fits comes back row by row. A bigger one comes
+# back as grouped counts (status, severity, month, top locations)
+# plus a page of the most relevant rows — most severe, then most
+# recent — as many as the remaining budget allows, and how to ask
+# for the next page. Later pages skip the counts (the agent has
+# them already) and spend the whole budget on rows.
+# ─────────────────────────────────────────────────────────────
+CHARS_PER_TOKEN = 4
+MAX_PAGE_SIZE   = 100
+
+SEVERITY_RANK = Case(
+    When(severity='critical', then=Value(4)),
+    When(severity='high',     then=Value(3)),
+    When(severity='medium',   then=Value(2)),
+    default=Value(1),
+    output_field=IntegerField(),
+)
+
+
+def budget_chars():
+    return settings.AGENT_TOOL_TOKEN_BUDGET * CHARS_PER_TOKEN
+
+
+def within_budget(text):
+    limit = budget_chars()
+    if len(text) <= limit:
+        return text
+    return text[:limit].rsplit('\n', 1)[0] + '\n… (truncated to fit the token budget)'
+
+
+def counts_section(title, rows, key, label=None):
+    lines = [f"{title}:"] + [f"  - {label(row) if label else row[key]}: {row['count']}" for row in rows]
+    return '\n'.join(lines)
+
+
+def aggregates(reports):
+    """
+    Grouped counts for the whole matching set, a handful of small
+    GROUP BY queries regardless of how many rows match.
+    """
+    by_status   = reports.values('status').annotate(count=Count('id')).order_by('-count')
+    by_severity = reports.values('severity').annotate(count=Count('id')).order_by('-count')
+    by_month    = (
+        reports.filter(date_reported__gte=timezone.now() - timedelta(days=365))
+        .annotate(month=TruncMonth('date_reported'))
+        .values('month').annotate(count=Count('id')).order_by('month')
+    )
+    by_place    = reports.values('location', 'district').annotate(count=Count('id')).order_by('-count')[:5]
+    return '\n\n'.join([
+        counts_section('BY STATUS', by_status, 'status'),
+        counts_section('BY SEVERITY', by_severity, 'severity'),
+        counts_section('BY MONTH (last 12)', by_month, 'month', lambda row: row['month'].strftime('%b %Y')),
+        counts_section('TOP LOCATIONS', by_place, 'location', lambda row: f"{row['location']}, {row['district']}"),
+    ])
+
+
+def crime_listing(reports, heading, line, offset=0, limit=25, fields=()):
+    """
+    reports: the matching queryset; line(report) renders one row.
+    Returns the tool answer, within the token budget.
+    """
+    offset = max(0, int(offset or 0))
+    limit  = max(1, min(int(limit or 25), MAX_PAGE_SIZE))
+    total  = reports.count()
+    if not total:
+        return None
+
+    rows   = (
+        reports.annotate(severity_rank=SEVERITY_RANK)
+        .order_by('-severity_rank', '-date_reported', '-id')
+        .only('case_number', 'title', 'date_occurred', *fields)[offset:offset + limit]
+    )
+    lines = [line(r) for r in rows]
+    if not lines:
+        return f"Found {total} {heading}; offset {offset} is past the end."
+
+    listing = '\n'.join(lines)
+    if not offset and total <= limit and len(listing) <= budget_chars():
+        return f"Found {total} {heading}:\n\n{listing}\n"
+
+    # Over budget: counts for everything on the first page, then as many rows as fit
+    if offset:
+        summary = f"Found {total} {heading} (counts were given with the first page).\n\n"
+    else:
+        summary = f"Found {total} {heading} — too many to list in full.\n\n{aggregates(reports)}\n\n"
+    room    = budget_chars() - len(summary) - 200
+    shown   = []
+    for text in lines:
+        room -= len(text) + 1
+        if room < 0:
+            break
+        shown.append(text)
+    last   = offset + len(shown)
+    footer = f"Showing cases {offset + 1}–{last} of {total}, most severe and most recent first."
+    if last < total:
+        footer += f" For more, call again with offset={last}."
+    return within_budget(summary + "CASES:\n" + '\n'.join(shown) + '\n\n' + footer + '\n')
+
+
 # ─────────────────────────────────────────────────────────────
 # TOOL 1 — Get All Crimes
 # ─────────────────────────────────────────────────────────────
 @tool
-def get_all_crimes(limit: int = 50) -> str:
+def get_all_crimes(limit: int = 50, offset: int = 0) -> str:
     """
     Fetch all crime reports from the database.
     Returns a formatted summary of crime reports.
-    Use limit to control how many records to retrieve (default 50).
+    Use limit to control how many records to retrieve (default 50)
+    and offset to read further.
     """
     try:
         from apps.crimes.models import CrimeReport
-        reports = CrimeReport.objects.all().order_by('-date_reported')[:limit]
-        if not reports:
-            return "No crime reports found in the database."
-        result = f"Found {reports.count()} crime reports:\n\n"
-        for r in reports:
-            result += (
+        result = crime_listing(
+            CrimeReport.objects.all(), 'crime reports',
+            lambda r: (
                 f"- Case: {r.case_number} | {r.title} | "
                 f"Category: {r.category} | Severity: {r.severity} | "
                 f"Status: {r.status} | District: {r.district} | "
-                f"Date: {r.date_occurred.strftime('%Y-%m-%d')}\n"
-            )
-        return result
+                f"Date: {r.date_occurred.strftime('%Y-%m-%d')}"
+            ),
+            offset, limit, fields=('category', 'severity', 'status', 'district'),
+        )
+        return result or "No crime reports found in the database."
     except Exception as e:
         logger.error(f"get_all_crimes error: {e}")
         return f"Error retrieving crimes: {str(e)}"
@@ -39,30 +143,29 @@ def get_all_crimes(limit: int = 50) -> str:
 # TOOL 2 — Get Crimes by Category
 # ─────────────────────────────────────────────────────────────
 @tool
-def get_crimes_by_category(category: str) -> str:
+def get_crimes_by_category(category: str, offset: int = 0, limit: int = 25) -> str:
     """
     Fetch crime reports filtered by category.
     Categories: theft, assault, homicide, fraud, cybercrime,
     robbery, burglary, drug_offense, sexual_offense,
     vandalism, kidnapping, arson, corruption, other
+    Large results come back as counts plus the most severe and
+    recent cases; use offset / limit to read further.
     """
     try:
         from apps.crimes.models import CrimeReport
-        reports = CrimeReport.objects.filter(
-            category__iexact=category
-        ).order_by('-date_reported')
-        if not reports.exists():
-            return f"No crime reports found for category: {category}"
-        result = f"Found {reports.count()} {category} cases:\n\n"
-        for r in reports:
-            result += (
+        result = crime_listing(
+            CrimeReport.objects.filter(category__iexact=category), f'{category} cases',
+            lambda r: (
                 f"- Case: {r.case_number} | {r.title} | "
                 f"Severity: {r.severity} | Status: {r.status} | "
                 f"Location: {r.location}, {r.district} | "
                 f"Date: {r.date_occurred.strftime('%Y-%m-%d')}\n"
-                f"  Description: {r.description[:150]}...\n"
-            )
-        return result
+                f"  Description: {r.description[:150]}..."
+            ),
+            offset, limit, fields=('severity', 'status', 'location', 'district', 'description'),
+        )
+        return result or f"No crime reports found for category: {category}"
     except Exception as e:
         logger.error(f"get_crimes_by_category error: {e}")
         return f"Error retrieving crimes by category: {str(e)}"
@@ -72,27 +175,26 @@ def get_crimes_by_category(category: str) -> str:
 # TOOL 3 — Get Crimes by District
 # ─────────────────────────────────────────────────────────────
 @tool
-def get_crimes_by_district(district: str) -> str:
+def get_crimes_by_district(district: str, offset: int = 0, limit: int = 25) -> str:
     """
     Fetch all crime reports from a specific district or location.
     Example: 'Kampala', 'Wakiso', 'Mukono'
+    Large results come back as counts plus the most severe and
+    recent cases; use offset / limit to read further.
     """
     try:
         from apps.crimes.models import CrimeReport
-        reports = CrimeReport.objects.filter(
-            district__icontains=district
-        ).order_by('-date_reported')
-        if not reports.exists():
-            return f"No crime reports found for district: {district}"
-        result = f"Found {reports.count()} crimes in {district}:\n\n"
-        for r in reports:
-            result += (
+        result = crime_listing(
+            CrimeReport.objects.filter(district__icontains=district), f'crimes in {district}',
+            lambda r: (
                 f"- Case: {r.case_number} | {r.title} | "
                 f"Category: {r.category} | Severity: {r.severity} | "
                 f"Status: {r.status} | "
-                f"Date: {r.date_occurred.strftime('%Y-%m-%d')}\n"
-            )
-        return result
+                f"Date: {r.date_occurred.strftime('%Y-%m-%d')}"
+            ),
+            offset, limit, fields=('category', 'severity', 'status'),
+        )
+        return result or f"No crime reports found for district: {district}"
     except Exception as e:
         logger.error(f"get_crimes_by_district error: {e}")
         return f"Error retrieving crimes by district: {str(e)}"
@@ -102,27 +204,26 @@ def get_crimes_by_district(district: str) -> str:
 # TOOL 4 — Get Crimes by Status
 # ─────────────────────────────────────────────────────────────
 @tool
-def get_crimes_by_status(crime_status: str) -> str:
+def get_crimes_by_status(crime_status: str, offset: int = 0, limit: int = 25) -> str:
     """
     Fetch crime reports by their investigation status.
     Statuses: reported, under_investigation, solved, closed, cold_case
+    Large results come back as counts plus the most severe and
+    recent cases; use offset / limit to read further.
     """
     try:
         from apps.crimes.models import CrimeReport
-        reports = CrimeReport.objects.filter(
-            status__iexact=crime_status
-        ).order_by('-date_reported')
-        if not reports.exists():
-            return f"No crime reports found with status: {crime_status}"
-        result = f"Found {reports.count()} cases with status '{crime_status}':\n\n"
-        for r in reports:
-            result += (
+        result = crime_listing(
+            CrimeReport.objects.filter(status__iexact=crime_status), f"cases with status '{crime_status}'",
+            lambda r: (
                 f"- Case: {r.case_number} | {r.title} | "
                 f"Category: {r.category} | Severity: {r.severity} | "
                 f"District: {r.district} | "
-                f"Date: {r.date_occurred.strftime('%Y-%m-%d')}\n"
-            )
-        return result
+                f"Date: {r.date_occurred.strftime('%Y-%m-%d')}"
+            ),
+            offset, limit, fields=('category', 'severity', 'district'),
+        )
+        return result or f"No crime reports found with status: {crime_status}"
     except Exception as e:
         logger.error(f"get_crimes_by_status error: {e}")
         return f"Error retrieving crimes by status: {str(e)}"
@@ -132,28 +233,27 @@ def get_crimes_by_status(crime_status: str) -> str:
 # TOOL 5 — Get Recent Crimes
 # ─────────────────────────────────────────────────────────────
 @tool
-def get_recent_crimes(days: int = 7) -> str:
+def get_recent_crimes(days: int = 7, offset: int = 0, limit: int = 25) -> str:
     """
     Fetch crime reports from the last N days.
     Default is last 7 days. Use days=30 for last month.
+    Large results come back as counts plus the most severe and
+    recent cases; use offset / limit to read further.
     """
     try:
         from apps.crimes.models import CrimeReport
-        since   = timezone.now() - timedelta(days=days)
-        reports = CrimeReport.objects.filter(
-            date_reported__gte=since
-        ).order_by('-date_reported')
-        if not reports.exists():
-            return f"No crime reports found in the last {days} days."
-        result = f"Found {reports.count()} crimes in the last {days} days:\n\n"
-        for r in reports:
-            result += (
+        since  = timezone.now() - timedelta(days=days)
+        result = crime_listing(
+            CrimeReport.objects.filter(date_reported__gte=since), f'crimes in the last {days} days',
+            lambda r: (
                 f"- Case: {r.case_number} | {r.title} | "
                 f"Category: {r.category} | Severity: {r.severity} | "
                 f"District: {r.district} | "
-                f"Date: {r.date_occurred.strftime('%Y-%m-%d %H:%M')}\n"
-            )
-        return result
+                f"Date: {r.date_occurred.strftime('%Y-%m-%d %H:%M')}"
+            ),
+            offset, limit, fields=('category', 'severity', 'district'),
+        )
+        return result or f"No crime reports found in the last {days} days."
     except Exception as e:
         logger.error(f"get_recent_crimes error: {e}")
         return f"Error retrieving recent crimes: {str(e)}"
@@ -170,7 +270,6 @@ def get_crime_summary_stats(placeholder: str = "") -> str:
     """
     try:
         from apps.crimes.models import CrimeReport
-        from django.db.models   import Count
 
         total = CrimeReport.objects.count()
         if total == 0:
@@ -204,7 +303,7 @@ def get_crime_summary_stats(placeholder: str = "") -> str:
         for item in by_district:
             result += f"  - {item['district']}: {item['count']} cases\n"
 
-        return result
+        return within_budget(result)
     except Exception as e:
         logger.error(f"get_crime_summary_stats error: {e}")
         return f"Error retrieving stats: {str(e)}"
@@ -259,7 +358,7 @@ def get_single_crime(case_number: str) -> str:
                 name = 'Anonymous' if w.is_anonymous else w.name
                 result += f"  - {name}: {w.statement[:100]}\n"
 
-        return result
+        return within_budget(result)
 
     except CrimeReport.DoesNotExist:
         return f"No crime report found with case number: {case_number}"
@@ -3,8 +3,10 @@ from .views import (
     AnalyzeCrimeReportView,
     GeneralAnalysisView,
     AgentChatView,
+    AgentChatStreamView,
     AnalysisResultsListView,
     AnalysisResultDetailView,
+    LLMLimiterView,
 )
 
 urlpatterns = [
@@ -14,9 +16,13 @@ urlpatterns = [
 
     # Chat with agent
     path('chat/',                       AgentChatView.as_view(), name='agent-chat'),
+    path('chat/stream/',                AgentChatStreamView.as_view(), name='agent-chat-stream'),
     path('chat/<str:session_id>/',      AgentChatView.as_view(), name='agent-chat-history'),
 
     # Results
     path('results/',        AnalysisResultsListView.as_view(),  name='analysis-results'),
     path('results/<int:pk>/', AnalysisResultDetailView.as_view(), name='analysis-result-detail'),
+
+    # Rate limiter metrics
+    path('limiter/',        LLMLimiterView.as_view(),           name='llm-limiter'),
 ]
\ No newline at end of file
@@ -1,28 +1,52 @@
+import json
 import logging
 import uuid
-from django.utils               import timezone
+from django.db                  import transaction
+from django.http                import StreamingHttpResponse
+from django.urls                import reverse
 from rest_framework             import status
 from rest_framework.views       import APIView
 from rest_framework.response    import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers   import JSONRenderer
 from drf_spectacular.utils      import extend_schema, OpenApiExample
 
 from apps.crimes.models         import CrimeReport
-from .models                    import AnalysisResult, AgentConversation, ConversationMessage, AnalysisStatus
+from apps.dashboard.streaming   import EventStreamRenderer
+from .models                    import AnalysisResult, AgentConversation, ConversationMessage
 from .serializers               import AnalysisResultSerializer, AgentConversationSerializer
-from .agent                     import run_agent, run_agent_with_history
+from .agent                     import run_agent_with_history, stream_agent_with_history
 from .prompts                   import SINGLE_REPORT_PROMPT, GENERAL_ANALYSIS_PROMPT
+from .ratelimit                 import limiter
+from .tasks                     import enqueue_analysis
 
 logger = logging.getLogger('apps.analysis')
 
 
+# ─────────────────────────────────────────────────────────────
+# HELPER — Queue a pending analysis and answer 202
+# The agent runs in a Celery worker; clients poll the result URL
+# or wait for an `analysis` event on the dashboard live feed.
+# ─────────────────────────────────────────────────────────────
+def queued_response(request, analysis):
+    transaction.on_commit(lambda: enqueue_analysis(analysis.pk))
+    return Response({
+        'message':    'Analysis queued.',
+        'analysis':   AnalysisResultSerializer(analysis).data,
+        'status_url': request.build_absolute_uri(reverse('analysis-result-detail', args=[analysis.pk])),
+    }, status=status.HTTP_202_ACCEPTED)
+
+
 # ─────────────────────────────────────────────────────────────
 # ANALYZE SINGLE REPORT
 # ─────────────────────────────────────────────────────────────
 @extend_schema(
     tags=['🤖 AI Analysis'],
     summary='Analyze a specific crime report with AI',
-    description='Triggers the Gemini AI agent to deeply analyze a crime report and compare with historical data.',
+    description=(
+        'Queues the AI agent to deeply analyze a crime report and compare with historical data. '
+        'Returns 202 with a pending analysis; poll `status_url` until it is completed or failed.'
+    ),
     examples=[
         OpenApiExample(
             'Analyze Report Example',
@@ -75,31 +99,9 @@ class AnalyzeCrimeReportView(APIView):
             requested_by = request.user,
             crime_report = report,
             prompt       = prompt,
-            status       = AnalysisStatus.PROCESSING,
         )
-
-        result = run_agent(prompt)
-
-        if result['success']:
-            analysis.ai_summary   = result['response']
-            analysis.status       = AnalysisStatus.COMPLETED
-            analysis.completed_at = timezone.now()
-            analysis.save()
-            report.is_analyzed = True
-            report.save()
-            logger.info(f"Analysis completed for {case_number}")
-            return Response({
-                'message':  'Analysis completed successfully.',
-                'analysis': AnalysisResultSerializer(analysis).data,
-            }, status=status.HTTP_200_OK)
-        else:
-            analysis.status        = AnalysisStatus.FAILED
-            analysis.error_message = result['error']
-            analysis.save()
-            return Response({
-                'error':   'Analysis failed.',
-                'details': result['error'],
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        logger.info(f"Analysis #{analysis.pk} queued for {case_number}")
+        return queued_response(request, analysis)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -108,7 +110,10 @@ class AnalyzeCrimeReportView(APIView):
 @extend_schema(
     tags=['🤖 AI Analysis'],
     summary='Run a general analysis on all crime data',
-    description='AI agent analyzes all crime data and returns patterns, hotspots, trends and recommendations.',
+    description=(
+        'Queues the AI agent to analyze all crime data for patterns, hotspots, trends and recommendations. '
+        'Returns 202 with a pending analysis; poll `status_url` until it is completed or failed.'
+    ),
     examples=[
         OpenApiExample(
             'Custom Prompt Example',
@@ -125,26 +130,54 @@ class GeneralAnalysisView(APIView):
         analysis = AnalysisResult.objects.create(
             requested_by = request.user,
             prompt       = custom_prompt,
-            status       = AnalysisStatus.PROCESSING,
         )
-        result = run_agent(custom_prompt)
-        if result['success']:
-            analysis.ai_summary   = result['response']
-            analysis.status       = AnalysisStatus.COMPLETED
-            analysis.completed_at = timezone.now()
-            analysis.save()
-            return Response({
-                'message':  'General analysis completed.',
-                'analysis': AnalysisResultSerializer(analysis).data,
-            }, status=status.HTTP_200_OK)
-        else:
-            analysis.status        = AnalysisStatus.FAILED
-            analysis.error_message = result['error']
-            analysis.save()
-            return Response({
-                'error':   'Analysis failed.',
-                'details': result['error'],
-            }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+        logger.info(f"General analysis #{analysis.pk} queued")
+        return queued_response(request, analysis)
+
+
+# ─────────────────────────────────────────────────────────────
+# HELPER — Find or start the conversation and record the message
+# Returns (conversation, message, prior history) or an error Response.
+# ─────────────────────────────────────────────────────────────
+def start_turn(request):
+    message    = request.data.get('message')
+    session_id = request.data.get('session_id')
+
+    if not message:
+        return Response(
+            {'error': 'message is required.'},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    if session_id:
+        try:
+            conversation = AgentConversation.objects.get(
+                session_id=session_id,
+                officer=request.user
+            )
+        except AgentConversation.DoesNotExist:
+            return Response(
+                {'error': 'Conversation not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+    else:
+        conversation = AgentConversation.objects.create(
+            officer    = request.user,
+            session_id = str(uuid.uuid4()),
+            title      = message[:80],
+        )
+
+    history = [
+        {'role': msg.role, 'content': msg.content}
+        for msg in conversation.messages.all()
+    ]
+
+    question = ConversationMessage.objects.create(
+        conversation = conversation,
+        role         = ConversationMessage.Role.USER,
+        content      = message,
+    )
+    return conversation, question, history
 
 
 # ─────────────────────────────────────────────────────────────
@@ -178,43 +211,11 @@ class AgentChatView(APIView):
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
-        message    = request.data.get('message')
-        session_id = request.data.get('session_id')
-
-        if not message:
-            return Response(
-                {'error': 'message is required.'},
-                status=status.HTTP_400_BAD_REQUEST
-            )
-
-        if session_id:
-            try:
-                conversation = AgentConversation.objects.get(
-                    session_id=session_id,
-                    officer=request.user
-                )
-            except AgentConversation.DoesNotExist:
-                return Response(
-                    {'error': 'Conversation not found.'},
-                    status=status.HTTP_404_NOT_FOUND
-                )
-        else:
-            conversation = AgentConversation.objects.create(
-                officer    = request.user,
-                session_id = str(uuid.uuid4()),
-                title      = message[:80],
-            )
-
-        history = [
-            {'role': msg.role, 'content': msg.content}
-            for msg in conversation.messages.all()
-        ]
-
-        ConversationMessage.objects.create(
-            conversation = conversation,
-            role         = ConversationMessage.Role.USER,
-            content      = message,
-        )
+        turn = start_turn(request)
+        if isinstance(turn, Response):
+            return turn
+        conversation, question, history = turn
+        message = question.content
 
         result = run_agent_with_history(message, history)
 
@@ -230,6 +231,8 @@ class AgentChatView(APIView):
                 'response':   result['response'],
             }, status=status.HTTP_200_OK)
 
+        # An unanswered question would skew the next turn's history
+        question.delete()
         return Response({
             'error':   'Agent failed to respond.',
             'details': result['error'],
@@ -254,6 +257,75 @@ class AgentChatView(APIView):
             )
 
 
+# ─────────────────────────────────────────────────────────────
+# CHAT WITH AGENT — STREAMING
+# POST /api/analysis/chat/stream/   (Accept: text/event-stream)
+# ─────────────────────────────────────────────────────────────
+@extend_schema(
+    tags=['🤖 AI Analysis'],
+    summary='Chat with the AI agent, streamed (Server-Sent Events)',
+    description='''
+Same request as `chat/`, answered as a stream of events while the agent works:
+
+- `start` — `{session_id}`
+- `tool` — the agent is querying data: `{name, args, label}` (e.g. "Querying crimes in Kampala…")
+- `token` — the next piece of the answer: `{text}`
+- `done` — `{session_id, response, first_token_ms, total_ms}`; the reply has been saved to the conversation
+- `error` — `{error}`; the question is discarded, as it is if the client disconnects
+
+Use `fetch` and read the body stream (EventSource cannot POST).
+    ''',
+    examples=[
+        OpenApiExample(
+            'Streamed Chat Example',
+            value={'message': 'Which district has the most robberies?'},
+            request_only=True,
+        ),
+    ]
+)
+class AgentChatStreamView(APIView):
+    permission_classes = [IsAuthenticated]
+    renderer_classes   = [JSONRenderer, EventStreamRenderer]
+
+    def post(self, request):
+        turn = start_turn(request)
+        if isinstance(turn, Response):
+            return turn
+        conversation, question, history = turn
+
+        response = StreamingHttpResponse(
+            self.events(conversation, question, history),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control']     = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
+    def events(self, conversation, question, history):
+        answered = False
+        try:
+            yield sse('start', {'session_id': conversation.session_id})
+            for event, data in stream_agent_with_history(question.content, history):
+                if event == 'done':
+                    ConversationMessage.objects.create(
+                        conversation = conversation,
+                        role         = ConversationMessage.Role.ASSISTANT,
+                        content      = data['response'],
+                    )
+                    answered = True
+                    data = {'session_id': conversation.session_id, **data}
+                yield sse(event, data)
+        finally:
+            # Failed or abandoned (client disconnected): drop the question,
+            # as the chat page does, so history matches what the officer saw
+            if not answered:
+                question.delete()
+
+
+def sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
 # ─────────────────────────────────────────────────────────────
 # ANALYSIS RESULTS LIST
 # ─────────────────────────────────────────────────────────────
@@ -294,4 +366,23 @@ class AnalysisResultDetailView(APIView):
             return Response(
                 {'error': 'Analysis result not found.'},
                 status=status.HTTP_404_NOT_FOUND
-            )
\ No newline at end of file
+            )
+
+
+# ─────────────────────────────────────────────────────────────
+# LLM RATE LIMITER METRICS
+# ─────────────────────────────────────────────────────────────
+@extend_schema(
+    tags=['🤖 AI Analysis'],
+    summary='Get LLM rate limiter metrics',
+    description=(
+        'Configured Groq quota and cumulative limiter counters: calls, how many had to wait, '
+        'total/average wait seconds, 429s that got through and calls that gave up waiting. '
+        'Counters are shared across workers when Redis is configured.'
+    ),
+)
+class LLMLimiterView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        return Response(limiter.stats(), status=status.HTTP_200_OK)
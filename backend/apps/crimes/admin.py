@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import CrimeReport, Suspect, Witness
+from .models import CrimeReport, Suspect, Witness, ImportJob
 
 
 class SuspectInline(admin.TabularInline):
@@ -46,4 +46,11 @@ class SuspectAdmin(admin.ModelAdmin):
 class WitnessAdmin(admin.ModelAdmin):
     list_display  = ['name', 'contact', 'is_anonymous', 'crime_report']
     list_filter   = ['is_anonymous']
-    search_fields = ['name', 'statement']
\ No newline at end of file
+    search_fields = ['name', 'statement']
+
+
+@admin.register(ImportJob)
+class ImportJobAdmin(admin.ModelAdmin):
+    list_display    = ['id', 'original_name', 'uploaded_by', 'status', 'rows_processed', 'total_rows', 'duplicate_count', 'created_at']
+    list_filter     = ['status']
+    readonly_fields = ['created_at', 'started_at', 'finished_at', 'updated_at']
@@ -0,0 +1,36 @@
+from collections            import Counter
+from django.db.models       import Count
+
+
+# ─────────────────────────────────────────────────────────────
+# AGGREGATION HELPERS — many statistics in one query
+# ─────────────────────────────────────────────────────────────
+def breakdowns(queryset, fields, limit=None):
+    """
+    Several GROUP BY breakdowns from one query: rows are grouped
+    by all fields together and each field is rolled up in Python.
+
+        breakdowns(CrimeReport.objects.all(), ['status', 'category'])
+        → {'total': 120,
+           'status':   [{'status': 'reported', 'count': 70}, ...],
+           'category': [{'category': 'theft', 'count': 51}, ...]}
+
+    Lists are sorted by count, highest first; `limit` caps each list.
+    Keep the field set small — the grouped result grows with the
+    product of their distinct values.
+    """
+    rows   = queryset.order_by().values(*fields).annotate(row_count=Count('pk'))
+    counts = {field: Counter() for field in fields}
+    total  = 0
+    for row in rows:
+        total += row['row_count']
+        for field in fields:
+            counts[field][row[field]] += row['row_count']
+
+    result = {'total': total}
+    for field in fields:
+        result[field] = [
+            {field: value, 'count': count}
+            for value, count in counts[field].most_common(limit)
+        ]
+    return result
@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class CrimesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name               = 'apps.crimes'
-    verbose_name       = 'Crime Reports'
\ No newline at end of file
+    verbose_name       = 'Crime Reports'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,86 @@
+from django.db                  import connection
+from django.db.models           import Max
+
+
+# ─────────────────────────────────────────────────────────────
+# CASE NUMBER ALLOCATOR
+# PostgreSQL : crimes_case_number_seq — nextval() is atomic and
+#              never blocks concurrent transactions.
+# Other DBs  : single-row counter bumped with UPDATE … RETURNING.
+# Numbers are unique but may have gaps (rolled-back inserts).
+# ─────────────────────────────────────────────────────────────
+CASE_NUMBER_PREFIX  = 'UPF-CASE-'
+CASE_SEQUENCE_NAME  = 'crimes_case_number_seq'
+CASE_COUNTER_NAME   = 'case_number'
+
+
+def format_case_number(value):
+    return f"{CASE_NUMBER_PREFIX}{value:05d}"
+
+
+def parse_case_number(case_number):
+    # 'UPF-CASE-00042' → 42; anything else → None
+    if not case_number or not case_number.startswith(CASE_NUMBER_PREFIX):
+        return None
+    suffix = case_number[len(CASE_NUMBER_PREFIX):]
+    return int(suffix) if suffix.isdigit() else None
+
+
+def highest_case_value():
+    # Where numbering resumes: after every stored case number and
+    # row id (old numbers were derived from the id), as in 0005
+    from .models import CrimeReport
+
+    highest = CrimeReport.objects.aggregate(m=Max('id'))['m'] or 0
+    numbers = (
+        CrimeReport.objects
+        .filter(case_number__startswith=CASE_NUMBER_PREFIX)
+        .values_list('case_number', flat=True)
+        .iterator()
+    )
+    for case_number in numbers:
+        highest = max(highest, parse_case_number(case_number) or 0)
+    return highest
+
+
+def reserve_case_values(count):
+    """
+    Reserve `count` case numbers in one round trip.
+    Returns the list of integer values in ascending order.
+    """
+    if count <= 0:
+        return []
+
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            cursor.execute(
+                'SELECT nextval(%s) FROM generate_series(1, %s)',
+                [CASE_SEQUENCE_NAME, count],
+            )
+            return sorted(row[0] for row in cursor.fetchall())
+
+        from .models import CaseNumberCounter
+        table = CaseNumberCounter._meta.db_table
+        cursor.execute(
+            f'UPDATE {table} SET last_value = last_value + %s WHERE name = %s RETURNING last_value',
+            [count, CASE_COUNTER_NAME],
+        )
+        row = cursor.fetchone()
+        if row is None:
+            # Counter row missing (fresh DB created outside migrations,
+            # or the row was deleted): resume after the stored numbers
+            CaseNumberCounter.objects.get_or_create(
+                name=CASE_COUNTER_NAME, defaults={'last_value': highest_case_value()}
+            )
+            return reserve_case_values(count)
+        last = row[0]
+        return list(range(last - count + 1, last + 1))
+
+
+def allocate_case_numbers(count):
+    # Block reservation for bulk_create paths
+    return [format_case_number(value) for value in reserve_case_values(count)]
+
+
+def next_case_number():
+    return allocate_case_numbers(1)[0]
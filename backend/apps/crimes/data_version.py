@@ -0,0 +1,43 @@
+import time
+from django.core.cache import cache
+from django.db         import transaction
+
+
+# ─────────────────────────────────────────────────────────────
+# CRIME DATA VERSION
+# A counter in the shared cache that moves on every CrimeReport
+# write (and, via apps.dashboard, on writes to the other tables
+# the dashboard reads). Cached results derived from crime data
+# put it in their key, so a write makes every older entry
+# unreachable at once.
+# ─────────────────────────────────────────────────────────────
+DATA_VERSION_KEY = 'crimes:data-version'
+
+
+def initial_version():
+    # Milliseconds, so a counter lost to eviction restarts above
+    # any value it held before and can't revive stale entries
+    return int(time.time() * 1000)
+
+
+def data_version():
+    version = cache.get(DATA_VERSION_KEY)
+    if version is None:
+        cache.add(DATA_VERSION_KEY, initial_version(), timeout=None)
+        version = cache.get(DATA_VERSION_KEY)
+    return version
+
+
+def increment_version():
+    try:
+        cache.incr(DATA_VERSION_KEY)
+    except ValueError:
+        cache.add(DATA_VERSION_KEY, initial_version(), timeout=None)
+
+
+def bump_data_version():
+    """
+    Moves the version once the current transaction commits, so a
+    reader can't cache pre-commit rows under the new version.
+    """
+    transaction.on_commit(increment_version)
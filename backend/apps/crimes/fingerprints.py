@@ -0,0 +1,43 @@
+import hashlib
+import re
+from datetime       import timezone as dt_timezone
+from django.utils   import timezone
+
+
+# ─────────────────────────────────────────────────────────────
+# ROW FINGERPRINT
+# SHA-256 over the normalized identifying content of a report.
+# Two rows with the same fingerprint describe the same incident,
+# so re-importing a file (e.g. after a timeout) can skip them.
+# importer.fingerprint_frame() is the vectorized twin of this —
+# keep the normalization identical.
+# ─────────────────────────────────────────────────────────────
+FINGERPRINT_FIELDS   = ('title', 'category', 'date_occurred', 'district', 'location', 'description')
+FINGERPRINT_SEP      = '\x1f'
+FINGERPRINT_DATE_FMT = '%Y-%m-%dT%H:%M:%S'
+WHITESPACE           = re.compile(r'\s+')
+
+
+def normalize_text(value):
+    return WHITESPACE.sub(' ', str(value or '')).strip().lower()
+
+
+def normalize_datetime(value):
+    # Compared in UTC to the second, whatever zone it was entered in
+    if not value:
+        return ''
+    if timezone.is_naive(value):
+        value = timezone.make_aware(value)
+    return value.astimezone(dt_timezone.utc).strftime(FINGERPRINT_DATE_FMT)
+
+
+def hash_parts(parts):
+    return hashlib.sha256(FINGERPRINT_SEP.join(parts).encode('utf-8')).hexdigest()
+
+
+def crime_fingerprint(crime):
+    return hash_parts([
+        normalize_datetime(crime.date_occurred) if field == 'date_occurred'
+        else normalize_text(getattr(crime, field))
+        for field in FINGERPRINT_FIELDS
+    ])
@@ -0,0 +1,192 @@
+import random
+import statistics
+import time
+from datetime                       import timedelta
+from django.core.management.base    import BaseCommand
+from django.db                      import connection, transaction
+from django.db.models               import F
+from django.db.models.functions     import TruncMonth
+from django.utils                   import timezone
+
+from apps.crimes.models import CrimeReport, CrimeCategory, CrimeSeverity, CrimeStatus
+from apps.crimes.rollup import daily_stats, rebuild_daily_stats, total_crimes
+from apps.crimes.search import refresh_search_index, search_reports
+
+
+# Indexes toggled for the "before" run
+BENCHMARK_INDEXES = (
+    'crime_status_sev_date_idx',
+    'crime_district_date_idx',
+    'crime_category_date_idx',
+    'crime_open_high_sev_idx',
+)
+
+SAMPLE_DISTRICTS = [
+    'Kampala', 'Wakiso', 'Mukono', 'Jinja', 'Mbarara', 'Gulu', 'Lira', 'Mbale',
+    'Arua', 'Masaka', 'Fort Portal', 'Hoima', 'Tororo', 'Soroti', 'Kabale', 'Entebbe',
+]
+
+
+# ─────────────────────────────────────────────────────────────
+# QUERIES — what the endpoints run today
+# The raw-table queries are the ones the toggled indexes serve:
+# list filters (crime list, report generator, agent tools),
+# alerts and recent crimes. Dashboard counts read the
+# crime_daily_stats rollup; they are timed too, for scale, but
+# don't depend on the toggled indexes.
+# ─────────────────────────────────────────────────────────────
+def benchmark_queries():
+    now         = timezone.now()
+    last_7days  = now - timedelta(days=7)
+    last_30days = now - timedelta(days=30)
+    last_year   = now - timedelta(days=365)
+    page        = 21      # a page of the crime list plus its lookahead row
+    newest      = ('-date_reported', '-id')
+    return [
+        ('list: category',
+            CrimeReport.objects.filter(category=CrimeCategory.ROBBERY).order_by(*newest)[:page]),
+        ('list: status + severity',
+            CrimeReport.objects.filter(status=CrimeStatus.REPORTED, severity=CrimeSeverity.HIGH)
+            .order_by(*newest)[:page]),
+        ('list: search',
+            search_reports(CrimeReport.objects.all(), 'robbery').order_by('-search_rank', '-id')[:page]),
+        ('report: category (month)',
+            CrimeReport.objects.filter(category=CrimeCategory.ROBBERY, date_reported__gte=last_30days)
+            .order_by('-date_reported')),
+        ('agent: recent (week)',
+            CrimeReport.objects.filter(date_reported__gte=last_7days).order_by('-date_reported')[:25]),
+        ('alerts',
+            CrimeReport.objects.filter(
+                severity__in=['high', 'critical'],
+                status__in=['reported', 'under_investigation'],
+            ).order_by('-date_reported')[:10]),
+        ('recent crimes',
+            CrimeReport.objects.order_by('-date_reported')[:10]),
+        ('rollup: overview',
+            daily_stats().values('status').annotate(count=total_crimes())),
+        ('rollup: by category (month)',
+            daily_stats(last_30days).values('category').annotate(count=total_crimes()).order_by('-count')),
+        ('rollup: district × category',
+            daily_stats(last_30days).values('district', 'category').annotate(count=total_crimes())),
+        ('rollup: monthly trends',
+            daily_stats(last_year).annotate(month=TruncMonth('day'))
+            .values('month').annotate(count=total_crimes()).order_by('month')),
+    ]
+
+
+# ─────────────────────────────────────────────────────────────
+# BENCHMARK DASHBOARD QUERIES
+# python manage.py benchmark_dashboard_queries --rows 100000
+# Seeds rows (plus their rollup and search index), prints EXPLAIN
+# plans and median timings with the filter indexes dropped
+# ("before") and present ("after").
+# Everything runs in one transaction that is rolled back unless
+# --keep is given.
+# ─────────────────────────────────────────────────────────────
+class Command(BaseCommand):
+    help = 'Seed crime reports and compare list/filter query plans/timings with and without indexes.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows',    type=int, default=50000, help='Rows to seed (default 50000)')
+        parser.add_argument('--repeat',  type=int, default=5,     help='Timed runs per query (default 5)')
+        parser.add_argument('--batch',   type=int, default=5000,  help='bulk_create batch size')
+        parser.add_argument('--no-plan', action='store_true',     help='Skip printing EXPLAIN output')
+        parser.add_argument('--keep',    action='store_true',     help='Commit the seeded rows')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.seed(options['rows'], options['batch'])
+            # bulk_create bypassed the rollup and search signals
+            rebuild_daily_stats()
+            refresh_search_index(
+                CrimeReport.objects.filter(case_number__startswith='UPF-BENCH-').values_list('id', flat=True)
+            )
+            self.analyze()
+
+            self.toggle_indexes(create=False)
+            self.analyze()
+            before = self.run_queries('BEFORE (no filter indexes)', options)
+
+            self.toggle_indexes(create=True)
+            self.analyze()
+            after = self.run_queries('AFTER (with filter indexes)', options)
+
+            self.print_summary(before, after)
+
+            if not options['keep']:
+                transaction.set_rollback(True)
+                self.stdout.write('Seeded rows rolled back (use --keep to retain them).')
+
+    # ── Seeding ──────────────────────────────────────────────
+    def seed(self, rows, batch_size):
+        rng        = random.Random(42)
+        now        = timezone.now()
+        categories = CrimeCategory.values
+        severities = CrimeSeverity.values
+        statuses   = CrimeStatus.values
+        start_id   = (CrimeReport.objects.order_by('-id').values_list('id', flat=True).first() or 0) + 1
+
+        started = time.perf_counter()
+        for offset in range(0, rows, batch_size):
+            batch = []
+            for i in range(offset, min(offset + batch_size, rows)):
+                when     = now - timedelta(minutes=rng.randint(0, 2 * 365 * 24 * 60))
+                category = rng.choice(categories)
+                batch.append(CrimeReport(
+                    case_number   = f'UPF-BENCH-{start_id + i:07d}',
+                    title         = f'Benchmark {category.replace("_", " ")} case {i}',
+                    category      = category,
+                    severity      = rng.choice(severities),
+                    status        = rng.choice(statuses),
+                    description   = 'Seeded by benchmark_dashboard_queries.',
+                    location      = 'Benchmark',
+                    district      = rng.choice(SAMPLE_DISTRICTS),
+                    date_occurred = when,
+                ))
+            CrimeReport.objects.bulk_create(batch)
+
+        # date_reported is auto_now_add; spread it to match date_occurred
+        CrimeReport.objects.filter(case_number__startswith='UPF-BENCH-').update(
+            date_reported=F('date_occurred')
+        )
+        self.stdout.write(f'Seeded {rows} rows in {time.perf_counter() - started:.1f}s.')
+
+    def toggle_indexes(self, create):
+        # Plain DDL inside the outer transaction; the schema editor
+        # context manager refuses to run there on SQLite.
+        editor  = connection.schema_editor()
+        indexes = [i for i in CrimeReport._meta.indexes if i.name in BENCHMARK_INDEXES]
+        with connection.cursor() as cursor:
+            for index in indexes:
+                if create:
+                    cursor.execute(str(index.create_sql(CrimeReport, editor)))
+                else:
+                    cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+
+    def analyze(self):
+        with connection.cursor() as cursor:
+            cursor.execute(f'ANALYZE {CrimeReport._meta.db_table}')
+
+    # ── Measuring ────────────────────────────────────────────
+    def run_queries(self, label, options):
+        self.stdout.write(self.style.MIGRATE_HEADING(f'\n=== {label} ==='))
+        timings = {}
+        for name, queryset in benchmark_queries():
+            runs = []
+            for _ in range(max(1, options['repeat'])):
+                started = time.perf_counter()
+                list(queryset.all())
+                runs.append((time.perf_counter() - started) * 1000)
+            timings[name] = statistics.median(runs)
+
+            self.stdout.write(self.style.SQL_TABLE(f'\n-- {name}: {timings[name]:.2f} ms (median)'))
+            if not options['no_plan']:
+                self.stdout.write(queryset.explain())
+        return timings
+
+    def print_summary(self, before, after):
+        self.stdout.write(self.style.MIGRATE_HEADING('\n=== SUMMARY (median ms) ==='))
+        self.stdout.write(f"{'query':<30} {'before':>10} {'after':>10} {'speedup':>9}")
+        for name in before:
+            speedup = before[name] / after[name] if after[name] else 0
+            self.stdout.write(f'{name:<30} {before[name]:>10.2f} {after[name]:>10.2f} {speedup:>8.1f}x')
@@ -0,0 +1,31 @@
+import time
+from datetime                       import date
+from django.core.management.base    import BaseCommand, CommandError
+
+from apps.crimes.rollup import rebuild_daily_stats
+
+
+# ─────────────────────────────────────────────────────────────
+# REBUILD DAILY STATS
+# python manage.py rebuild_daily_stats [--since 2025-01-01]
+# Backfills crime_daily_stats, or repairs it after raw SQL
+# writes / restores that bypass the ORM.
+# ─────────────────────────────────────────────────────────────
+class Command(BaseCommand):
+    help = 'Recompute the crime_daily_stats rollup from crime reports.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--since', help='Only rebuild days on or after this date (YYYY-MM-DD)')
+
+    def handle(self, *args, **options):
+        since = None
+        if options['since']:
+            try:
+                since = date.fromisoformat(options['since'])
+            except ValueError:
+                raise CommandError('--since must be a date in YYYY-MM-DD format.')
+
+        started = time.perf_counter()
+        rows    = rebuild_daily_stats(since)
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Daily stats rebuilt: {rows} rows in {elapsed:.2f}s.'))
@@ -0,0 +1,19 @@
+import time
+from django.core.management.base import BaseCommand
+
+from apps.crimes.search import refresh_search_index
+
+
+# ─────────────────────────────────────────────────────────────
+# REBUILD SEARCH INDEX
+# python manage.py rebuild_search_index
+# Use after raw SQL imports or restores that bypass the ORM.
+# ─────────────────────────────────────────────────────────────
+class Command(BaseCommand):
+    help = 'Recompute the full-text search index for every crime report.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        refresh_search_index()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Search index rebuilt in {elapsed:.2f}s.'))
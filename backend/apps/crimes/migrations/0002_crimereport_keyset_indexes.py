@@ -0,0 +1,23 @@
+# Generated by Django 5.1.5 on 2026-10-17 03:18
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crimes', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='crimereport',
+            index=models.Index(fields=['-date_reported', '-id'], name='crime_reported_keyset_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='crimereport',
+            index=models.Index(fields=['reported_by', '-date_reported', '-id'], name='crime_officer_keyset_idx'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.1.5 on 2026-10-17 03:19
+
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+# Backend-specific search structures. PostgreSQL gets a GIN index on the
+# tsvector plus trigram indexes; SQLite (tests / local dev) gets an FTS5
+# shadow table. Both are backfilled from existing rows.
+PG_FORWARD = [
+    "CREATE INDEX IF NOT EXISTS crime_search_vector_idx "
+    "ON crimes_crimereport USING gin (search_vector)",
+    "CREATE INDEX IF NOT EXISTS crime_title_trgm_idx "
+    "ON crimes_crimereport USING gin (title gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS crime_case_number_trgm_idx "
+    "ON crimes_crimereport USING gin (case_number gin_trgm_ops)",
+    "UPDATE crimes_crimereport SET search_vector = "
+    "setweight(to_tsvector('english', coalesce(title, '')), 'A') || "
+    "setweight(to_tsvector('english', coalesce(location, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(weapons_used, '')), 'B') || "
+    "setweight(to_tsvector('english', coalesce(description, '')), 'C') || "
+    "setweight(to_tsvector('english', coalesce(modus_operandi, '')), 'C')",
+]
+PG_REVERSE = [
+    "DROP INDEX IF EXISTS crime_search_vector_idx",
+    "DROP INDEX IF EXISTS crime_title_trgm_idx",
+    "DROP INDEX IF EXISTS crime_case_number_trgm_idx",
+]
+SQLITE_FORWARD = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS crimes_crimereport_fts USING fts5("
+    "title, description, modus_operandi, location, weapons_used, "
+    "tokenize = 'porter unicode61')",
+    "INSERT INTO crimes_crimereport_fts "
+    "(rowid, title, description, modus_operandi, location, weapons_used) "
+    "SELECT id, title, description, modus_operandi, location, weapons_used "
+    "FROM crimes_crimereport",
+]
+SQLITE_REVERSE = [
+    "DROP TABLE IF EXISTS crimes_crimereport_fts",
+]
+
+
+def run_for_vendor(pg_sql, sqlite_sql):
+    def operation(apps, schema_editor):
+        vendor = schema_editor.connection.vendor
+        statements = pg_sql if vendor == 'postgresql' else sqlite_sql if vendor == 'sqlite' else []
+        for sql in statements:
+            schema_editor.execute(sql)
+    return operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crimes', '0002_crimereport_keyset_indexes'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name='crimereport',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(
+            run_for_vendor(PG_FORWARD, SQLITE_FORWARD),
+            run_for_vendor(PG_REVERSE, SQLITE_REVERSE),
+        ),
+    ]
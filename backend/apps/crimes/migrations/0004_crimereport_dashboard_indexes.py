@@ -0,0 +1,31 @@
+# Generated by Django 5.1.5 on 2026-10-17 03:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crimes', '0003_crimereport_search'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='crimereport',
+            index=models.Index(fields=['status', 'severity', 'date_reported'], name='crime_status_sev_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='crimereport',
+            index=models.Index(fields=['district', 'date_reported'], name='crime_district_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='crimereport',
+            index=models.Index(fields=['category', 'date_reported'], name='crime_category_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='crimereport',
+            index=models.Index(condition=models.Q(('severity__in', ['high', 'critical']), ('status__in', ['reported', 'under_investigation'])), fields=['-date_reported'], name='crime_open_high_sev_idx'),
+        ),
+    ]
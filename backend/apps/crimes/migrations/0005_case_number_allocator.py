@@ -0,0 +1,65 @@
+# Generated by Django 5.1.5 on 2026-10-17 03:21
+
+from django.db import migrations, models
+from django.db.models import Max
+
+
+CASE_NUMBER_PREFIX = 'UPF-CASE-'
+CASE_SEQUENCE_NAME = 'crimes_case_number_seq'
+
+
+def highest_case_value(CrimeReport):
+    # Old numbers were derived from the row id, so start after both.
+    highest = CrimeReport.objects.aggregate(m=Max('id'))['m'] or 0
+    numbers = (
+        CrimeReport.objects
+        .filter(case_number__startswith=CASE_NUMBER_PREFIX)
+        .values_list('case_number', flat=True)
+        .iterator()
+    )
+    for case_number in numbers:
+        suffix = case_number[len(CASE_NUMBER_PREFIX):]
+        if suffix.isdigit():
+            highest = max(highest, int(suffix))
+    return highest
+
+
+def seed_allocator(apps, schema_editor):
+    CrimeReport       = apps.get_model('crimes', 'CrimeReport')
+    CaseNumberCounter = apps.get_model('crimes', 'CaseNumberCounter')
+    highest           = highest_case_value(CrimeReport)
+
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'CREATE SEQUENCE IF NOT EXISTS {CASE_SEQUENCE_NAME} START WITH 1')
+        if highest:
+            schema_editor.execute('SELECT setval(%s, %s)', [CASE_SEQUENCE_NAME, highest])
+    CaseNumberCounter.objects.update_or_create(
+        name='case_number', defaults={'last_value': highest}
+    )
+
+
+def drop_allocator(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP SEQUENCE IF EXISTS {CASE_SEQUENCE_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crimes', '0004_crimereport_dashboard_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CaseNumberCounter',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('last_value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Case Number Counter',
+                'verbose_name_plural': 'Case Number Counters',
+            },
+        ),
+        migrations.RunPython(seed_allocator, drop_allocator),
+    ]
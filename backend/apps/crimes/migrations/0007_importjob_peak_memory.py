@@ -0,0 +1,18 @@
+# Generated by Django 5.1.5 on 2026-10-17 03:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crimes', '0006_importjob'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='importjob',
+            name='peak_memory_bytes',
+            field=models.BigIntegerField(default=0),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.1.5 on 2026-10-17 03:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+from apps.crimes.fingerprints import crime_fingerprint
+
+
+def backfill_fingerprints(apps, schema_editor):
+    CrimeReport = apps.get_model('crimes', 'CrimeReport')
+    batch       = []
+    for crime in CrimeReport.objects.only('id', 'title', 'category', 'date_occurred',
+                                          'district', 'location', 'description').iterator(chunk_size=2000):
+        crime.row_fingerprint = crime_fingerprint(crime)
+        batch.append(crime)
+        if len(batch) >= 2000:
+            CrimeReport.objects.bulk_update(batch, ['row_fingerprint'])
+            batch = []
+    if batch:
+        CrimeReport.objects.bulk_update(batch, ['row_fingerprint'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crimes', '0007_importjob_peak_memory'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crimereport',
+            name='row_fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='duplicate_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='duplicate_rows',
+            field=models.JSONField(blank=True, default=list),
+        ),
+        migrations.AddField(
+            model_name='importjob',
+            name='on_duplicate',
+            field=models.CharField(choices=[('skip', 'Skip'), ('update', 'Update existing')], default='skip', max_length=10),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='crimereport',
+            index=models.Index(fields=['row_fingerprint'], name='crime_fingerprint_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.5 on 2026-10-17 03:37
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, TruncDate
+
+
+def backfill_daily_stats(apps, schema_editor):
+    CrimeReport    = apps.get_model('crimes', 'CrimeReport')
+    CrimeDailyStat = apps.get_model('crimes', 'CrimeDailyStat')
+    grouped = (
+        CrimeReport.objects
+        .annotate(day=TruncDate('date_reported'))
+        .values('day', 'district', 'category', 'severity', 'status')
+        .annotate(crime_count=Count('id'), victims=Coalesce(Sum('victim_count'), 0))
+        .order_by()
+    )
+    CrimeDailyStat.objects.bulk_create(
+        (CrimeDailyStat(victim_count=row.pop('victims'), **row) for row in grouped.iterator()),
+        batch_size=2000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('crimes', '0008_crimereport_row_fingerprint'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrimeDailyStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('district', models.CharField(max_length=100)),
+                ('category', models.CharField(choices=[('theft', 'Theft'), ('assault', 'Assault'), ('homicide', 'Homicide'), ('fraud', 'Fraud'), ('cybercrime', 'Cybercrime'), ('robbery', 'Robbery'), ('burglary', 'Burglary'), ('drug_offense', 'Drug Offense'), ('sexual_offense', 'Sexual Offense'), ('vandalism', 'Vandalism'), ('kidnapping', 'Kidnapping'), ('arson', 'Arson'), ('corruption', 'Corruption'), ('other', 'Other')], max_length=30)),
+                ('severity', models.CharField(choices=[('low', 'Low'), ('medium', 'Medium'), ('high', 'High'), ('critical', 'Critical')], max_length=10)),
+                ('status', models.CharField(choices=[('reported', 'Reported'), ('under_investigation', 'Under Investigation'), ('solved', 'Solved'), ('closed', 'Closed'), ('cold_case', 'Cold Case')], max_length=30)),
+                ('crime_count', models.IntegerField(default=0)),
+                ('victim_count', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Crime Daily Stat',
+                'verbose_name_plural': 'Crime Daily Stats',
+                'db_table': 'crime_daily_stats',
+                'indexes': [models.Index(fields=['district', 'day'], name='crime_daily_district_idx'), models.Index(fields=['category', 'day'], name='crime_daily_category_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'district', 'category', 'severity', 'status'), name='crime_daily_stats_key')],
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
-from django.db import models
+from datetime import timedelta
+from django.db import models, transaction
 from django.conf import settings
+from django.utils import timezone
+from django.contrib.postgres.search import SearchVectorField
 
 
 # ─────────────────────────────────────────────────────────────
@@ -116,10 +119,39 @@ class CrimeReport(models.Model):
     # ── AI Analysis flag ─────────────────────────────────────
     is_analyzed     = models.BooleanField(default=False)
 
+    # ── Full-text search (maintained by apps.crimes.search) ──
+    search_vector   = SearchVectorField(null=True, editable=False)
+
+    # ── Duplicate detection (see apps.crimes.fingerprints) ───
+    row_fingerprint = models.CharField(max_length=64, blank=True, editable=False)
+
     class Meta:
         verbose_name        = 'Crime Report'
         verbose_name_plural = 'Crime Reports'
         ordering            = ['-date_reported']
+        indexes             = [
+            # Keyset pagination: WHERE (date_reported, id) < cursor ORDER BY both DESC
+            models.Index(fields=['-date_reported', '-id'], name='crime_reported_keyset_idx'),
+            models.Index(fields=['reported_by', '-date_reported', '-id'], name='crime_officer_keyset_idx'),
+
+            # Dashboard / alerts / agent-tool hot filters
+            models.Index(fields=['status', 'severity', 'date_reported'], name='crime_status_sev_date_idx'),
+            models.Index(fields=['district', 'date_reported'],           name='crime_district_date_idx'),
+            models.Index(fields=['category', 'date_reported'],           name='crime_category_date_idx'),
+
+            # Bulk import de-duplication: WHERE row_fingerprint IN (...)
+            models.Index(fields=['row_fingerprint'], name='crime_fingerprint_idx'),
+
+            # AlertsView: open high/critical cases, newest first
+            models.Index(
+                fields=['-date_reported'],
+                name='crime_open_high_sev_idx',
+                condition=models.Q(
+                    severity__in=['high', 'critical'],
+                    status__in=['reported', 'under_investigation'],
+                ),
+            ),
+        ]
 
     def __str__(self):
         return f"[{self.case_number}] {self.title} — {self.category}"
@@ -127,10 +159,78 @@ class CrimeReport(models.Model):
     def save(self, *args, **kwargs):
         # Auto-generate case number if not set
         if not self.case_number:
-            last = CrimeReport.objects.order_by('-id').first()
-            next_id = (last.id + 1) if last else 1
-            self.case_number = f"UPF-CASE-{next_id:05d}"
-        super().save(*args, **kwargs)
+            from .case_numbers import next_case_number
+            self.case_number = next_case_number()
+
+        # Keep the fingerprint in step with the fields it covers
+        from .fingerprints import FINGERPRINT_FIELDS, crime_fingerprint
+        self.row_fingerprint = crime_fingerprint(self)
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and set(update_fields) & set(FINGERPRINT_FIELDS):
+            kwargs['update_fields'] = {*update_fields, 'row_fingerprint'}
+
+        # One transaction for the save and its signal receivers, so the
+        # row lock taken in pre_save (apps.crimes.signals) lasts until
+        # the rollup delta is applied
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+
+
+# ─────────────────────────────────────────────────────────────
+# CASE NUMBER COUNTER
+# Used by apps.crimes.case_numbers on databases without native
+# sequences (SQLite in tests). PostgreSQL uses a real sequence.
+# ─────────────────────────────────────────────────────────────
+class CaseNumberCounter(models.Model):
+
+    name            = models.CharField(max_length=50, primary_key=True)
+    last_value      = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name        = 'Case Number Counter'
+        verbose_name_plural = 'Case Number Counters'
+
+    def __str__(self):
+        return f"{self.name}: {self.last_value}"
+
+
+# ─────────────────────────────────────────────────────────────
+# DAILY STATS ROLLUP
+# One row per (day, district, category, severity, status) with
+# the number of reports and victims. Kept current by
+# apps.crimes.rollup; dashboard charts read this instead of
+# scanning every CrimeReport. `day` is the local (TIME_ZONE)
+# date of date_reported.
+# ─────────────────────────────────────────────────────────────
+class CrimeDailyStat(models.Model):
+
+    day             = models.DateField()
+    district        = models.CharField(max_length=100)
+    category        = models.CharField(max_length=30, choices=CrimeCategory.choices)
+    severity        = models.CharField(max_length=10, choices=CrimeSeverity.choices)
+    status          = models.CharField(max_length=30, choices=CrimeStatus.choices)
+
+    crime_count     = models.IntegerField(default=0)
+    victim_count    = models.BigIntegerField(default=0)
+
+    class Meta:
+        db_table            = 'crime_daily_stats'
+        verbose_name        = 'Crime Daily Stat'
+        verbose_name_plural = 'Crime Daily Stats'
+        constraints         = [
+            # Target of the INSERT … ON CONFLICT upsert in rollup.apply_deltas()
+            models.UniqueConstraint(
+                fields=['day', 'district', 'category', 'severity', 'status'],
+                name='crime_daily_stats_key',
+            ),
+        ]
+        indexes             = [
+            models.Index(fields=['district', 'day'], name='crime_daily_district_idx'),
+            models.Index(fields=['category', 'day'], name='crime_daily_category_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.district} {self.category}/{self.severity}/{self.status}: {self.crime_count}"
 
 
 # ─────────────────────────────────────────────────────────────
@@ -201,4 +301,132 @@ class Witness(models.Model):
 
     def __str__(self):
         name = 'Anonymous' if self.is_anonymous else self.name
-        return f"{name} — Case: {self.crime_report.case_number}"
\ No newline at end of file
+        return f"{name} — Case: {self.crime_report.case_number}"
+
+
+# ─────────────────────────────────────────────────────────────
+# IMPORT JOB STATUS
+# ─────────────────────────────────────────────────────────────
+class ImportStatus(models.TextChoices):
+    PENDING     = 'pending',    'Pending'
+    RUNNING     = 'running',    'Running'
+    COMPLETED   = 'completed',  'Completed'
+    FAILED      = 'failed',     'Failed'
+    CANCELLED   = 'cancelled',  'Cancelled'
+
+
+# ─────────────────────────────────────────────────────────────
+# DUPLICATE POLICY — what a re-import does with rows whose
+# fingerprint already exists
+# ─────────────────────────────────────────────────────────────
+class DuplicatePolicy(models.TextChoices):
+    SKIP        = 'skip',       'Skip'
+    UPDATE      = 'update',     'Update existing'
+
+
+# ─────────────────────────────────────────────────────────────
+# IMPORT JOB MODEL
+# Tracks a background bulk upload (see apps.crimes.tasks)
+# ─────────────────────────────────────────────────────────────
+class ImportJob(models.Model):
+
+    uploaded_by     = models.ForeignKey(
+                        settings.AUTH_USER_MODEL,
+                        on_delete=models.SET_NULL,
+                        null=True,
+                        related_name='import_jobs'
+                      )
+
+    # ── Source file ──────────────────────────────────────────
+    file            = models.FileField(upload_to='crime_imports/')
+    original_name   = models.CharField(max_length=255)
+
+    # ── Status ───────────────────────────────────────────────
+    status          = models.CharField(
+                        max_length=20,
+                        choices=ImportStatus.choices,
+                        default=ImportStatus.PENDING
+                      )
+    cancel_requested = models.BooleanField(default=False)
+    on_duplicate    = models.CharField(
+                        max_length=10,
+                        choices=DuplicatePolicy.choices,
+                        default=DuplicatePolicy.SKIP
+                      )
+    error_message   = models.TextField(blank=True)
+    celery_task_id  = models.CharField(max_length=255, blank=True)
+
+    # ── Progress (rows_processed is the resume point) ────────
+    total_rows      = models.PositiveIntegerField(default=0)
+    rows_processed  = models.PositiveIntegerField(default=0)
+    created_count   = models.PositiveIntegerField(default=0)
+    skipped_count   = models.PositiveIntegerField(default=0)
+    failed_count    = models.PositiveIntegerField(default=0)
+    duplicate_count = models.PositiveIntegerField(default=0)
+    resumed_from    = models.PositiveIntegerField(default=0)   # rows_processed when this run started
+    peak_memory_bytes = models.BigIntegerField(default=0)      # worker peak RSS (kernel high-water mark) while importing
+
+    # ── Capped samples for the summary response ──────────────
+    created_cases   = models.JSONField(default=list, blank=True)
+    skipped_rows    = models.JSONField(default=list, blank=True)
+    error_rows      = models.JSONField(default=list, blank=True)
+    duplicate_rows  = models.JSONField(default=list, blank=True)
+
+    # ── Timestamps ───────────────────────────────────────────
+    created_at      = models.DateTimeField(auto_now_add=True)
+    started_at      = models.DateTimeField(null=True, blank=True)
+    finished_at     = models.DateTimeField(null=True, blank=True)
+    updated_at      = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name        = 'Import Job'
+        verbose_name_plural = 'Import Jobs'
+        ordering            = ['-created_at']
+
+    def __str__(self):
+        return f"Import #{self.pk} [{self.status}] — {self.original_name}"
+
+    @property
+    def is_finished(self):
+        return self.status in (ImportStatus.COMPLETED, ImportStatus.FAILED, ImportStatus.CANCELLED)
+
+    @staticmethod
+    def stale_cutoff():
+        return timezone.now() - timedelta(minutes=settings.CRIME_IMPORT_STALE_MINUTES)
+
+    @property
+    def is_stale(self):
+        # Running, but no chunk committed lately (updated_at is the heartbeat)
+        return self.status == ImportStatus.RUNNING and self.updated_at < self.stale_cutoff()
+
+    @property
+    def elapsed_seconds(self):
+        if not self.started_at:
+            return 0.0
+        end = self.finished_at or timezone.now()
+        return max((end - self.started_at).total_seconds(), 0.0)
+
+    @property
+    def rows_per_second(self):
+        elapsed = self.elapsed_seconds
+        done    = self.rows_processed - self.resumed_from
+        return round(done / elapsed, 1) if elapsed > 0 and done > 0 else 0.0
+
+    @property
+    def eta_seconds(self):
+        if self.is_finished:
+            return 0
+        rate = self.rows_per_second
+        if not rate or not self.total_rows:
+            return None
+        return int((self.total_rows - self.rows_processed) / rate)
+
+    @property
+    def peak_memory_mb(self):
+        return round(self.peak_memory_bytes / (1024 * 1024), 1)
+
+    @property
+    def progress_percent(self):
+        if not self.total_rows:
+            return 100.0 if self.status == ImportStatus.COMPLETED else 0.0
+        return round(self.rows_processed / self.total_rows * 100, 1)
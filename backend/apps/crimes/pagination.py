@@ -0,0 +1,115 @@
+import base64
+import json
+from django.conf                import settings
+from django.db                  import connection
+from django.db.models           import Q
+from django.utils.dateparse     import parse_datetime
+from rest_framework.exceptions  import ValidationError
+
+
+# ─────────────────────────────────────────────────────────────
+# KEYSET (CURSOR) PAGINATION — keyed on (date_reported, id)
+# or (search_rank, id) for ranked search results.
+# Every page is a single index range scan, so page 1,000 costs
+# the same as page 1. The cursor is opaque to clients.
+# ─────────────────────────────────────────────────────────────
+class CrimeReportCursorPagination:
+
+    page_size       = settings.REST_FRAMEWORK.get('PAGE_SIZE', 20)
+    max_page_size   = 100
+
+    cursor_query_param    = 'cursor'
+    page_size_query_param = 'page_size'
+    count_query_param     = 'with_count'
+
+    def __init__(self, order_field='date_reported'):
+        # Leading sort key; 'id' is always the tie-breaker.
+        # 'search_rank' is used for ranked full-text results.
+        self.order_field = order_field
+
+    # ── Cursor encoding ──────────────────────────────────────
+    def encode_cursor(self, value, pk):
+        if hasattr(value, 'isoformat'):
+            value = value.isoformat()
+        payload = json.dumps({'o': self.order_field, 'v': value, 'i': pk}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, token):
+        try:
+            padded  = token + '=' * (-len(token) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            if payload['o'] != self.order_field:
+                raise ValueError('cursor belongs to a different ordering')
+            pk    = int(payload['i'])
+            value = (
+                parse_datetime(payload['v']) if self.order_field == 'date_reported'
+                else float(payload['v'])
+            )
+        except (ValueError, KeyError, TypeError):
+            raise ValidationError({'cursor': 'Invalid pagination cursor.'})
+        if value is None:
+            raise ValidationError({'cursor': 'Invalid pagination cursor.'})
+        return value, pk
+
+    # ── Request parsing ──────────────────────────────────────
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    def wants_count(self, request):
+        value = request.query_params.get(self.count_query_param, '')
+        return value.lower() in ('1', 'true', 'yes')
+
+    # ── Estimated row count ──────────────────────────────────
+    @staticmethod
+    def estimate_count(queryset):
+        """
+        On PostgreSQL read the planner's row estimate (no table scan).
+        Other backends fall back to an exact COUNT(*).
+        """
+        if connection.vendor != 'postgresql':
+            return queryset.count()
+        sql, params = queryset.order_by().values('id').query.sql_with_params()
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+            plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+    # ── Paginate ─────────────────────────────────────────────
+    def paginate_queryset(self, queryset, request):
+        self.page_size_value = self.get_page_size(request)
+        self.count           = self.estimate_count(queryset) if self.wants_count(request) else None
+
+        field    = self.order_field
+        queryset = queryset.order_by(f'-{field}', '-id')
+        token    = request.query_params.get(self.cursor_query_param)
+        if token:
+            value, pk = self.decode_cursor(token)
+            queryset  = queryset.filter(
+                Q(**{f'{field}__lt': value})
+                | Q(**{field: value, 'id__lt': pk})
+            )
+
+        # Fetch one extra row to know whether a next page exists
+        rows = list(queryset[:self.page_size_value + 1])
+        self.has_next = len(rows) > self.page_size_value
+        rows          = rows[:self.page_size_value]
+
+        self.next_cursor = (
+            self.encode_cursor(getattr(rows[-1], field), rows[-1].id)
+            if self.has_next else None
+        )
+        return rows
+
+    def get_paginated_data(self, data):
+        return {
+            'count':     self.count,
+            'next':      self.next_cursor,
+            'page_size': self.page_size_value,
+            'results':   data,
+        }
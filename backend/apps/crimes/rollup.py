@@ -0,0 +1,168 @@
+import logging
+from django.db                  import connection, transaction
+from django.db.models           import Count, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils               import timezone
+
+from .data_version              import bump_data_version
+
+logger = logging.getLogger('apps.crimes')
+
+
+# ─────────────────────────────────────────────────────────────
+# DAILY STATS ROLLUP (crime_daily_stats)
+# Every CrimeReport write turns into a +/- delta on its
+# (day, district, category, severity, status) row, applied with
+# one INSERT … ON CONFLICT DO UPDATE per batch. Signals cover
+# save/delete; bulk paths call record_created()/record_changed().
+# rebuild_daily_stats() recomputes everything from scratch.
+# ─────────────────────────────────────────────────────────────
+ROLLUP_DIMENSIONS = ('district', 'category', 'severity', 'status')
+ROLLUP_FIELDS     = ('date_reported', *ROLLUP_DIMENSIONS, 'victim_count')
+ROLLUP_BATCH_SIZE = 500
+
+
+def rollup_key(values):
+    """
+    (day, district, category, severity, status) for a report, given
+    any object/dict exposing the ROLLUP_FIELDS.
+    """
+    get = values.get if isinstance(values, dict) else lambda f: getattr(values, f)
+    day = timezone.localdate(get('date_reported'))
+    return (day, *(get(field) for field in ROLLUP_DIMENSIONS))
+
+
+def snapshot(report):
+    # What a report currently contributes: (key, victims)
+    return rollup_key(report), report.victim_count or 0
+
+
+def row_snapshot(row):
+    # The same, from a values() dict of ROLLUP_FIELDS
+    return rollup_key(row), row['victim_count'] or 0
+
+
+# ── Applying deltas ──────────────────────────────────────────
+def apply_deltas(deltas):
+    """
+    deltas: {key: [crime_delta, victim_delta]}. Rows that drop to
+    zero reports are removed so the table only holds live cells.
+    """
+    from .models import CrimeDailyStat
+
+    rows = [(*key, counts[0], counts[1]) for key, counts in deltas.items() if counts[0] or counts[1]]
+    if not rows:
+        return
+
+    table   = CrimeDailyStat._meta.db_table
+    columns = '(day, district, category, severity, status, crime_count, victim_count)'
+    with transaction.atomic(), connection.cursor() as cursor:
+        for start in range(0, len(rows), ROLLUP_BATCH_SIZE):
+            batch = rows[start:start + ROLLUP_BATCH_SIZE]
+            cursor.execute(
+                f'INSERT INTO {table} {columns} VALUES '
+                + ', '.join(['(%s, %s, %s, %s, %s, %s, %s)'] * len(batch))
+                + ' ON CONFLICT (day, district, category, severity, status) DO UPDATE SET '
+                f'crime_count = {table}.crime_count + EXCLUDED.crime_count, '
+                f'victim_count = {table}.victim_count + EXCLUDED.victim_count',
+                [value for row in batch for value in row],
+            )
+        days = sorted({row[0] for row in rows})
+        CrimeDailyStat.objects.filter(day__in=days, crime_count__lte=0).delete()
+
+
+def add_delta(deltas, key, victims, sign):
+    entry     = deltas.setdefault(key, [0, 0])
+    entry[0] += sign
+    entry[1] += sign * victims
+
+
+# ── Write paths ──────────────────────────────────────────────
+def record_created(reports):
+    deltas = {}
+    for report in reports:
+        key, victims = snapshot(report)
+        add_delta(deltas, key, victims, +1)
+    apply_deltas(deltas)
+
+
+def record_deleted(snapshots):
+    deltas = {}
+    for key, victims in snapshots:
+        add_delta(deltas, key, victims, -1)
+    apply_deltas(deltas)
+
+
+def record_changed(before, after):
+    """
+    before / after: {pk: snapshot} taken either side of the write.
+    Only reports whose key or victim count moved produce deltas.
+    """
+    deltas = {}
+    for pk, new in after.items():
+        old = before.get(pk)
+        if old == new:
+            continue
+        if old:
+            add_delta(deltas, old[0], old[1], -1)
+        add_delta(deltas, new[0], new[1], +1)
+    apply_deltas(deltas)
+
+
+def snapshots_for(ids):
+    # Current contribution of each stored report, in one query
+    from .models import CrimeReport
+
+    return {
+        row['id']: row_snapshot(row)
+        for row in CrimeReport.objects.filter(id__in=list(ids)).values('id', *ROLLUP_FIELDS)
+    }
+
+
+# ── Full rebuild ─────────────────────────────────────────────
+def rebuild_daily_stats(since=None):
+    """
+    Recompute rollup rows from CrimeReport — every day, or from the
+    date `since` onwards. Returns the number of rows written.
+    """
+    from .models import CrimeDailyStat, CrimeReport
+
+    reports = CrimeReport.objects.all()
+    stats   = CrimeDailyStat.objects.all()
+    if since:
+        reports = reports.filter(date_reported__date__gte=since)
+        stats   = stats.filter(day__gte=since)
+
+    grouped = (
+        reports
+        .annotate(day=TruncDate('date_reported'))
+        .values('day', *ROLLUP_DIMENSIONS)
+        .annotate(crime_count=Count('id'), victims=Coalesce(Sum('victim_count'), 0))
+        .order_by()
+    )
+    with transaction.atomic():
+        stats.delete()
+        rows = CrimeDailyStat.objects.bulk_create(
+            (CrimeDailyStat(victim_count=row.pop('victims'), **row) for row in grouped.iterator()),
+            batch_size=2000,
+        )
+    bump_data_version()
+    logger.info(f"Daily stats rebuilt: {len(rows)} rows" + (f" from {since}" if since else ''))
+    return len(rows)
+
+
+# ─────────────────────────────────────────────────────────────
+# READ HELPERS — for dashboard queries over the rollup
+# ─────────────────────────────────────────────────────────────
+def daily_stats(since=None):
+    from .models import CrimeDailyStat
+
+    stats = CrimeDailyStat.objects.all()
+    if since:
+        stats = stats.filter(day__gte=timezone.localdate(since))
+    return stats
+
+
+def total_crimes(condition=None):
+    # SUM(crime_count), optionally filtered, never NULL
+    return Coalesce(Sum('crime_count', filter=condition), 0)
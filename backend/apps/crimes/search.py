@@ -0,0 +1,245 @@
+import logging
+import re
+from django.db                  import connection
+from django.db.models           import F, FloatField, Q, TextField, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Cast, Coalesce, Concat
+
+logger = logging.getLogger('apps.crimes')
+
+
+# ─────────────────────────────────────────────────────────────
+# FULL-TEXT SEARCH
+# PostgreSQL : weighted tsvector column (GIN) + pg_trgm on title
+#              and case_number for fuzzy / partial matches.
+# SQLite     : FTS5 shadow table keyed by rowid = crime id.
+# Both are kept current via refresh_search_index().
+# ─────────────────────────────────────────────────────────────
+SEARCH_FIELDS    = ('title', 'description', 'modus_operandi', 'location', 'weapons_used')
+SEARCH_WEIGHTS   = {
+    'title':          'A',
+    'location':       'B',
+    'weapons_used':   'B',
+    'description':    'C',
+    'modus_operandi': 'C',
+}
+SEARCH_CONFIG    = 'english'
+FTS_TABLE        = 'crimes_crimereport_fts'
+HIGHLIGHT_START  = '<mark>'
+HIGHLIGHT_STOP   = '</mark>'
+SNIPPET_GAP      = ' … '
+
+
+def is_postgres():
+    return connection.vendor == 'postgresql'
+
+
+def is_sqlite():
+    return connection.vendor == 'sqlite'
+
+
+# ─────────────────────────────────────────────────────────────
+# HELPER — Build the weighted search vector expression
+# ─────────────────────────────────────────────────────────────
+def build_search_vector():
+    from django.contrib.postgres.search import SearchVector
+
+    vector = None
+    for field in SEARCH_FIELDS:
+        part   = SearchVector(
+            Coalesce(F(field), Value('')),
+            weight=SEARCH_WEIGHTS[field],
+            config=SEARCH_CONFIG,
+        )
+        vector = part if vector is None else vector + part
+    return vector
+
+
+# ─────────────────────────────────────────────────────────────
+# HELPER — The searched fields as one text, for headlines
+# ─────────────────────────────────────────────────────────────
+def build_search_document():
+    parts = []
+    for field in SEARCH_FIELDS:
+        parts += [Coalesce(F(field), Value('')), Value(SNIPPET_GAP)]
+    return Concat(*parts[:-1], output_field=TextField())
+
+
+# ─────────────────────────────────────────────────────────────
+# HELPER — Turn free text into a safe FTS5 MATCH expression
+# Every word must match; the last word is prefix-matched so
+# "armed robb" finds "armed robbery".
+# ─────────────────────────────────────────────────────────────
+def to_fts5_query(text):
+    words = re.findall(r'\w+', text, flags=re.UNICODE)
+    if not words:
+        return None
+    terms = [f'"{w}"' for w in words[:-1]] + [f'"{words[-1]}"*']
+    return ' '.join(terms)
+
+
+# ─────────────────────────────────────────────────────────────
+# KEEP INDEX CURRENT
+# ─────────────────────────────────────────────────────────────
+def refresh_search_index(ids=None):
+    """
+    Recompute search data for the given crime ids (all rows if None).
+    One set-based statement per backend regardless of row count.
+    """
+    from .models import CrimeReport
+
+    if ids is not None:
+        ids = list(ids)
+        if not ids:
+            return
+
+    if is_postgres():
+        reports = CrimeReport.objects.all()
+        if ids is not None:
+            reports = reports.filter(id__in=ids)
+        reports.update(search_vector=build_search_vector())
+
+    elif is_sqlite():
+        columns  = ', '.join(SEARCH_FIELDS)
+        coalesce = ', '.join(f"COALESCE({f}, '')" for f in SEARCH_FIELDS)
+        table    = CrimeReport._meta.db_table
+        with connection.cursor() as cursor:
+            if ids is None:
+                cursor.execute(f'DELETE FROM {FTS_TABLE}')
+                cursor.execute(
+                    f'INSERT INTO {FTS_TABLE} (rowid, {columns}) '
+                    f'SELECT id, {coalesce} FROM {table}'
+                )
+            else:
+                placeholders = ', '.join(['%s'] * len(ids))
+                cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', ids)
+                cursor.execute(
+                    f'INSERT INTO {FTS_TABLE} (rowid, {columns}) '
+                    f'SELECT id, {coalesce} FROM {table} WHERE id IN ({placeholders})',
+                    ids,
+                )
+
+
+def remove_from_search_index(ids):
+    # The PostgreSQL vector lives on the row itself; only FTS5 needs cleanup.
+    ids = list(ids)
+    if not ids or not is_sqlite():
+        return
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {FTS_TABLE} WHERE rowid IN ({placeholders})', ids)
+
+
+# ─────────────────────────────────────────────────────────────
+# SEARCH — filter + rank
+# Returns the queryset narrowed to matches and annotated with a
+# float 'search_rank' (higher is better). Case-number substring
+# matches are kept so "00123" still finds UPF-CASE-00123.
+# ─────────────────────────────────────────────────────────────
+def search_reports(queryset, text):
+    text = (text or '').strip()
+    if not text:
+        return queryset.annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+    if is_postgres():
+        from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        return (
+            queryset
+            .filter(
+                Q(search_vector=query)
+                | Q(title__trigram_similar=text)
+                | Q(case_number__icontains=text)
+            )
+            .annotate(search_rank=Cast(
+                Coalesce(SearchRank(F('search_vector'), query), Value(0.0))
+                + TrigramSimilarity('title', text),
+                FloatField(),
+            ))
+        )
+
+    if is_sqlite():
+        match = to_fts5_query(text)
+        if match is None:
+            return queryset.filter(case_number__icontains=text).annotate(
+                search_rank=Value(0.0, output_field=FloatField())
+            )
+        table = queryset.model._meta.db_table
+        return (
+            queryset
+            .filter(
+                Q(id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', (match,)))
+                | Q(case_number__icontains=text)
+            )
+            .annotate(search_rank=Coalesce(
+                RawSQL(
+                    f'SELECT -bm25({FTS_TABLE}, 10.0, 2.0, 2.0, 5.0, 5.0) FROM {FTS_TABLE} '
+                    f'WHERE {FTS_TABLE} MATCH %s AND {FTS_TABLE}.rowid = {table}.id',
+                    (match,),
+                    output_field=FloatField(),
+                ),
+                Value(0.0),
+                output_field=FloatField(),
+            ))
+        )
+
+    # Other backends: plain substring search, de-duplicated via one Q
+    return queryset.filter(
+        Q(title__icontains=text)
+        | Q(description__icontains=text)
+        | Q(case_number__icontains=text)
+    ).annotate(search_rank=Value(0.0, output_field=FloatField()))
+
+
+# ─────────────────────────────────────────────────────────────
+# HIGHLIGHTS — computed only for the rows on the current page
+# ─────────────────────────────────────────────────────────────
+def get_highlights(ids, text):
+    """
+    Returns {crime_id: snippet} with matched terms wrapped in <mark>,
+    taken from the same fields the search matched on.
+    """
+    from .models import CrimeReport
+
+    ids  = list(ids)
+    text = (text or '').strip()
+    if not ids or not text:
+        return {}
+
+    if is_postgres():
+        from django.contrib.postgres.search import SearchHeadline, SearchQuery
+
+        query = SearchQuery(text, search_type='websearch', config=SEARCH_CONFIG)
+        rows  = (
+            CrimeReport.objects
+            .filter(id__in=ids)
+            .annotate(highlight=SearchHeadline(
+                build_search_document(), query,
+                config=SEARCH_CONFIG,
+                start_sel=HIGHLIGHT_START,
+                stop_sel=HIGHLIGHT_STOP,
+                max_words=35,
+                min_words=15,
+                # Fragments around the matches, whichever field they're in
+                max_fragments=2,
+                fragment_delimiter=SNIPPET_GAP,
+            ))
+            .values_list('id', 'highlight')
+        )
+        return dict(rows)
+
+    if is_sqlite():
+        match = to_fts5_query(text)
+        if match is None:
+            return {}
+        placeholders = ', '.join(['%s'] * len(ids))
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"SELECT rowid, snippet({FTS_TABLE}, -1, %s, %s, '…', 24) FROM {FTS_TABLE} "
+                f'WHERE {FTS_TABLE} MATCH %s AND rowid IN ({placeholders})',
+                [HIGHLIGHT_START, HIGHLIGHT_STOP, match, *ids],
+            )
+            return dict(cursor.fetchall())
+
+    return {}
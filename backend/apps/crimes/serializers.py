@@ -1,5 +1,5 @@
 from rest_framework import serializers
-from .models import CrimeReport, Suspect, Witness
+from .models import CrimeReport, Suspect, Witness, ImportJob
 
 
 # ─────────────────────────────────────────────────────────────
@@ -203,4 +203,62 @@ class CrimeReportUpdateSerializer(serializers.ModelSerializer):
             'victim_details',
             'evidence_notes',
             'attachment',
-        ]
\ No newline at end of file
+        ]
+
+
+# ─────────────────────────────────────────────────────────────
+# IMPORT JOB SERIALIZER
+# 'summary' / 'created_cases' / 'skipped_rows' / 'error_rows'
+# keep the shape of the old synchronous upload response.
+# ─────────────────────────────────────────────────────────────
+class ImportJobSerializer(serializers.ModelSerializer):
+
+    summary           = serializers.SerializerMethodField()
+    progress_percent  = serializers.ReadOnlyField()
+    rows_per_second   = serializers.ReadOnlyField()
+    eta_seconds       = serializers.ReadOnlyField()
+    elapsed_seconds   = serializers.ReadOnlyField()
+    peak_memory_mb    = serializers.ReadOnlyField()
+    is_stale          = serializers.ReadOnlyField()
+
+    class Meta:
+        model  = ImportJob
+        fields = [
+            'id',
+            'original_name',
+            'status',
+            'on_duplicate',
+            'cancel_requested',
+            'is_stale',
+            'error_message',
+            'total_rows',
+            'rows_processed',
+            'created_count',
+            'skipped_count',
+            'failed_count',
+            'duplicate_count',
+            'progress_percent',
+            'rows_per_second',
+            'eta_seconds',
+            'elapsed_seconds',
+            'peak_memory_mb',
+            'summary',
+            'created_cases',
+            'skipped_rows',
+            'error_rows',
+            'duplicate_rows',
+            'created_at',
+            'started_at',
+            'finished_at',
+        ]
+        read_only_fields = fields
+
+    def get_summary(self, obj):
+        return {
+            'total_rows': obj.total_rows,
+            'created':    obj.created_count,
+            'skipped':    obj.skipped_count,
+            'errors':     obj.failed_count,
+            'duplicates': obj.duplicate_count,
+            'peak_memory_mb': obj.peak_memory_mb,
+        }
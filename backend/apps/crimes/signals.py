@@ -0,0 +1,82 @@
+from django.db.models.signals  import pre_save, post_save, post_delete
+from django.dispatch           import Signal, receiver
+
+from .data_version  import bump_data_version
+from .models        import CrimeReport
+from .rollup        import ROLLUP_FIELDS, record_changed, record_created, record_deleted, row_snapshot, snapshot
+from .search        import SEARCH_FIELDS, refresh_search_index, remove_from_search_index
+
+
+# Sent by the bulk importer after a chunk's bulk_create (which
+# fires no post_save), with crimes=[the created CrimeReports]
+crimes_imported = Signal()
+
+
+# ─────────────────────────────────────────────────────────────
+# SEARCH INDEX — keep current on every save / delete
+# Bulk paths (bulk_create, queryset.update) bypass signals and
+# call refresh_search_index() / rollup.record_*() /
+# bump_data_version() themselves.
+# ─────────────────────────────────────────────────────────────
+@receiver(post_save, sender=CrimeReport)
+def crime_report_saved(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    refresh_search_index([instance.pk])
+
+
+@receiver(post_delete, sender=CrimeReport)
+def crime_report_deleted(sender, instance, **kwargs):
+    remove_from_search_index([instance.pk])
+
+
+# ─────────────────────────────────────────────────────────────
+# STORED ROW — read once in pre_save, shared by post_save receivers
+# instance._stored_row holds the ROLLUP_FIELDS as they were before
+# the save (None for new reports, or when no such field is saved).
+# The rollup moves counts from the old cell to the new one; the
+# dashboard live feed compares severity/status with it. The row is
+# locked (CrimeReport.save() runs in a transaction), so concurrent
+# updates of one report apply their deltas one after the other.
+# ─────────────────────────────────────────────────────────────
+def touches_rollup(update_fields):
+    return update_fields is None or bool(set(update_fields) & set(ROLLUP_FIELDS))
+
+
+@receiver(pre_save, sender=CrimeReport)
+def crime_report_saving(sender, instance, update_fields=None, **kwargs):
+    instance._stored_row = (
+        CrimeReport.objects.select_for_update().filter(pk=instance.pk).values(*ROLLUP_FIELDS).first()
+        if instance.pk and touches_rollup(update_fields) else None
+    )
+
+
+# ─────────────────────────────────────────────────────────────
+# DAILY STATS ROLLUP — apply each save / delete as a delta
+# ─────────────────────────────────────────────────────────────
+@receiver(post_save, sender=CrimeReport)
+def crime_report_rollup(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        record_created([instance])
+    elif touches_rollup(update_fields):
+        stored = getattr(instance, '_stored_row', None)
+        before = {instance.pk: row_snapshot(stored)} if stored else {}
+        record_changed(before, {instance.pk: snapshot(instance)})
+
+
+@receiver(post_delete, sender=CrimeReport)
+def crime_report_rollup_deleted(sender, instance, **kwargs):
+    record_deleted([snapshot(instance)])
+
+
+# ─────────────────────────────────────────────────────────────
+# DATA VERSION — invalidates cached dashboard responses
+# ─────────────────────────────────────────────────────────────
+@receiver(post_save, sender=CrimeReport)
+def crime_report_version(sender, instance, **kwargs):
+    bump_data_version()
+
+
+@receiver(post_delete, sender=CrimeReport)
+def crime_report_version_deleted(sender, instance, **kwargs):
+    bump_data_version()
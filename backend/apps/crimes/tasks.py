@@ -0,0 +1,144 @@
+import logging
+import time
+from celery                     import shared_task
+from django.conf                import settings
+from django.db                  import transaction
+from django.utils               import timezone
+
+from .importer  import (
+    IMPORT_CHUNK_SIZE,
+    estimate_total_rows,
+    iter_upload_chunks,
+    clean_frame,
+    split_duplicates,
+    insert_chunk,
+    record_chunk,
+    reset_peak_memory,
+)
+from .models    import ImportJob, ImportStatus
+
+logger = logging.getLogger('apps.crimes')
+
+# Re-queue before CELERY_TASK_TIME_LIMIT; the next run resumes
+# from the last committed chunk.
+IMPORT_RUN_BUDGET_SECONDS = 20 * 60
+
+
+# ─────────────────────────────────────────────────────────────
+# ENQUEUE — safe to call from a request (after commit)
+# ─────────────────────────────────────────────────────────────
+def enqueue_import(job_id):
+    try:
+        result = import_crimes_task.delay(job_id)
+        ImportJob.objects.filter(pk=job_id).update(celery_task_id=result.id or '')
+    except Exception as e:
+        logger.error(f"Could not queue import job {job_id}: {e}")
+        ImportJob.objects.filter(pk=job_id).update(
+            status        = ImportStatus.FAILED,
+            error_message = f'Could not queue import: {e}',
+            finished_at   = timezone.now(),
+        )
+
+
+# ─────────────────────────────────────────────────────────────
+# TASK — Import a stored upload chunk by chunk
+# Each chunk's rows and the job's progress counters commit in
+# one transaction, so resuming never duplicates or drops rows.
+# ─────────────────────────────────────────────────────────────
+@shared_task(name='crimes.import_crimes')
+def import_crimes_task(job_id):
+    try:
+        job = ImportJob.objects.select_related('uploaded_by').get(pk=job_id)
+    except ImportJob.DoesNotExist:
+        logger.warning(f"Import job {job_id} no longer exists")
+        return
+
+    if job.status in (ImportStatus.COMPLETED, ImportStatus.CANCELLED):
+        return
+    if job.cancel_requested:
+        finish_job(job, ImportStatus.CANCELLED)
+        return
+
+    job.status        = ImportStatus.RUNNING
+    job.started_at    = timezone.now()
+    job.finished_at   = None
+    job.resumed_from  = job.rows_processed
+    job.error_message = ''
+    job.save(update_fields=['status', 'started_at', 'finished_at', 'resumed_from', 'error_message', 'updated_at'])
+
+    run_started = time.monotonic()
+    reset_peak_memory()
+    try:
+        with job.file.open('rb') as fileobj:
+            if not job.total_rows:
+                job.total_rows = estimate_total_rows(fileobj, job.original_name)
+                job.save(update_fields=['total_rows', 'updated_at'])
+
+            chunks = iter_upload_chunks(fileobj, job.original_name, IMPORT_CHUNK_SIZE, start_row=job.rows_processed)
+            for raw in chunks:
+                state = ImportJob.objects.filter(pk=job.pk).values('status', 'cancel_requested').first()
+                if not state or state['status'] != ImportStatus.RUNNING:
+                    # Given up on as stale while this run was stuck; don't race a resume
+                    logger.warning(f"Import job {job.pk} is no longer running; stopping at row {job.rows_processed}")
+                    return
+                if state['cancel_requested']:
+                    finish_job(job, ImportStatus.CANCELLED)
+                    logger.info(f"Import job {job.pk} cancelled at row {job.rows_processed}")
+                    return
+
+                with transaction.atomic():
+                    clean, skipped    = clean_frame(raw)
+                    clean, duplicates = split_duplicates(clean, job.on_duplicate)
+                    created, errors   = insert_chunk(clean, job.uploaded_by)
+                    record_chunk(job, len(raw), created, skipped, errors, duplicates)
+
+                if time.monotonic() - run_started > IMPORT_RUN_BUDGET_SECONDS:
+                    logger.info(f"Import job {job.pk} re-queued at row {job.rows_processed}")
+                    job.status = ImportStatus.PENDING
+                    job.save(update_fields=['status', 'updated_at'])
+                    chunks.close()
+                    enqueue_import(job.pk)
+                    return
+
+        # The upfront count is an estimate; settle on the real figure
+        job.total_rows = job.rows_processed
+        job.save(update_fields=['total_rows', 'updated_at'])
+        finish_job(job, ImportStatus.COMPLETED)
+        logger.info(
+            f"Import job {job.pk} complete: {job.created_count} created, "
+            f"{job.skipped_count} skipped, {job.duplicate_count} duplicates, {job.failed_count} errors "
+            f"({job.rows_per_second} rows/s, peak {job.peak_memory_mb} MB)"
+        )
+
+    except Exception as e:
+        logger.error(f"Import job {job.pk} failed at row {job.rows_processed}: {e}")
+        job.error_message = str(e)
+        finish_job(job, ImportStatus.FAILED)
+
+
+def finish_job(job, status_):
+    job.status      = status_
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at', 'error_message', 'updated_at'])
+
+
+# ─────────────────────────────────────────────────────────────
+# TASK — Fail imports whose worker died (every 5 min, Celery beat)
+# A live run commits a chunk (and touches updated_at) every few
+# seconds; one silent for CRIME_IMPORT_STALE_MINUTES was killed.
+# Failed jobs can be resumed from the last committed chunk.
+# ─────────────────────────────────────────────────────────────
+@shared_task(name='crimes.fail_stale_imports')
+def fail_stale_imports_task():
+    now   = timezone.now()
+    stale = ImportJob.objects.filter(status=ImportStatus.RUNNING, updated_at__lt=ImportJob.stale_cutoff())
+    count = stale.update(
+        status        = ImportStatus.FAILED,
+        error_message = f'Import stopped making progress (no chunk for '
+                        f'{settings.CRIME_IMPORT_STALE_MINUTES} minutes). Resume to continue.',
+        finished_at   = now,
+        updated_at    = now,
+    )
+    if count:
+        logger.warning(f"Marked {count} stale import jobs as failed")
+    return count
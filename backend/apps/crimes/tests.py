@@ -1,3 +1,441 @@
-from django.test import TestCase
+import gzip
+import io
+import shutil
+import tempfile
+import zipfile
+import pandas as pd
+import zstandard
+from datetime                   import timedelta
+from unittest                   import mock
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db                  import connection
+from django.test                import TestCase, override_settings
+from django.test.utils          import CaptureQueriesContext
+from django.urls                import reverse
+from django.utils               import timezone
+from rest_framework.test        import APIClient
 
-# Create your tests here.
+from apps.accounts.models       import OfficerUser
+from apps.crimes.case_numbers   import format_case_number, parse_case_number
+from apps.crimes.importer       import clean_frame, insert_chunk
+from apps.crimes.models         import CaseNumberCounter, CrimeDailyStat, CrimeReport, ImportJob, ImportStatus
+from apps.crimes.tasks          import fail_stale_imports_task, import_crimes_task
+
+CSV_ROWS = (
+    b'title,category,severity,description,location,district,date_occurred\n'
+    b'Armed robbery,robbery,high,Robbed at gunpoint,Kampala Road,Kampala,2026-01-15 14:30:00\n'
+    b'Assault at night,assault,high,Attacked near stage,Ntinda Stage,Kampala,\n'
+    b'Border seizure,drug_offense,critical,Hidden in cargo,Malaba Border,Tororo,sometime in March\n'
+)
+NDJSON_ROWS = (
+    b'{"title": "Phone theft", "category": "theft", "severity": "medium", "description": "Pickpocket",'
+    b' "location": "Owino Market", "district": "Kampala", "date_occurred": "2026-01-16 10:00:00"}\n'
+    b'{"title": "Bank fraud", "category": "fraud", "severity": "critical", "description": "Fake credentials",'
+    b' "location": "Stanbic Bank", "district": "Kampala", "date_occurred": "2026-01-18"}\n'
+)
+
+
+# ─────────────────────────────────────────────────────────────
+# CURSOR PAGING — newest first, id breaks ties, no repeats
+# ─────────────────────────────────────────────────────────────
+class CursorPagingTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+        CrimeReport.objects.bulk_create([
+            CrimeReport(
+                case_number   = f'UPF-TEST-{i:03d}',
+                title         = f'Case {i}',
+                category      = 'theft',
+                severity      = 'medium',
+                district      = 'Kampala',
+                description   = 'Test report',
+                location      = 'Test location',
+                date_occurred = timezone.now(),
+                reported_by   = cls.officer if i % 2 else None,
+            )
+            for i in range(7)
+        ])
+        # Three reports share a timestamp, so paging must fall back on id
+        reported = timezone.now() - timedelta(days=1)
+        for offset, pk in enumerate(CrimeReport.objects.order_by('id').values_list('id', flat=True)):
+            CrimeReport.objects.filter(pk=pk).update(date_reported=reported + timedelta(hours=min(offset, 2)))
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def walk(self, url, **params):
+        ids, pages, cursor = [], [], None
+        while True:
+            response = self.client.get(url, {**params, **({'cursor': cursor} if cursor else {})})
+            self.assertEqual(response.status_code, 200, response.data)
+            pages.append(response.data)
+            ids.extend(item['id'] for item in response.data['results'])
+            cursor = response.data['next']
+            if not cursor:
+                return ids, pages
+
+    def expected(self, reports):
+        return list(reports.order_by('-date_reported', '-id').values_list('id', flat=True))
+
+    def test_pages_follow_date_then_id(self):
+        ids, pages = self.walk(reverse('crime-list-create'), page_size=3, with_count=1)
+
+        self.assertEqual(ids, self.expected(CrimeReport.objects.all()))
+        self.assertEqual([len(page['results']) for page in pages], [3, 3, 1])
+        self.assertEqual(pages[0]['count'], 7)
+        self.assertIsNone(pages[-1]['next'])
+
+    def test_my_reports_pages_only_mine(self):
+        ids, pages = self.walk(reverse('my-reports'), page_size=2)
+
+        self.assertEqual(ids, self.expected(CrimeReport.objects.filter(reported_by=self.officer)))
+        self.assertEqual(len(ids), 3)
+        self.assertIsNone(pages[0]['count'])
+
+    def test_page_size_is_capped(self):
+        response = self.client.get(reverse('crime-list-create'), {'page_size': 1000})
+        self.assertEqual(response.data['page_size'], 100)
+        self.assertEqual(len(response.data['results']), 7)
+
+    def test_bad_cursor_is_rejected(self):
+        response = self.client.get(reverse('crime-list-create'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+
+# ─────────────────────────────────────────────────────────────
+# SEARCH — ranked full-text matches with highlights
+# ─────────────────────────────────────────────────────────────
+class SearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def report(self, title, description='Reported at the station', location='Test location'):
+        return CrimeReport.objects.create(
+            title=title, category='robbery', severity='high', district='Kampala',
+            description=description, location=location, date_occurred=timezone.now(),
+        )
+
+    def search(self, text, **params):
+        response = self.client.get(reverse('crime-list-create'), {'search': text, **params})
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def test_title_matches_rank_first_and_every_match_is_highlighted(self):
+        in_description = self.report('Break-in', description='A robbery followed the break-in')
+        in_location    = self.report('Shop raided', location='Robbery Lane')
+        in_title       = self.report('Armed robbery')
+        self.report('Phone theft')
+
+        results = self.search('robbery')['results']
+
+        self.assertEqual(results[0]['id'], in_title.id)
+        self.assertEqual({item['id'] for item in results}, {in_title.id, in_location.id, in_description.id})
+        ranks = [item['search_rank'] for item in results]
+        self.assertEqual(ranks, sorted(ranks, reverse=True))
+        for item in results:
+            self.assertRegex(item['highlight'], r'(?i)<mark>robbery</mark>')
+
+    def test_prefix_of_last_word_matches(self):
+        crime = self.report('Armed robbery')
+        self.assertEqual([item['id'] for item in self.search('armed robb')['results']], [crime.id])
+
+    def test_ranked_results_page_by_rank_then_id(self):
+        crimes = [self.report('Armed robbery') for _ in range(5)]
+        self.report('Robbery suspect robbery', description='robbery robbery')
+
+        ids, cursor = [], None
+        while True:
+            page = self.search('robbery', page_size=2, **({'cursor': cursor} if cursor else {}))
+            ids.extend(item['id'] for item in page['results'])
+            cursor = page['next']
+            if not cursor:
+                break
+
+        self.assertEqual(len(ids), 6)
+        self.assertEqual(len(set(ids)), 6)
+        # Equal ranks fall back on id, newest first
+        self.assertEqual(ids[-5:], sorted((crime.id for crime in crimes), reverse=True))
+
+        # A date cursor can't be replayed against ranked results
+        dated = self.client.get(reverse('crime-list-create'), {'page_size': 1}).data['next']
+        response = self.client.get(reverse('crime-list-create'), {'search': 'robbery', 'cursor': dated})
+        self.assertEqual(response.status_code, 400)
+
+    def test_index_follows_updates_and_deletes(self):
+        crime = self.report('Armed robbery')
+
+        crime.title = 'Armed burglary'
+        crime.save()
+        self.assertEqual(self.search('robbery')['results'], [])
+        self.assertEqual([item['id'] for item in self.search('burglary')['results']], [crime.id])
+
+        crime.delete()
+        self.assertEqual(self.search('burglary')['results'], [])
+
+
+# ─────────────────────────────────────────────────────────────
+# CASE NUMBERS — allocated in order, never reused
+# ─────────────────────────────────────────────────────────────
+class CaseNumberTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+
+    def report(self):
+        return CrimeReport.objects.create(
+            title='Armed robbery', category='robbery', severity='high', district='Kampala',
+            description='Test report', location='Test location', date_occurred=timezone.now(),
+        )
+
+    def numbers(self):
+        return list(CrimeReport.objects.order_by('id').values_list('case_number', flat=True))
+
+    def test_saves_and_imports_share_one_gapless_sequence(self):
+        start = parse_case_number(self.report().case_number)
+        self.report()
+        clean, _ = clean_frame(pd.read_csv(io.BytesIO(CSV_ROWS)))
+        created, errors = insert_chunk(clean, self.officer)
+        self.report()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(created), 3)
+        self.assertEqual(self.numbers(), [format_case_number(start + i) for i in range(6)])
+
+    def test_missing_counter_resumes_after_stored_numbers(self):
+        CrimeReport.objects.bulk_create([
+            CrimeReport(
+                case_number=format_case_number(41), title='Imported', category='theft', severity='low',
+                district='Gulu', description='Test report', location='Test location', date_occurred=timezone.now(),
+            )
+        ])
+        CaseNumberCounter.objects.all().delete()
+
+        self.assertEqual(self.report().case_number, format_case_number(42))
+        self.assertEqual(CaseNumberCounter.objects.get().last_value, 42)
+
+
+# ─────────────────────────────────────────────────────────────
+# BULK UPLOAD — file in, import job run, reports stored
+# ─────────────────────────────────────────────────────────────
+class BulkUploadTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media, ignore_errors=True)
+        stored = override_settings(MEDIA_ROOT=media)
+        stored.enable()
+        self.addCleanup(stored.disable)
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def upload(self, name, content, **data):
+        # Small uploads stay in memory, as they do in production
+        file = SimpleUploadedFile(name, content)
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.client.post(reverse('crime-bulk-upload'), {'file': file, **data}, format='multipart')
+        self.assertEqual(response.status_code, 202, response.data)
+        job_id = response.data['job']['id']
+        import_crimes_task(job_id)
+        return ImportJob.objects.get(pk=job_id)
+
+    def test_in_memory_ndjson_upload(self):
+        job = self.upload('crimes.ndjson', NDJSON_ROWS)
+
+        self.assertEqual(job.status, ImportStatus.COMPLETED, job.error_message)
+        self.assertEqual(job.created_count, 2)
+        self.assertEqual(
+            sorted(CrimeReport.objects.values_list('title', flat=True)),
+            ['Bank fraud', 'Phone theft'],
+        )
+
+    def test_retry_does_not_duplicate_undated_rows(self):
+        # Missing and unparseable dates are stored as the import time,
+        # which must not leak into the duplicate check
+        first = self.upload('crimes.csv', CSV_ROWS)
+        with mock.patch('django.utils.timezone.now', return_value=timezone.now() + timedelta(hours=1)):
+            second = self.upload('crimes.csv', CSV_ROWS)
+
+        self.assertEqual(first.created_count, 3)
+        self.assertEqual(second.created_count, 0)
+        self.assertEqual(second.duplicate_count, 3)
+        self.assertEqual(CrimeReport.objects.count(), 3)
+
+    def test_gzip_csv_upload(self):
+        job = self.upload('crimes.csv.gz', gzip.compress(CSV_ROWS))
+
+        self.assertEqual(job.status, ImportStatus.COMPLETED, job.error_message)
+        self.assertEqual(job.created_count, 3)
+
+    def test_zstd_csv_upload(self):
+        job = self.upload('crimes.csv.zst', zstandard.ZstdCompressor().compress(CSV_ROWS))
+
+        self.assertEqual(job.status, ImportStatus.COMPLETED, job.error_message)
+        self.assertEqual(job.created_count, 3)
+
+    def test_zip_of_csv_and_ndjson(self):
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, 'w') as bundle:
+            bundle.writestr('batch/crimes.csv', CSV_ROWS)
+            bundle.writestr('batch/crimes.ndjson', NDJSON_ROWS)
+            bundle.writestr('__MACOSX/batch/._crimes.csv', b'junk')
+        job = self.upload('batch.zip', archive.getvalue())
+
+        self.assertEqual(job.status, ImportStatus.COMPLETED, job.error_message)
+        self.assertEqual(job.created_count, 5)
+        self.assertEqual(CrimeReport.objects.count(), 5)
+
+    def test_xlsx_upload(self):
+        sheet = io.BytesIO()
+        pd.read_csv(io.BytesIO(CSV_ROWS)).to_excel(sheet, index=False)
+        job = self.upload('crimes.xlsx', sheet.getvalue())
+
+        self.assertEqual(job.status, ImportStatus.COMPLETED, job.error_message)
+        self.assertEqual(job.created_count, 3)
+        self.assertEqual(
+            timezone.localtime(CrimeReport.objects.get(title='Armed robbery').date_occurred).strftime('%Y-%m-%d %H:%M'),
+            '2026-01-15 14:30',
+        )
+
+
+# ─────────────────────────────────────────────────────────────
+# DRY RUN — every row checked, nothing stored
+# ─────────────────────────────────────────────────────────────
+class DryRunTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def dry_run(self, name, content):
+        file     = SimpleUploadedFile(name, content)
+        response = self.client.post(reverse('crime-bulk-upload') + '?dry_run=1', {'file': file}, format='multipart')
+        self.assertEqual(response.status_code, 200, response.data)
+        self.assertFalse(ImportJob.objects.exists())
+        self.assertFalse(CrimeReport.objects.exists())
+        return response.data
+
+    def test_reports_row_issues(self):
+        report = self.dry_run('crimes.csv', CSV_ROWS)
+
+        self.assertTrue(report['valid'])
+        self.assertEqual(report['missing_columns'], [])
+        self.assertEqual((report['total_rows'], report['importable_rows']), (3, 3))
+        issues = {issue['issue']: issue['samples'] for issue in report['issues']}
+        self.assertEqual(issues['Missing date — current time used'], [{'row': 3, 'value': None}])
+        self.assertEqual(issues['Unparseable date — current time used'], [{'row': 4, 'value': 'sometime in March'}])
+
+    def test_reports_missing_required_columns(self):
+        rows   = b'title,description,district\nArmed robbery,Robbed at gunpoint,Kampala\n'
+        report = self.dry_run('crimes.csv', rows)
+
+        self.assertFalse(report['valid'])
+        self.assertEqual(report['missing_columns'], ['category', 'severity', 'location', 'date_occurred'])
+        self.assertEqual(report['total_rows'], 1)
+
+
+# ─────────────────────────────────────────────────────────────
+# STALE IMPORTS — a job whose worker died can be failed or resumed
+# ─────────────────────────────────────────────────────────────
+@override_settings(CRIME_IMPORT_STALE_MINUTES=10)
+class StaleImportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def running_job(self, idle_minutes):
+        job = ImportJob.objects.create(
+            uploaded_by=self.officer, original_name='crimes.csv', status=ImportStatus.RUNNING, rows_processed=3000,
+        )
+        ImportJob.objects.filter(pk=job.pk).update(updated_at=timezone.now() - timedelta(minutes=idle_minutes))
+        return job
+
+    def test_sweeper_fails_only_silent_jobs(self):
+        stale, live = self.running_job(30), self.running_job(1)
+
+        self.assertEqual(fail_stale_imports_task(), 1)
+        self.assertEqual(ImportJob.objects.get(pk=stale.pk).status, ImportStatus.FAILED)
+        self.assertEqual(ImportJob.objects.get(pk=live.pk).status, ImportStatus.RUNNING)
+
+    def test_resume_accepts_stale_running_job(self):
+        stale, live = self.running_job(30), self.running_job(1)
+
+        with self.captureOnCommitCallbacks(execute=False):
+            response = self.client.post(reverse('crime-import-job-resume', args=[stale.pk]))
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['job']['status'], ImportStatus.PENDING)
+        self.assertEqual(response.data['job']['rows_processed'], 3000)
+
+        response = self.client.post(reverse('crime-import-job-resume', args=[live.pk]))
+        self.assertEqual(response.status_code, 400)
+
+    def test_cancel_finishes_stale_job_directly(self):
+        stale = self.running_job(30)
+
+        response = self.client.post(reverse('crime-import-job-cancel', args=[stale.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ImportJob.objects.get(pk=stale.pk).status, ImportStatus.CANCELLED)
+
+
+# ─────────────────────────────────────────────────────────────
+# SAVE SIGNALS — the stored row is read once per save
+# ─────────────────────────────────────────────────────────────
+class SaveSignalTests(TestCase):
+
+    def test_update_reads_the_stored_row_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            crime = CrimeReport.objects.create(
+                title='Armed robbery', category='robbery', severity='high', district='Gulu',
+                description='Test report', location='Test location', date_occurred=timezone.now(),
+            )
+
+        crime.status   = 'solved'
+        crime.severity = 'critical'
+        with CaptureQueriesContext(connection) as queries, \
+                mock.patch('apps.dashboard.signals.publish') as publish:
+            crime.save()
+
+        table = CrimeReport._meta.db_table
+        reads = [q['sql'] for q in queries if q['sql'].startswith('SELECT') and f'FROM "{table}"' in q['sql']]
+        self.assertEqual(len(reads), 1, reads)
+
+        # The rollup and the live feed both saw the old values
+        self.assertEqual(
+            list(CrimeDailyStat.objects.values_list('severity', 'status', 'crime_count')),
+            [('critical', 'solved', 1)],
+        )
+        self.assertEqual([call.args[0] for call in publish.call_args_list], ['status', 'alert-resolved'])
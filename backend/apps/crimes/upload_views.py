@@ -1,90 +1,38 @@
 import logging
-import pandas as pd
-from io                         import StringIO, BytesIO
-from datetime                   import datetime
+from django.db                  import transaction
 from django.utils               import timezone
 from rest_framework             import status
 from rest_framework.views       import APIView
 from rest_framework.response    import Response
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.parsers     import MultiPartParser, FormParser
-from drf_spectacular.utils      import extend_schema
+from drf_spectacular.utils      import OpenApiParameter, extend_schema
 
-from .models        import CrimeReport, CrimeCategory, CrimeSeverity
+from .importer      import REQUIRED_COLUMNS, UnsupportedFileType, read_header
+from .models        import DuplicatePolicy, ImportJob, ImportStatus
+from .serializers   import ImportJobSerializer
+from .tasks         import enqueue_import
+from .validation    import validate_upload
 
 logger = logging.getLogger('apps.crimes')
 
 
-# ─────────────────────────────────────────────────────────────
-# VALID CHOICES
-# ─────────────────────────────────────────────────────────────
-VALID_CATEGORIES = [
-    'theft', 'assault', 'homicide', 'fraud', 'cybercrime',
-    'robbery', 'burglary', 'drug_offense', 'sexual_offense',
-    'vandalism', 'kidnapping', 'arson', 'corruption', 'other'
-]
-VALID_SEVERITIES = ['low', 'medium', 'high', 'critical']
-
-
-# ─────────────────────────────────────────────────────────────
-# HELPER — Parse a date string flexibly
-# ─────────────────────────────────────────────────────────────
-def parse_date(date_str):
-    if not date_str or pd.isna(date_str):
-        return timezone.now()
-    formats = [
-        '%Y-%m-%d %H:%M:%S',
-        '%Y-%m-%d %H:%M',
-        '%Y-%m-%d',
-        '%d/%m/%Y %H:%M',
-        '%d/%m/%Y',
-    ]
-    for fmt in formats:
-        try:
-            dt = datetime.strptime(str(date_str).strip(), fmt)
-            return timezone.make_aware(dt)
-        except ValueError:
-            continue
-    return timezone.now()
-
-
-# ─────────────────────────────────────────────────────────────
-# HELPER — Clean and validate a row
-# ─────────────────────────────────────────────────────────────
-def clean_row(row):
-    category = str(row.get('category', 'other')).strip().lower()
-    severity = str(row.get('severity', 'medium')).strip().lower()
-
-    if category not in VALID_CATEGORIES:
-        category = 'other'
-    if severity not in VALID_SEVERITIES:
-        severity = 'medium'
-
-    return {
-        'title':          str(row.get('title',          'Untitled Crime')).strip()[:200],
-        'category':       category,
-        'severity':       severity,
-        'description':    str(row.get('description',    'No description provided')).strip(),
-        'location':       str(row.get('location',       'Unknown')).strip()[:200],
-        'district':       str(row.get('district',       'Unknown')).strip()[:100],
-        'date_occurred':  parse_date(row.get('date_occurred')),
-        'victim_count':   int(row.get('victim_count',   1)) if str(row.get('victim_count', 1)).isdigit() else 1,
-        'weapons_used':   str(row.get('weapons_used',   '')).strip() if pd.notna(row.get('weapons_used')) else '',
-        'modus_operandi': str(row.get('modus_operandi', '')).strip() if pd.notna(row.get('modus_operandi')) else '',
-        'victim_details': str(row.get('victim_details', '')).strip() if pd.notna(row.get('victim_details')) else '',
-        'evidence_notes': str(row.get('evidence_notes', '')).strip() if pd.notna(row.get('evidence_notes')) else '',
-    }
-
-
 # ─────────────────────────────────────────────────────────────
 # CSV / EXCEL BULK UPLOAD
 # POST /api/crimes/upload/
 # ─────────────────────────────────────────────────────────────
 @extend_schema(
     tags=['🚔 Crimes'],
-    summary='Bulk upload crimes from CSV or Excel file',
+    summary='Bulk upload crimes from CSV, NDJSON, archive or Excel file',
     description='''
-Upload a CSV or Excel file containing multiple crime records.
+Upload a file containing multiple crime records: CSV, newline-delimited
+JSON (.ndjson / .jsonl — one object per line), either of these compressed
+as .gz or .zst (e.g. `crimes.csv.gz`), a .zip holding several CSV/NDJSON
+files, or Excel (.xlsx, .xls). Compressed files are decompressed as they
+are read, never fully in memory.
+The file is stored and imported in the background; the response
+(202) contains an import job — poll `/api/crimes/upload/jobs/<id>/`
+for progress.
 
 **Required columns:** title, category, severity, description, location, district, date_occurred
 
@@ -96,7 +44,20 @@ drug_offense, sexual_offense, vandalism, kidnapping, arson, corruption, other
 **Valid severities:** low, medium, high, critical
 
 **Date format:** YYYY-MM-DD HH:MM:SS or YYYY-MM-DD
-    '''
+
+**Duplicates:** rows whose title, category, date_occurred, district, location
+and description match an existing report are not inserted again. Send
+`on_duplicate=update` to refresh severity, victim count, weapons, modus operandi,
+victim details and evidence notes on the existing report instead of skipping.
+Duplicates are counted in the job summary, so retrying an upload is safe.
+
+**Dry run:** `?dry_run=1` validates every row with the same cleaning rules and
+returns (200) per-column issue counts with a few sample rows each, e.g.
+"412 rows — date_occurred — Unparseable date". Nothing is stored or queued.
+    ''',
+    parameters=[
+        OpenApiParameter('dry_run', bool, description='Validate only; do not import'),
+    ],
 )
 class CrimeBulkUploadView(APIView):
     permission_classes = [IsAuthenticated]
@@ -107,108 +68,203 @@ class CrimeBulkUploadView(APIView):
 
         if not file:
             return Response(
-                {'error': 'No file provided. Upload a CSV or Excel file.'},
+                {'error': 'No file provided. Upload a CSV, NDJSON, archive or Excel file.'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        filename = file.name.lower()
-
-        # ── Read the file ────────────────────────────────────
+        # ── Read only the header row ─────────────────────────
         try:
-            if filename.endswith('.csv'):
-                content = file.read().decode('utf-8', errors='ignore')
-                df      = pd.read_csv(StringIO(content))
-
-            elif filename.endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(BytesIO(file.read()))
-
-            else:
-                return Response(
-                    {'error': 'Invalid file type. Only CSV and Excel (.xlsx, .xls) are supported.'},
-                    status=status.HTTP_400_BAD_REQUEST
-                )
-
+            columns = read_header(file, file.name)
+        except UnsupportedFileType as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             return Response(
                 {'error': f'Failed to read file: {str(e)}'},
                 status=status.HTTP_400_BAD_REQUEST
             )
 
+        # ── Dry run: validate every row, write nothing ───────
+        if is_dry_run(request):
+            try:
+                report = validate_upload(file, file.name)
+            except Exception as e:
+                return Response(
+                    {'error': f'Failed to read file: {str(e)}'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            logger.info(
+                f"Bulk upload dry run: {file.name} by {request.user.badge_number} — "
+                f"{report['total_rows']} rows, {len(report['issues'])} issues in {report['elapsed_ms']} ms"
+            )
+            return Response(report, status=status.HTTP_200_OK)
+
         # ── Validate required columns ────────────────────────
-        required_cols = ['title', 'category', 'severity', 'description', 'location', 'district', 'date_occurred']
-        missing_cols  = [col for col in required_cols if col not in df.columns]
+        missing_cols = [col for col in REQUIRED_COLUMNS if col not in columns]
 
         if missing_cols:
             return Response(
                 {
                     'error':           f'Missing required columns: {missing_cols}',
-                    'your_columns':    list(df.columns),
-                    'required_columns': required_cols,
+                    'your_columns':    columns,
+                    'required_columns': REQUIRED_COLUMNS,
                 },
                 status=status.HTTP_400_BAD_REQUEST
             )
 
-        # ── Process rows ─────────────────────────────────────
-        created   = []
-        skipped   = []
-        errors    = []
+        on_duplicate = request.data.get('on_duplicate', DuplicatePolicy.SKIP)
+        if on_duplicate not in DuplicatePolicy.values:
+            return Response(
+                {'error': f'on_duplicate must be one of {DuplicatePolicy.values}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
 
-        for idx, row in df.iterrows():
-            row_num = idx + 2   # +2 for header row and 0-indexing
+        # ── Store the file and queue the import ──────────────
+        job = ImportJob.objects.create(
+            uploaded_by   = request.user,
+            file          = file,
+            original_name = file.name,
+            on_duplicate  = on_duplicate,
+        )
+        transaction.on_commit(lambda: enqueue_import(job.pk))
 
-            try:
-                # Skip completely empty rows
-                if row.get('title', '') == '' or pd.isna(row.get('title', '')):
-                    skipped.append({'row': row_num, 'reason': 'Empty title'})
-                    continue
-
-                data = clean_row(row)
-
-                crime = CrimeReport.objects.create(
-                    reported_by     = request.user,
-                    status          = 'reported',
-                    is_analyzed     = False,
-                    **data
-                )
+        logger.info(f"Bulk upload queued: job #{job.pk} ({file.name}) by {request.user.badge_number}")
+        return Response({
+            'message': 'Upload received. Import has been queued.',
+            'job':     ImportJobSerializer(job).data,
+        }, status=status.HTTP_202_ACCEPTED)
 
-                created.append({
-                    'row':         row_num,
-                    'case_number': crime.case_number,
-                    'title':       crime.title,
-                    'category':    crime.category,
-                    'severity':    crime.severity,
-                    'district':    crime.district,
-                })
 
-                logger.info(f"Bulk upload: created {crime.case_number}")
+# ─────────────────────────────────────────────────────────────
+# HELPER — ?dry_run=1 (query string or form field)
+# ─────────────────────────────────────────────────────────────
+def is_dry_run(request):
+    value = request.query_params.get('dry_run') or request.data.get('dry_run') or ''
+    return str(value).lower() in ('1', 'true', 'yes')
 
-            except Exception as e:
-                errors.append({
-                    'row':    row_num,
-                    'title':  str(row.get('title', 'Unknown')),
-                    'error':  str(e),
-                })
-                logger.error(f"Bulk upload row {row_num} error: {e}")
-
-        # ── Summary response ─────────────────────────────────
-        logger.info(
-            f"Bulk upload complete: {len(created)} created, "
-            f"{len(skipped)} skipped, {len(errors)} errors "
-            f"by {request.user.badge_number}"
-        )
 
+# ─────────────────────────────────────────────────────────────
+# HELPER — Fetch an import job owned by the requesting officer
+# ─────────────────────────────────────────────────────────────
+def get_import_job(request, pk):
+    try:
+        return ImportJob.objects.get(pk=pk, uploaded_by=request.user)
+    except ImportJob.DoesNotExist:
+        return None
+
+
+# ─────────────────────────────────────────────────────────────
+# IMPORT JOBS — list / detail / cancel / resume
+# GET  /api/crimes/upload/jobs/
+# GET  /api/crimes/upload/jobs/<id>/
+# POST /api/crimes/upload/jobs/<id>/cancel/
+# POST /api/crimes/upload/jobs/<id>/resume/
+# ─────────────────────────────────────────────────────────────
+@extend_schema(
+    tags=['🚔 Crimes'],
+    summary='List bulk import jobs submitted by the logged-in officer',
+)
+class ImportJobListView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        jobs = ImportJob.objects.filter(uploaded_by=request.user)[:50]
+        return Response({
+            'results': ImportJobSerializer(jobs, many=True).data,
+        }, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['🚔 Crimes'],
+    summary='Get progress of a bulk import job',
+    description='Returns rows processed, created, skipped and failed, plus throughput (rows/s) and ETA.',
+)
+class ImportJobDetailView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        job = get_import_job(request, pk)
+        if not job:
+            return Response(
+                {'error': 'Import job not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(ImportJobSerializer(job).data, status=status.HTTP_200_OK)
+
+
+@extend_schema(
+    tags=['🚔 Crimes'],
+    summary='Cancel a bulk import job',
+    description='Stops the import after the chunk in progress. Already-committed rows are kept.',
+)
+class ImportJobCancelView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        job = get_import_job(request, pk)
+        if not job:
+            return Response(
+                {'error': 'Import job not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        if job.is_finished:
+            return Response(
+                {'error': f'Import job is already {job.status}.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if job.is_stale:
+            # No worker left to notice the flag
+            job.status      = ImportStatus.CANCELLED
+            job.finished_at = timezone.now()
+            job.save(update_fields=['status', 'finished_at', 'updated_at'])
+            logger.info(f"Stale import job #{job.pk} cancelled by {request.user.badge_number}")
+            return Response({
+                'message': 'Import cancelled.',
+                'job':     ImportJobSerializer(job).data,
+            }, status=status.HTTP_200_OK)
+        job.cancel_requested = True
+        job.save(update_fields=['cancel_requested', 'updated_at'])
+        logger.info(f"Import job #{job.pk} cancellation requested by {request.user.badge_number}")
+        return Response({
+            'message': 'Cancellation requested.',
+            'job':     ImportJobSerializer(job).data,
+        }, status=status.HTTP_202_ACCEPTED)
+
+
+@extend_schema(
+    tags=['🚔 Crimes'],
+    summary='Resume a failed, cancelled or stalled bulk import job',
+    description='''
+Continues from the last committed chunk; rows already imported are not repeated.
+A running job counts as stalled once it has committed nothing for
+CRIME_IMPORT_STALE_MINUTES (its worker was lost).
+    ''',
+)
+class ImportJobResumeView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, pk):
+        job = get_import_job(request, pk)
+        if not job:
+            return Response(
+                {'error': 'Import job not found.'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        if job.status not in (ImportStatus.FAILED, ImportStatus.CANCELLED) and not job.is_stale:
+            return Response(
+                {'error': 'Only failed, cancelled or stalled imports can be resumed.'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        job.status           = ImportStatus.PENDING
+        job.cancel_requested = False
+        job.finished_at      = None
+        job.save(update_fields=['status', 'cancel_requested', 'finished_at', 'updated_at'])
+        transaction.on_commit(lambda: enqueue_import(job.pk))
+
+        logger.info(f"Import job #{job.pk} resumed at row {job.rows_processed} by {request.user.badge_number}")
         return Response({
-            'message':        f'Upload complete! {len(created)} crimes imported.',
-            'summary': {
-                'total_rows':    len(df),
-                'created':       len(created),
-                'skipped':       len(skipped),
-                'errors':        len(errors),
-            },
-            'created_cases':  created,
-            'skipped_rows':   skipped,
-            'error_rows':     errors,
-        }, status=status.HTTP_201_CREATED)
+            'message': f'Import resumed from row {job.rows_processed + 2}.',
+            'job':     ImportJobSerializer(job).data,
+        }, status=status.HTTP_202_ACCEPTED)
 
 
 # ─────────────────────────────────────────────────────────────
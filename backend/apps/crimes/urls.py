@@ -10,6 +10,10 @@ from .views import (
 from .upload_views import (
     CrimeBulkUploadView,
     CrimeUploadTemplateView,
+    ImportJobListView,
+    ImportJobDetailView,
+    ImportJobCancelView,
+    ImportJobResumeView,
 )
 
 urlpatterns = [
@@ -22,6 +26,10 @@ urlpatterns = [
     # ── Bulk Upload ─────────────────────────────────────────
     path('upload/',              CrimeBulkUploadView.as_view(),      name='crime-bulk-upload'),
     path('upload/template/',     CrimeUploadTemplateView.as_view(),  name='crime-upload-template'),
+    path('upload/jobs/',                    ImportJobListView.as_view(),   name='crime-import-jobs'),
+    path('upload/jobs/<int:pk>/',           ImportJobDetailView.as_view(), name='crime-import-job-detail'),
+    path('upload/jobs/<int:pk>/cancel/',    ImportJobCancelView.as_view(), name='crime-import-job-cancel'),
+    path('upload/jobs/<int:pk>/resume/',    ImportJobResumeView.as_view(), name='crime-import-job-resume'),
 
     # ── Suspects & Witnesses ────────────────────────────────
     path('<int:pk>/suspects/',          SuspectView.as_view(), name='crime-suspects'),
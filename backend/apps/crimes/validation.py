@@ -0,0 +1,147 @@
+import time
+import numpy  as np
+import pandas as pd
+
+from .importer  import (
+    REQUIRED_COLUMNS,
+    VALID_CATEGORIES,
+    VALID_SEVERITIES,
+    clean_frame,
+    iter_upload_chunks,
+    parse_dates,
+    read_header,
+)
+
+DRY_RUN_SAMPLE_SIZE = 5       # example rows kept per issue
+DRY_RUN_CHUNK_SIZE  = 20000   # no inserts, so larger chunks amortize pandas overhead
+
+# Lengths the importer truncates to, and lengths the database rejects
+TRUNCATED_LENGTHS = {'title': 200, 'location': 200, 'district': 100}
+REJECTED_LENGTHS  = {'weapons_used': 200}
+
+
+# ─────────────────────────────────────────────────────────────
+# INSPECT — what the cleaning pipeline would do to each column
+# Yields (column, issue, severity, mask) for one chunk.
+#   error   : the row will be skipped or fail to insert
+#   warning : the value will be replaced or truncated
+# Masks are computed column-wise; nothing is done per row.
+# ─────────────────────────────────────────────────────────────
+def blank(df, name):
+    if name not in df.columns:
+        return pd.Series(True, index=df.index)
+    column = df[name]
+    return column.isna() | (column.astype(str).str.strip() == '')
+
+
+def inspect_frame(df):
+    empty_title = blank(df, 'title')
+    kept        = ~empty_title
+    yield 'title', 'Empty title — row skipped', 'error', empty_title
+
+    for name, default in (('description', 'No description provided'), ('location', 'Unknown'), ('district', 'Unknown')):
+        if name in df.columns:
+            yield name, f'Missing value — imported as "{default}"', 'warning', kept & blank(df, name)
+
+    for name, choices, default in (('category', VALID_CATEGORIES, 'other'), ('severity', VALID_SEVERITIES, 'medium')):
+        if name not in df.columns:
+            continue
+        missing = blank(df, name)
+        value   = df[name].astype(str).str.strip().str.lower()
+        yield name, f'Missing value — imported as "{default}"', 'warning', kept & missing
+        yield name, f'Unknown value — imported as "{default}"', 'warning', kept & ~missing & ~value.isin(choices)
+
+    if 'date_occurred' in df.columns:
+        _, unparsed = parse_dates(df['date_occurred'])
+        yield 'date_occurred', 'Missing date — current time used', 'warning', kept & blank(df, 'date_occurred')
+        yield 'date_occurred', 'Unparseable date — current time used', 'warning', kept & unparsed
+
+    if 'victim_count' in df.columns:
+        victims = pd.to_numeric(df['victim_count'], errors='coerce')
+        valid   = victims.notna() & (victims >= 0) & (victims == victims.round())
+        yield 'victim_count', 'Invalid number — imported as 1', 'warning', kept & ~blank(df, 'victim_count') & ~valid
+
+    for lengths, issue, severity in (
+        (TRUNCATED_LENGTHS, 'Too long — truncated to {} characters', 'warning'),
+        (REJECTED_LENGTHS,  'Too long — over {} characters, row will fail', 'error'),
+    ):
+        for name, limit in lengths.items():
+            if name in df.columns:
+                too_long = df[name].astype(str).str.strip().str.len() > limit
+                yield name, issue.format(limit), severity, kept & df[name].notna() & too_long
+
+
+# ─────────────────────────────────────────────────────────────
+# VALIDATION REPORT — per-column counts with capped samples
+# ─────────────────────────────────────────────────────────────
+class ValidationReport:
+
+    def __init__(self, filename, columns):
+        self.filename        = filename
+        self.columns         = columns
+        self.missing_columns = [col for col in REQUIRED_COLUMNS if col not in columns]
+        self.total_rows      = 0
+        self.importable_rows = 0
+        self.issues          = {}
+
+    def add_chunk(self, raw):
+        clean, skipped        = clean_frame(raw)
+        self.total_rows      += len(raw)
+        self.importable_rows += len(clean)
+
+        positions = raw.index.to_numpy()
+        base      = raw.attrs.get('row_base', 2) - raw.attrs.get('row_offset', 0)
+        source    = raw.attrs.get('source')
+
+        for column, issue, severity, mask in inspect_frame(raw):
+            mask  = mask.to_numpy(dtype=bool)
+            count = int(np.count_nonzero(mask))
+            if not count:
+                continue
+            entry = self.issues.setdefault((column, issue), {
+                'column':   column,
+                'issue':    issue,
+                'severity': severity,
+                'count':    0,
+                'samples':  [],
+            })
+            entry['count'] += count
+
+            room = DRY_RUN_SAMPLE_SIZE - len(entry['samples'])
+            if room > 0:
+                values = raw[column] if column in raw.columns else pd.Series(None, index=raw.index)
+                for position in positions[mask][:room]:
+                    value = values.loc[position]
+                    sample = {'row': int(position) + base, 'value': None if pd.isna(value) else str(value)[:100]}
+                    if source:
+                        sample['file'] = source
+                    entry['samples'].append(sample)
+
+    def as_dict(self, elapsed):
+        issues = sorted(self.issues.values(), key=lambda i: (i['severity'] != 'error', -i['count']))
+        errors = sum(i['count'] for i in issues if i['severity'] == 'error')
+        return {
+            'dry_run':          True,
+            'file':             self.filename,
+            'valid':            not self.missing_columns and self.importable_rows > 0,
+            'columns':          self.columns,
+            'missing_columns':  self.missing_columns,
+            'total_rows':       self.total_rows,
+            'importable_rows':  self.importable_rows,
+            'rows_with_errors': errors,
+            'issues':           issues,
+            'elapsed_ms':       round(elapsed * 1000, 1),
+        }
+
+
+# ─────────────────────────────────────────────────────────────
+# DRY RUN — stream the whole upload through the cleaning
+# pipeline without touching the database
+# ─────────────────────────────────────────────────────────────
+def validate_upload(fileobj, filename):
+    started = time.perf_counter()
+    report  = ValidationReport(filename, read_header(fileobj, filename))
+    for raw in iter_upload_chunks(fileobj, filename, DRY_RUN_CHUNK_SIZE):
+        report.add_chunk(raw)
+    fileobj.seek(0)
+    return report.as_dict(time.perf_counter() - started)
@@ -6,7 +6,10 @@ from rest_framework.permissions     import IsAuthenticated
 from rest_framework.parsers         import MultiPartParser, FormParser, JSONParser
 from drf_spectacular.utils          import extend_schema, OpenApiParameter
 
+from .aggregates import breakdowns
 from .models import CrimeReport, Suspect, Witness
+from .pagination import CrimeReportCursorPagination
+from .search import search_reports, get_highlights
 from .serializers import (
     CrimeReportListSerializer,
     CrimeReportDetailSerializer,
@@ -30,7 +33,10 @@ logger = logging.getLogger('apps.crimes')
         OpenApiParameter('status',   str, description='Filter by status (reported, solved...)'),
         OpenApiParameter('district', str, description='Filter by district name'),
         OpenApiParameter('severity', str, description='Filter by severity (low, medium, high, critical)'),
-        OpenApiParameter('search',   str, description='Search in title, description, or case number'),
+        OpenApiParameter('search',   str, description='Full-text search over title, description, modus operandi, location, weapons and case number (ranked, with highlights)'),
+        OpenApiParameter('cursor',     str,  description='Opaque cursor from the previous page\'s "next" value'),
+        OpenApiParameter('page_size',  int,  description='Results per page (default 20, max 100)'),
+        OpenApiParameter('with_count', bool, description='Include an estimated total count'),
     ]
 )
 class CrimeReportListCreateView(APIView):
@@ -38,7 +44,7 @@ class CrimeReportListCreateView(APIView):
     parser_classes     = [MultiPartParser, FormParser, JSONParser]
 
     def get(self, request):
-        reports  = CrimeReport.objects.all()
+        reports  = CrimeReport.objects.select_related('reported_by')
         category = request.query_params.get('category')
         status_  = request.query_params.get('status')
         district = request.query_params.get('district')
@@ -54,17 +60,25 @@ class CrimeReportListCreateView(APIView):
         if severity:
             reports = reports.filter(severity=severity)
         if search:
-            reports = (
-                reports.filter(title__icontains=search)
-                | reports.filter(description__icontains=search)
-                | reports.filter(case_number__icontains=search)
-            )
+            reports   = search_reports(reports, search)
+            paginator = CrimeReportCursorPagination(order_field='search_rank')
+        else:
+            paginator = CrimeReportCursorPagination()
 
-        serializer = CrimeReportListSerializer(reports, many=True)
-        return Response({
-            'count':   reports.count(),
-            'results': serializer.data,
-        }, status=status.HTTP_200_OK)
+        page       = paginator.paginate_queryset(reports, request)
+        serializer = CrimeReportListSerializer(page, many=True)
+        results    = serializer.data
+
+        if search:
+            highlights = get_highlights([r.id for r in page], search)
+            for item, report in zip(results, page):
+                item['search_rank'] = report.search_rank
+                item['highlight']   = highlights.get(report.id, '')
+
+        return Response(
+            paginator.get_paginated_data(results),
+            status=status.HTTP_200_OK
+        )
 
     def post(self, request):
         serializer = CrimeReportCreateSerializer(
@@ -160,17 +174,28 @@ class CrimeReportDetailView(APIView):
 @extend_schema(
     tags=['🚔 Crimes'],
     summary='Get crime reports submitted by the logged-in officer',
+    parameters=[
+        OpenApiParameter('cursor',     str,  description='Opaque cursor from the previous page\'s "next" value'),
+        OpenApiParameter('page_size',  int,  description='Results per page (default 20, max 100)'),
+        OpenApiParameter('with_count', bool, description='Include an estimated total count'),
+    ]
 )
 class MyReportsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        reports    = CrimeReport.objects.filter(reported_by=request.user)
-        serializer = CrimeReportListSerializer(reports, many=True)
-        return Response({
-            'count':   reports.count(),
-            'results': serializer.data,
-        }, status=status.HTTP_200_OK)
+        reports    = (
+            CrimeReport.objects
+            .filter(reported_by=request.user)
+            .select_related('reported_by')
+        )
+        paginator  = CrimeReportCursorPagination()
+        page       = paginator.paginate_queryset(reports, request)
+        serializer = CrimeReportListSerializer(page, many=True)
+        return Response(
+            paginator.get_paginated_data(serializer.data),
+            status=status.HTTP_200_OK
+        )
 
 
 # ─────────────────────────────────────────────────────────────
@@ -271,16 +296,12 @@ class CrimeStatsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        from django.db.models import Count
-        total       = CrimeReport.objects.count()
-        by_category = CrimeReport.objects.values('category').annotate(count=Count('id'))
-        by_status   = CrimeReport.objects.values('status').annotate(count=Count('id'))
-        by_severity = CrimeReport.objects.values('severity').annotate(count=Count('id'))
-        by_district = CrimeReport.objects.values('district').annotate(count=Count('id'))
+        # All four breakdowns and the total from one grouped query
+        stats = breakdowns(CrimeReport.objects.all(), ['category', 'status', 'severity', 'district'])
         return Response({
-            'total_reports': total,
-            'by_category':   list(by_category),
-            'by_status':     list(by_status),
-            'by_severity':   list(by_severity),
-            'by_district':   list(by_district),
+            'total_reports': stats['total'],
+            'by_category':   stats['category'],
+            'by_status':     stats['status'],
+            'by_severity':   stats['severity'],
+            'by_district':   stats['district'],
         }, status=status.HTTP_200_OK)
\ No newline at end of file
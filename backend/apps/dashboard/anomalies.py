@@ -0,0 +1,135 @@
+import logging
+import numpy as np
+from datetime                   import timedelta
+from django.conf                import settings
+from django.db                  import transaction
+from django.utils               import timezone
+
+from apps.crimes.data_version   import bump_data_version
+from apps.crimes.rollup         import daily_stats, total_crimes
+from .models                    import CrimeAnomaly
+
+logger = logging.getLogger('apps.dashboard')
+
+
+# ─────────────────────────────────────────────────────────────
+# ANOMALY DETECTION — per district × category daily counts
+# Every series is one row of a (series × day) matrix built from
+# the crime_daily_stats rollup, and all rows advance together:
+#   1. day-of-week factors from the baseline period
+#   2. EWMA mean / variance of the deseasonalized counts
+#   3. z = (observed − expected) / spread for the recent days
+# A day is flagged when z ≥ ANOMALY_Z_THRESHOLD and the count is
+# at least ANOMALY_MIN_COUNT. Spread never drops below the
+# Poisson √expected, so sparse series don't flag every crime.
+# ─────────────────────────────────────────────────────────────
+BASELINE_DAYS = 112          # 16 weeks of history before the detection window
+WARMUP_DAYS   = 14           # initial EWMA mean / variance
+EWMA_ALPHA    = 0.1
+CLIP_SIGMAS   = 3.0          # flagged days update the baseline as if capped here
+
+
+def daily_matrix(start, days):
+    """
+    (series keys, counts[series, day]) for every district × category
+    with crimes between start and start + days, from one query.
+    """
+    rows = list(
+        daily_stats()
+        .filter(day__gte=start, day__lt=start + timedelta(days=days))
+        .values_list('district', 'category', 'day')
+        .annotate(count=total_crimes())
+        .order_by()
+    )
+    if not rows:
+        return [], np.zeros((0, days))
+
+    pairs = np.array([f'{district}\x1f{category}' for district, category, _, _ in rows], dtype=object)
+    keys, series = np.unique(pairs, return_inverse=True)
+    offsets = np.fromiter(((day - start).days for _, _, day, _ in rows), dtype=np.int64, count=len(rows))
+    counts  = np.zeros((len(keys), days))
+    np.add.at(counts, (series.ravel(), offsets), np.fromiter((r[3] for r in rows), dtype=float, count=len(rows)))
+    return [tuple(key.split('\x1f')) for key in keys], counts
+
+
+def weekday_factors(counts, weekdays):
+    """
+    Multiplicative day-of-week profile per series (mean 1), lightly
+    smoothed towards flat so a few crimes don't make a pattern.
+    """
+    overall = counts.mean(axis=1, keepdims=True)
+    factors = np.ones((counts.shape[0], 7))
+    for weekday in range(7):
+        factors[:, weekday] = (counts[:, weekdays == weekday].mean(axis=1) + 0.5) / (overall[:, 0] + 0.5)
+    return factors / factors.mean(axis=1, keepdims=True)
+
+
+def score_days(counts, weekdays, detect_days):
+    """
+    Returns (expected, z) for the last `detect_days` columns of
+    counts, each of shape (series, detect_days).
+    """
+    baseline = counts.shape[1] - detect_days
+    factors  = weekday_factors(counts[:, :baseline], weekdays[:baseline])
+    seasonal = factors[:, weekdays]                         # (series, days)
+    flat     = counts / seasonal
+
+    mean     = flat[:, :WARMUP_DAYS].mean(axis=1)
+    var      = flat[:, :WARMUP_DAYS].var(axis=1)
+    expected = np.zeros((counts.shape[0], detect_days))
+    z        = np.zeros((counts.shape[0], detect_days))
+
+    for t in range(WARMUP_DAYS, counts.shape[1]):
+        spread = np.sqrt(var)
+        column = t - baseline
+        if column >= 0:
+            predicted           = mean * seasonal[:, t]
+            noise               = np.maximum(spread * seasonal[:, t], np.sqrt(np.maximum(predicted, 1.0)))
+            expected[:, column] = predicted
+            z[:, column]        = (counts[:, t] - predicted) / noise
+
+        value = np.minimum(flat[:, t], mean + CLIP_SIGMAS * np.maximum(spread, 1.0))
+        delta = value - mean
+        mean  = mean + EWMA_ALPHA * delta
+        var   = (1 - EWMA_ALPHA) * (var + EWMA_ALPHA * delta ** 2)
+    return expected, z
+
+
+def detect_anomalies(today=None):
+    """
+    Scores the last ANOMALY_DETECT_DAYS days of every series and
+    replaces the stored anomalies for those days. Returns how many
+    were flagged.
+    """
+    today       = today or timezone.localdate()
+    detect_days = settings.ANOMALY_DETECT_DAYS
+    total_days  = BASELINE_DAYS + detect_days
+    start       = today - timedelta(days=total_days - 1)
+
+    keys, counts = daily_matrix(start, total_days)
+    first_day    = today - timedelta(days=detect_days - 1)
+    anomalies    = []
+    if keys:
+        weekdays    = (np.arange(total_days) + start.weekday()) % 7
+        expected, z = score_days(counts, weekdays, detect_days)
+        observed    = counts[:, -detect_days:]
+        flagged     = (z >= settings.ANOMALY_Z_THRESHOLD) & (observed >= settings.ANOMALY_MIN_COUNT)
+        now         = timezone.now()
+        for series, column in zip(*np.nonzero(flagged)):
+            district, category = keys[series]
+            anomalies.append(CrimeAnomaly(
+                district    = district,
+                category    = category,
+                day         = first_day + timedelta(days=int(column)),
+                observed    = int(observed[series, column]),
+                expected    = round(float(expected[series, column]), 2),
+                z_score     = round(float(z[series, column]), 2),
+                detected_at = now,
+            ))
+
+    with transaction.atomic():
+        CrimeAnomaly.objects.filter(day__gte=first_day).delete()
+        CrimeAnomaly.objects.bulk_create(anomalies)
+        bump_data_version()
+    logger.info(f"Anomaly detection: {len(anomalies)} flagged across {len(keys)} series")
+    return len(anomalies)
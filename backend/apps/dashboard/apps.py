@@ -4,4 +4,7 @@ from django.apps import AppConfig
 class DashboardConfig(AppConfig):
     default_auto_field  = 'django.db.models.BigAutoField'
     name                = 'apps.dashboard'
-    verbose_name        = 'Dashboard'
\ No newline at end of file
+    verbose_name        = 'Dashboard'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,96 @@
+import hashlib
+import logging
+import time
+from datetime                   import datetime, timezone as dt_timezone
+from django.conf                import settings
+from django.core.cache          import cache
+from django.utils               import timezone
+
+from apps.crimes.data_version   import data_version
+
+logger = logging.getLogger('apps.dashboard')
+
+
+# ─────────────────────────────────────────────────────────────
+# DASHBOARD RESPONSE CACHE
+# Keys: dashboard:<data version>:<widget>:<params>. A write to
+# any table the dashboard reads moves the data version, so old
+# entries are never read again and simply expire. Widgets whose
+# windows end at "now" (or whose scores decay with it) also key
+# on the time bucket, which bounds only their age. On a miss one
+# request computes (it holds a short lock in the cache);
+# concurrent identical requests wait for its result instead of
+# querying.
+# ─────────────────────────────────────────────────────────────
+LOCK_SECONDS = 30     # longest a computation may hold the lock
+WAIT_SECONDS = 10     # how long followers wait before computing themselves
+POLL_SECONDS = 0.05
+
+# Payloads that move with the clock: always, or unless period=all
+TIME_WINDOWED   = {'overview', 'monthly', 'daily', 'alerts', 'trends', 'anomalies', 'hotspots', 'hotspot-grid'}
+PERIOD_WINDOWED = {'by-category', 'by-severity', 'category-district-matrix'}
+
+
+def bucket_now():
+    """
+    now() floored to DASHBOARD_CACHE_BUCKET_SECONDS, so date ranges
+    (and the keys derived from them) repeat within a bucket.
+    """
+    step = settings.DASHBOARD_CACHE_BUCKET_SECONDS
+    now  = timezone.now()
+    if step <= 1:
+        return now
+    return datetime.fromtimestamp(int(now.timestamp()) // step * step, tz=dt_timezone.utc)
+
+
+def is_time_windowed(widget, params):
+    if widget in PERIOD_WINDOWED:
+        return params.get('period') != 'all'
+    return widget in TIME_WINDOWED
+
+
+def cache_key(widget, version=None, **params):
+    if is_time_windowed(widget, params):
+        params['bucket'] = int(bucket_now().timestamp())
+    digest  = hashlib.md5(repr(sorted(params.items())).encode()).hexdigest()
+    version = data_version() if version is None else version
+    return f'dashboard:{version}:{widget}:{digest}'
+
+
+def get_or_compute_many(keys, compute):
+    """
+    keys: {name: cache key}. Returns {name: value}; names missing
+    from the cache are computed with compute(names) → {name: value}
+    by a single caller at a time and stored for the others.
+    """
+    ttl = settings.DASHBOARD_CACHE_TTL
+    if ttl <= 0:
+        return compute(list(keys))
+
+    deadline = time.monotonic() + WAIT_SECONDS
+    while True:
+        found   = cache.get_many(list(keys.values()))
+        values  = {name: found[key] for name, key in keys.items() if key in found}
+        missing = [name for name in keys if name not in values]
+        if not missing:
+            return values
+
+        lock = 'dashboard:lock:' + hashlib.md5('|'.join(sorted(keys[name] for name in missing)).encode()).hexdigest()
+        if cache.add(lock, 1, timeout=LOCK_SECONDS):
+            try:
+                fresh = compute(missing)
+                cache.set_many({keys[name]: value for name, value in fresh.items()}, timeout=ttl)
+            finally:
+                cache.delete(lock)
+            return {**values, **fresh}
+
+        if time.monotonic() >= deadline:
+            logger.warning(f"Dashboard cache: gave up waiting for {missing}; computing directly")
+            return {**values, **compute(missing)}
+        time.sleep(POLL_SECONDS)
+
+
+def cached(widget, compute, **params):
+    # One widget payload, keyed on the parameters it depends on
+    key = cache_key(widget, **params)
+    return get_or_compute_many({widget: key}, lambda names: {widget: compute()})[widget]
@@ -0,0 +1,214 @@
+import logging
+import time
+import numpy as np
+from datetime                   import timedelta
+from statistics                 import NormalDist
+from django.conf                import settings
+from django.db                  import transaction
+from django.db.models.functions import Trunc
+from django.utils               import timezone
+
+from apps.crimes.data_version   import bump_data_version
+from apps.crimes.rollup         import daily_stats, total_crimes
+from .models                    import CrimeForecast, ForecastMethod
+
+logger = logging.getLogger('apps.dashboard')
+
+
+# ─────────────────────────────────────────────────────────────
+# WEEKLY FORECASTS — per district × category, plus district totals
+# All series are rows of one (series × week) matrix from the
+# crime_daily_stats rollup and every model is fitted to all rows
+# at once:
+#   • additive Holt-Winters (yearly season), smoothing constants
+#     picked per series from a small grid by one-step SSE
+#   • seasonal naive (same week last year) as the baseline
+# The last BACKTEST_WEEKS complete weeks are held out to score
+# both; each series keeps whichever did better, is refitted on
+# its full history and forecast FORECAST_HORIZON_WEEKS ahead.
+# ─────────────────────────────────────────────────────────────
+SEASON_WEEKS   = 52
+HISTORY_WEEKS  = 2 * SEASON_WEEKS
+BACKTEST_WEEKS = 4
+ALL_CATEGORIES = ''
+
+# (alpha, beta, gamma) candidates — level, trend, season
+SMOOTHING_GRID = [
+    (alpha, beta, gamma)
+    for alpha in (0.1, 0.3, 0.5)
+    for beta  in (0.0, 0.05)
+    for gamma in (0.1, 0.3)
+]
+
+
+def weekly_matrix(start, weeks):
+    """
+    (series keys, counts[series, week]) for complete weeks from
+    `start` (a Monday), one grouped query. District totals are
+    added as (district, ALL_CATEGORIES) rows.
+    """
+    rows = list(
+        daily_stats()
+        .filter(day__gte=start, day__lt=start + timedelta(weeks=weeks))
+        .annotate(week=Trunc('day', 'week'))
+        .values_list('district', 'category', 'week')
+        .annotate(count=total_crimes())
+        .order_by()
+    )
+    if not rows:
+        return [], np.zeros((0, weeks))
+
+    pairs = np.array([f'{district}\x1f{category}' for district, category, _, _ in rows], dtype=object)
+    keys, series = np.unique(pairs, return_inverse=True)
+    offsets = np.fromiter(((week - start).days // 7 for _, _, week, _ in rows), dtype=np.int64, count=len(rows))
+    counts  = np.zeros((len(keys), weeks))
+    np.add.at(counts, (series.ravel(), offsets), np.fromiter((r[3] for r in rows), dtype=float, count=len(rows)))
+    keys    = [tuple(key.split('\x1f')) for key in keys]
+
+    districts, owner = np.unique([district for district, _ in keys], return_inverse=True)
+    totals = np.zeros((len(districts), weeks))
+    np.add.at(totals, owner.ravel(), counts)
+    return keys + [(district, ALL_CATEGORIES) for district in districts], np.vstack([counts, totals])
+
+
+# ── Models ───────────────────────────────────────────────────
+def holt_winters(y, horizon):
+    """
+    Additive Holt-Winters on every row of y. Returns (forecast,
+    sigma, alpha, beta): forecasts (series, horizon), the one-step
+    residual spread and the chosen constants per series.
+    """
+    n, length = y.shape
+    m         = SEASON_WEEKS
+    best_sse  = np.full(n, np.inf)
+    forecast  = np.zeros((n, horizon))
+    sigma     = np.zeros(n)
+    alphas    = np.zeros(n)
+    betas     = np.zeros(n)
+    steps     = np.arange(1, horizon + 1)
+
+    for alpha, beta, gamma in SMOOTHING_GRID:
+        level  = y[:, :m].mean(axis=1)
+        trend  = np.zeros(n)
+        season = y[:, :m] - level[:, None]
+        sse    = np.zeros(n)
+        for t in range(m, length):
+            s          = season[:, t % m]
+            error      = y[:, t] - (level + trend + s)
+            sse       += error ** 2
+            previous   = level
+            level      = alpha * (y[:, t] - s) + (1 - alpha) * (level + trend)
+            trend      = beta * (level - previous) + (1 - beta) * trend
+            season[:, t % m] = gamma * (y[:, t] - level) + (1 - gamma) * s
+
+        better = sse < best_sse
+        if not better.any():
+            continue
+        ahead = level[:, None] + steps * trend[:, None] + season[:, (length + steps - 1) % m]
+        best_sse[better]  = sse[better]
+        forecast[better]  = ahead[better]
+        sigma[better]     = np.sqrt(sse[better] / (length - m))
+        alphas[better]    = alpha
+        betas[better]     = beta
+    return forecast, sigma, alphas, betas
+
+
+def seasonal_naive(y, horizon):
+    # Same week last season; spread from the year-on-year differences
+    m        = SEASON_WEEKS
+    steps    = np.arange(horizon)
+    forecast = y[:, y.shape[1] - m + steps % m]
+    sigma    = np.sqrt(((y[:, m:] - y[:, :-m]) ** 2).mean(axis=1))
+    return forecast, sigma
+
+
+def interval_sigma(method, sigma, alpha, beta, horizon):
+    """
+    h-step standard deviation per series, (series, horizon).
+    Holt-Winters: σ²·(1 + Σ_{j<h} (α(1 + jβ))²) — the season term
+    only matters beyond a full season ahead.
+    """
+    steps = np.arange(horizon)
+    hw    = np.sqrt(1 + np.cumsum((alpha[:, None] * (1 + steps * beta[:, None])) ** 2, axis=1)
+                    - alpha[:, None] ** 2)
+    naive = np.sqrt(steps // SEASON_WEEKS + 1.0)
+    return sigma[:, None] * np.where(method[:, None] == ForecastMethod.HOLT_WINTERS, hw, naive[None, :])
+
+
+def backtest(y):
+    """
+    Fits both models without the last BACKTEST_WEEKS and compares
+    their forecasts with what happened. Returns per-series MAE for
+    Holt-Winters and for the seasonal naive baseline.
+    """
+    train, actual = y[:, :-BACKTEST_WEEKS], y[:, -BACKTEST_WEEKS:]
+    hw, *_        = holt_winters(train, BACKTEST_WEEKS)
+    naive, _      = seasonal_naive(train, BACKTEST_WEEKS)
+    return (
+        np.abs(np.maximum(hw, 0) - actual).mean(axis=1),
+        np.abs(naive - actual).mean(axis=1),
+    )
+
+
+# ─────────────────────────────────────────────────────────────
+# BATCH — fit everything and replace the stored forecasts
+# ─────────────────────────────────────────────────────────────
+def refresh_forecasts(today=None):
+    """
+    Returns a summary: series count, fit seconds and backtest MAE
+    of the chosen models against the seasonal naive baseline.
+    """
+    today   = today or timezone.localdate()
+    horizon = settings.FORECAST_HORIZON_WEEKS
+    # Complete weeks only: the current week is the first forecast
+    current = today - timedelta(days=today.weekday())
+    start   = current - timedelta(weeks=HISTORY_WEEKS)
+
+    keys, y = weekly_matrix(start, HISTORY_WEEKS)
+    started = time.perf_counter()
+    summary = {'series': len(keys), 'fit_seconds': 0.0, 'backtest_mae': None, 'baseline_mae': None}
+    records = []
+    if keys:
+        hw_mae, naive_mae = backtest(y)
+        method  = np.where(hw_mae <= naive_mae, ForecastMethod.HOLT_WINTERS, ForecastMethod.SEASONAL_NAIVE)
+        chosen  = np.minimum(hw_mae, naive_mae)
+
+        hw, hw_sigma, alpha, beta = holt_winters(y, horizon)
+        naive, naive_sigma        = seasonal_naive(y, horizon)
+        use_hw   = method == ForecastMethod.HOLT_WINTERS
+        expected = np.maximum(np.where(use_hw[:, None], hw, naive), 0)
+        spread   = interval_sigma(method, np.where(use_hw, hw_sigma, naive_sigma), alpha, beta, horizon)
+        z        = NormalDist().inv_cdf(0.5 + settings.FORECAST_INTERVAL / 2)
+        lower    = np.maximum(expected - z * spread, 0)
+        upper    = expected + z * spread
+
+        summary.update(
+            fit_seconds  = round(time.perf_counter() - started, 3),
+            backtest_mae = round(float(chosen.mean()), 3),
+            baseline_mae = round(float(naive_mae.mean()), 3),
+        )
+        now = timezone.now()
+        for series, (district, category) in enumerate(keys):
+            for step in range(horizon):
+                records.append(CrimeForecast(
+                    district     = district,
+                    category     = category,
+                    week_start   = current + timedelta(weeks=step),
+                    horizon      = step + 1,
+                    expected     = round(float(expected[series, step]), 2),
+                    lower        = round(float(lower[series, step]), 2),
+                    upper        = round(float(upper[series, step]), 2),
+                    method       = str(method[series]),
+                    backtest_mae = round(float(chosen[series]), 3),
+                    fitted_at    = now,
+                ))
+
+    with transaction.atomic():
+        CrimeForecast.objects.all().delete()
+        CrimeForecast.objects.bulk_create(records, batch_size=2000)
+        bump_data_version()
+    logger.info(
+        f"Forecasts: {summary['series']} series fitted in {summary['fit_seconds']}s, "
+        f"backtest MAE {summary['backtest_mae']} (seasonal naive {summary['baseline_mae']})"
+    )
+    return summary
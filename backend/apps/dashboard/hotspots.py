@@ -0,0 +1,201 @@
+import logging
+import math
+import numpy as np
+from datetime                   import datetime, timedelta, timezone as dt_timezone
+from django.conf                import settings
+from django.db                  import transaction
+from django.db.models           import Q
+from django.utils               import timezone
+
+from apps.crimes.data_version   import bump_data_version
+from apps.crimes.models         import CrimeReport
+from .models                    import HotspotKind, HotspotScore
+
+logger = logging.getLogger('apps.dashboard')
+
+
+# ─────────────────────────────────────────────────────────────
+# HOTSPOT RISK SCORES
+# Each crime adds weight(severity) · 2^(−age / half-life) to its
+# district and, when it has coordinates, to its lat/long grid
+# cell. Every contribution decays at the same rate, so a stored
+# score is brought up to date with one factor, and new crimes
+# are merged into it without recomputing everything:
+#   score(now) = score(computed_at) · e^(−λ · Δt) + new weights
+# refresh_hotspot_scores() rebuilds the table (periodic task);
+# add_crimes() merges new reports in as they are created.
+# ─────────────────────────────────────────────────────────────
+SEVERITY_WEIGHTS   = {'low': 1.0, 'medium': 2.0, 'high': 4.0, 'critical': 8.0}
+HIGH_SEVERITIES    = ('high', 'critical')
+OPEN_STATUSES      = ('reported', 'under_investigation')
+HORIZON_HALF_LIVES = 10      # older crimes weigh under 0.1% and are skipped
+SCORE_FIELDS       = ('district', 'severity', 'status', 'date_reported', 'latitude', 'longitude')
+
+# Score at which a place counts as each risk level — about five
+# fresh high-severity crimes for critical, three for high
+RISK_LEVELS = (
+    (20.0, 'critical'),
+    (12.0, 'high'),
+    (3.0,  'medium'),
+)
+
+
+def decay_per_day():
+    return math.log(2) / settings.HOTSPOT_HALF_LIFE_DAYS
+
+
+def decayed(score, computed_at, now):
+    return score * math.exp(-decay_per_day() * (now - computed_at).total_seconds() / 86400)
+
+
+def risk_level(score):
+    for threshold, level in RISK_LEVELS:
+        if score >= threshold:
+            return level
+    return 'low'
+
+
+# ── Vectorized scoring ───────────────────────────────────────
+def group_totals(keys, weights, high, unsolved, reported):
+    # keys: 1-D, or 2-D with one row per crime (grid cells)
+    unique, inverse = np.unique(keys, axis=0 if keys.ndim > 1 else None, return_inverse=True)
+    inverse = inverse.ravel()
+    last    = np.full(len(unique), -np.inf)
+    np.maximum.at(last, inverse, reported)
+    return unique, {
+        'score':         np.bincount(inverse, weights=weights, minlength=len(unique)),
+        'crime_count':   np.bincount(inverse, minlength=len(unique)),
+        'high_severity': np.bincount(inverse, weights=high, minlength=len(unique)),
+        'unsolved':      np.bincount(inverse, weights=unsolved, minlength=len(unique)),
+        'last':          last,
+    }
+
+
+def score_rows(rows, now):
+    """
+    rows: tuples in SCORE_FIELDS order. Returns unsaved HotspotScore
+    objects for every district and grid cell, scored as of `now`.
+    """
+    if not rows:
+        return []
+    districts, severities, statuses, reported, latitudes, longitudes = zip(*rows)
+
+    reported = np.fromiter((moment.timestamp() for moment in reported), dtype=float, count=len(rows))
+    ages     = np.maximum(now.timestamp() - reported, 0) / 86400
+    weights  = np.array([SEVERITY_WEIGHTS.get(s, 1.0) for s in severities]) * np.exp(-decay_per_day() * ages)
+    high     = np.isin(np.array(severities, dtype=object), HIGH_SEVERITIES).astype(float)
+    unsolved = np.isin(np.array(statuses, dtype=object), OPEN_STATUSES).astype(float)
+
+    scores = []
+
+    def collect(kind, keys, totals, cell=None):
+        for i, key in enumerate(keys):
+            scores.append(HotspotScore(
+                kind          = kind,
+                key           = key,
+                latitude      = cell[i][0] if cell is not None else None,
+                longitude     = cell[i][1] if cell is not None else None,
+                score         = float(totals['score'][i]),
+                crime_count   = int(totals['crime_count'][i]),
+                high_severity = int(totals['high_severity'][i]),
+                unsolved      = int(totals['unsolved'][i]),
+                last_crime_at = datetime.fromtimestamp(totals['last'][i], tz=dt_timezone.utc),
+                computed_at   = now,
+            ))
+
+    names, totals = group_totals(np.array(districts, dtype=object), weights, high, unsolved, reported)
+    collect(HotspotKind.DISTRICT, names.tolist(), totals)
+
+    located = np.array([lat is not None and lon is not None for lat, lon in zip(latitudes, longitudes)])
+    if located.any():
+        size   = settings.HOTSPOT_GRID_DEGREES
+        coords = np.array(
+            [(float(lat), float(lon)) for lat, lon, ok in zip(latitudes, longitudes, located) if ok]
+        )
+        cells = np.floor(coords / size).astype(np.int64)
+        cells, totals = group_totals(
+            cells, weights[located], high[located], unsolved[located], reported[located]
+        )
+        collect(
+            HotspotKind.GRID,
+            [f'{row}:{col}' for row, col in cells.tolist()],
+            totals,
+            cell=((cells + 0.5) * size).round(6).tolist(),
+        )
+    return scores
+
+
+# ── Maintenance ──────────────────────────────────────────────
+def refresh_hotspot_scores():
+    """
+    Rebuilds every score from the crimes inside the decay horizon.
+    Picks up updates and deletes, which add_crimes() doesn't see.
+    """
+    now   = timezone.now()
+    since = now - timedelta(days=settings.HOTSPOT_HALF_LIFE_DAYS * HORIZON_HALF_LIVES)
+    rows  = list(
+        CrimeReport.objects
+        .filter(date_reported__gte=since)
+        .values_list(*SCORE_FIELDS)
+        .iterator(chunk_size=10000)
+    )
+    scores = score_rows(rows, now)
+    with transaction.atomic():
+        HotspotScore.objects.all().delete()
+        HotspotScore.objects.bulk_create(scores, batch_size=1000)
+        bump_data_version()
+    logger.info(f"Hotspot scores refreshed: {len(scores)} places from {len(rows)} crimes")
+    return len(scores)
+
+
+def add_crimes(crimes):
+    # Merge newly created reports into the stored scores
+    now   = timezone.now()
+    fresh = score_rows([tuple(getattr(crime, f) for f in SCORE_FIELDS) for crime in crimes], now)
+    if not fresh:
+        return
+
+    lookup = Q()
+    for kind in HotspotKind.values:
+        keys = [score.key for score in fresh if score.kind == kind]
+        if keys:
+            lookup |= Q(kind=kind, key__in=keys)
+
+    with transaction.atomic():
+        stored = {
+            (score.kind, score.key): score
+            for score in HotspotScore.objects.select_for_update().filter(lookup)
+        }
+        updated = []
+        for score in fresh:
+            current = stored.get((score.kind, score.key))
+            if current is None:
+                continue
+            current.score          = decayed(current.score, current.computed_at, now) + score.score
+            current.crime_count   += score.crime_count
+            current.high_severity += score.high_severity
+            current.unsolved      += score.unsolved
+            current.last_crime_at  = max(filter(None, [current.last_crime_at, score.last_crime_at]))
+            current.computed_at    = now
+            updated.append(current)
+
+        HotspotScore.objects.bulk_update(
+            updated, ['score', 'crime_count', 'high_severity', 'unsolved', 'last_crime_at', 'computed_at']
+        )
+        # A concurrent insert of the same new place loses to the other
+        # writer until the next refresh rather than failing the save
+        HotspotScore.objects.bulk_create(
+            [score for score in fresh if (score.kind, score.key) not in stored], ignore_conflicts=True
+        )
+
+
+# ── Reads ────────────────────────────────────────────────────
+def current_scores(kind):
+    """
+    {key: (score now, HotspotScore)} for one kind, in one query.
+    """
+    now = timezone.now()
+    return {
+        score.key: (decayed(score.score, score.computed_at, now), score)
+        for score in HotspotScore.objects.filter(kind=kind)
+    }
@@ -0,0 +1,192 @@
+import json
+import logging
+import threading
+import time
+from collections                import deque
+import redis
+from django.conf                import settings
+from django.db                  import transaction
+
+logger = logging.getLogger('apps.dashboard')
+
+
+# ─────────────────────────────────────────────────────────────
+# LIVE EVENTS — crime feed and alerts pushed over SSE
+# Each process keeps a hub: the most recent events plus a
+# condition every open stream waits on, so idle streams cost a
+# sleeping thread and no queries. With Redis configured, events
+# get ids from a shared counter, are kept in a capped backlog
+# list for Last-Event-ID resume and fan out over pub/sub to one
+# listener thread per process. Without Redis (or when it is
+# unreachable) events stay within the publishing process.
+# ─────────────────────────────────────────────────────────────
+CHANNEL           = 'safepulse:live'
+SEQUENCE_KEY      = 'safepulse:live:seq'
+BACKLOG_KEY       = 'safepulse:live:backlog'
+BACKLOG_SIZE      = 500
+RECONNECT_SECONDS = 5
+
+
+class Hub:
+
+    def __init__(self):
+        self.events    = deque(maxlen=BACKLOG_SIZE)
+        self.condition = threading.Condition()
+
+    def last_id(self):
+        with self.condition:
+            return self.events[-1]['id'] if self.events else 0
+
+    def push(self, event):
+        with self.condition:
+            if self.events and event['id'] <= self.events[-1]['id']:
+                return
+            self.events.append(event)
+            self.condition.notify_all()
+
+    def after(self, last_id):
+        with self.condition:
+            return [event for event in self.events if event['id'] > last_id]
+
+    def wait(self, last_id, timeout):
+        # Events newer than last_id, blocking up to `timeout` seconds
+        with self.condition:
+            self.condition.wait_for(lambda: self.events and self.events[-1]['id'] > last_id, timeout)
+            return [event for event in self.events if event['id'] > last_id]
+
+
+hub = Hub()
+
+
+def local_publish(event, data):
+    with hub.condition:
+        hub.push({'id': hub.last_id() + 1, 'event': event, 'data': data})
+
+
+# ── Redis bridge ─────────────────────────────────────────────
+PUBLISH_SCRIPT = """
+local id      = redis.call('INCR', KEYS[1])
+local message = '{"id": ' .. id .. ', "event": ' .. ARGV[1] .. ', "data": ' .. ARGV[2] .. '}'
+redis.call('RPUSH', KEYS[2], message)
+redis.call('LTRIM', KEYS[2], -tonumber(ARGV[3]), -1)
+redis.call('PUBLISH', ARGV[4], message)
+return id
+"""
+
+
+class RedisBridge:
+
+    def __init__(self, url):
+        self.client     = redis.Redis.from_url(url)
+        self.listener   = None
+        self.subscribed = threading.Event()
+        self.lock       = threading.Lock()
+        # Id, backlog and publish in one atomic step, so subscribers
+        # always receive events in id order
+        self.publish_script = self.client.register_script(PUBLISH_SCRIPT)
+
+    def publish(self, event, data):
+        self.publish_script(
+            keys=[SEQUENCE_KEY, BACKLOG_KEY],
+            args=[json.dumps(event), json.dumps(data, default=str), BACKLOG_SIZE, CHANNEL],
+        )
+
+    def last_id(self):
+        return int(self.client.get(SEQUENCE_KEY) or 0)
+
+    def backlog(self, last_id):
+        events = (json.loads(message) for message in self.client.lrange(BACKLOG_KEY, 0, -1))
+        return [event for event in events if event['id'] > last_id]
+
+    def start(self):
+        # One subscriber thread per process, started by the first stream
+        with self.lock:
+            if self.listener is None or not self.listener.is_alive():
+                self.listener = threading.Thread(target=self.listen, name='live-events', daemon=True)
+                self.listener.start()
+        self.subscribed.wait(timeout=RECONNECT_SECONDS)
+
+    def listen(self):
+        while True:
+            try:
+                pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(CHANNEL)
+                self.subscribed.set()
+                for message in pubsub.listen():
+                    hub.push(json.loads(message['data']))
+            except redis.RedisError as e:
+                self.subscribed.clear()
+                logger.warning(f"Live events: Redis subscription lost ({e}); retrying in {RECONNECT_SECONDS}s")
+                time.sleep(RECONNECT_SECONDS)
+
+
+bridge = RedisBridge(settings.LIVE_EVENTS_REDIS_URL) if settings.LIVE_EVENTS_REDIS_URL else None
+
+
+# ─────────────────────────────────────────────────────────────
+# PUBLISH — called once the writing transaction commits
+# ─────────────────────────────────────────────────────────────
+def publish_now(event, data):
+    if bridge:
+        try:
+            bridge.publish(event, data)
+            return
+        except redis.RedisError as e:
+            logger.warning(f"Live events: Redis publish failed ({e}); delivering in-process only")
+    local_publish(event, data)
+
+
+def publish(event, data):
+    transaction.on_commit(lambda: publish_now(event, data))
+
+
+# ─────────────────────────────────────────────────────────────
+# SUBSCRIBE — events for one stream
+# ─────────────────────────────────────────────────────────────
+def subscribe(last_id=None, heartbeat=15, duration=300):
+    """
+    Yields events newer than last_id (or only new ones when None),
+    and None every `heartbeat` idle seconds. Ends after `duration`
+    seconds; EventSource reconnects with Last-Event-ID.
+    """
+    current = None
+    if bridge:
+        try:
+            bridge.start()
+            current = bridge.last_id()
+        except redis.RedisError as e:
+            logger.warning(f"Live events: Redis unavailable ({e}); streaming in-process events only")
+    if current is None:
+        current = hub.last_id()
+
+    if last_id is None:
+        last_id = current
+    elif last_id > current:
+        # The counter restarted since the client's last event
+        last_id = 0
+
+    backlog = hub.after(last_id)
+    if bridge and last_id < current and (not backlog or backlog[0]['id'] > last_id + 1):
+        try:
+            backlog = bridge.backlog(last_id)
+        except redis.RedisError:
+            pass
+
+    for event in backlog:
+        last_id = event['id']
+        yield event
+
+    deadline = time.monotonic() + duration
+    while time.monotonic() < deadline:
+        events = hub.wait(last_id, heartbeat)
+        if not events:
+            yield None
+        for event in events:
+            last_id = event['id']
+            yield event
+
+
+def format_event(event):
+    if event is None:
+        return ': keep-alive\n\n'
+    return f"id: {event['id']}\nevent: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
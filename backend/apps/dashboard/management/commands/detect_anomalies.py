@@ -0,0 +1,20 @@
+import time
+from django.core.management.base    import BaseCommand
+
+from apps.dashboard.anomalies import detect_anomalies
+
+
+# ─────────────────────────────────────────────────────────────
+# DETECT ANOMALIES
+# python manage.py detect_anomalies
+# Same as the hourly task: re-scores the recent days of every
+# district × category series and replaces their anomalies.
+# ─────────────────────────────────────────────────────────────
+class Command(BaseCommand):
+    help = 'Flag district × category crime counts far above their seasonal baseline.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        flagged = detect_anomalies()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Anomaly detection: {flagged} flagged in {elapsed:.2f}s.'))
@@ -0,0 +1,20 @@
+from django.core.management.base    import BaseCommand
+
+from apps.dashboard.forecasts import refresh_forecasts
+
+
+# ─────────────────────────────────────────────────────────────
+# REFRESH FORECASTS
+# python manage.py refresh_forecasts
+# Same as the daily task: refits every weekly series offline and
+# replaces the stored forecasts.
+# ─────────────────────────────────────────────────────────────
+class Command(BaseCommand):
+    help = 'Fit weekly crime forecasts per district and category.'
+
+    def handle(self, *args, **options):
+        summary = refresh_forecasts()
+        self.stdout.write(self.style.SUCCESS(
+            f"Forecasts: {summary['series']} series in {summary['fit_seconds']}s — "
+            f"backtest MAE {summary['backtest_mae']} (seasonal naive {summary['baseline_mae']})."
+        ))
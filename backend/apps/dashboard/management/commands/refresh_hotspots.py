@@ -0,0 +1,19 @@
+import time
+from django.core.management.base    import BaseCommand
+
+from apps.dashboard.hotspots import refresh_hotspot_scores
+
+
+# ─────────────────────────────────────────────────────────────
+# REFRESH HOTSPOTS
+# python manage.py refresh_hotspots
+# Same as the scheduled task; use it to backfill hotspot_scores.
+# ─────────────────────────────────────────────────────────────
+class Command(BaseCommand):
+    help = 'Recompute time-decayed hotspot risk scores for districts and grid cells.'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        places  = refresh_hotspot_scores()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f'Hotspot scores refreshed: {places} places in {elapsed:.2f}s.'))
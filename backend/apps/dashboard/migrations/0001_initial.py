@@ -0,0 +1,36 @@
+# Generated by Django 5.1.5 on 2026-10-17 03:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='HotspotScore',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('district', 'District'), ('grid', 'Grid Cell')], max_length=10)),
+                ('key', models.CharField(max_length=100)),
+                ('latitude', models.FloatField(blank=True, null=True)),
+                ('longitude', models.FloatField(blank=True, null=True)),
+                ('score', models.FloatField(default=0)),
+                ('crime_count', models.IntegerField(default=0)),
+                ('high_severity', models.IntegerField(default=0)),
+                ('unsolved', models.IntegerField(default=0)),
+                ('last_crime_at', models.DateTimeField(blank=True, null=True)),
+                ('computed_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Hotspot Score',
+                'verbose_name_plural': 'Hotspot Scores',
+                'db_table': 'hotspot_scores',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'key'), name='hotspot_score_key')],
+            },
+        ),
+    ]
@@ -0,0 +1,34 @@
+# Generated by Django 5.1.5 on 2026-10-17 03:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrimeAnomaly',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('district', models.CharField(max_length=100)),
+                ('category', models.CharField(max_length=30)),
+                ('day', models.DateField()),
+                ('observed', models.IntegerField()),
+                ('expected', models.FloatField()),
+                ('z_score', models.FloatField()),
+                ('detected_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Crime Anomaly',
+                'verbose_name_plural': 'Crime Anomalies',
+                'db_table': 'crime_anomalies',
+                'ordering': ['-day', '-z_score'],
+                'indexes': [models.Index(fields=['-day', '-z_score'], name='crime_anomaly_recent_idx')],
+                'constraints': [models.UniqueConstraint(fields=('district', 'category', 'day'), name='crime_anomaly_key')],
+            },
+        ),
+    ]
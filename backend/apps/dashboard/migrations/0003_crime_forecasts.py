@@ -0,0 +1,36 @@
+# Generated by Django 5.1.5 on 2026-10-17 03:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dashboard', '0002_crime_anomalies'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CrimeForecast',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('district', models.CharField(max_length=100)),
+                ('category', models.CharField(blank=True, max_length=30)),
+                ('week_start', models.DateField()),
+                ('horizon', models.PositiveSmallIntegerField()),
+                ('expected', models.FloatField()),
+                ('lower', models.FloatField()),
+                ('upper', models.FloatField()),
+                ('method', models.CharField(choices=[('holt_winters', 'Holt-Winters'), ('seasonal_naive', 'Seasonal Naive')], max_length=20)),
+                ('backtest_mae', models.FloatField()),
+                ('fitted_at', models.DateTimeField()),
+            ],
+            options={
+                'verbose_name': 'Crime Forecast',
+                'verbose_name_plural': 'Crime Forecasts',
+                'db_table': 'crime_forecasts',
+                'ordering': ['district', 'category', 'week_start'],
+                'constraints': [models.UniqueConstraint(fields=('district', 'category', 'week_start'), name='crime_forecast_key')],
+            },
+        ),
+    ]
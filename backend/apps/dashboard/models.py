@@ -1,3 +1,101 @@
 from django.db import models
 
-# Create your models here.
+
+# ─────────────────────────────────────────────────────────────
+# HOTSPOT SCORES — maintained by apps.dashboard.hotspots
+# `score` is the severity-weighted, time-decayed risk as of
+# `computed_at`; readers decay it to the current time.
+# ─────────────────────────────────────────────────────────────
+class HotspotKind(models.TextChoices):
+    DISTRICT = 'district', 'District'
+    GRID     = 'grid',     'Grid Cell'
+
+
+class HotspotScore(models.Model):
+    kind            = models.CharField(max_length=10, choices=HotspotKind.choices)
+    key             = models.CharField(max_length=100)     # district name, or "row:col" grid cell
+    latitude        = models.FloatField(null=True, blank=True)   # grid cell centre
+    longitude       = models.FloatField(null=True, blank=True)
+    score           = models.FloatField(default=0)
+    crime_count     = models.IntegerField(default=0)
+    high_severity   = models.IntegerField(default=0)
+    unsolved        = models.IntegerField(default=0)
+    last_crime_at   = models.DateTimeField(null=True, blank=True)
+    computed_at     = models.DateTimeField()
+
+    class Meta:
+        db_table            = 'hotspot_scores'
+        verbose_name        = 'Hotspot Score'
+        verbose_name_plural = 'Hotspot Scores'
+        constraints         = [
+            models.UniqueConstraint(fields=['kind', 'key'], name='hotspot_score_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.key} — {self.score:.2f}"
+
+
+# ─────────────────────────────────────────────────────────────
+# CRIME ANOMALIES — written by apps.dashboard.anomalies
+# One row per (district, category, day) whose count broke well
+# above its seasonal EWMA baseline.
+# ─────────────────────────────────────────────────────────────
+class CrimeAnomaly(models.Model):
+    district        = models.CharField(max_length=100)
+    category        = models.CharField(max_length=30)
+    day             = models.DateField()
+    observed        = models.IntegerField()
+    expected        = models.FloatField()
+    z_score         = models.FloatField()
+    detected_at     = models.DateTimeField()
+
+    class Meta:
+        db_table            = 'crime_anomalies'
+        verbose_name        = 'Crime Anomaly'
+        verbose_name_plural = 'Crime Anomalies'
+        ordering            = ['-day', '-z_score']
+        constraints         = [
+            models.UniqueConstraint(fields=['district', 'category', 'day'], name='crime_anomaly_key'),
+        ]
+        indexes             = [
+            models.Index(fields=['-day', '-z_score'], name='crime_anomaly_recent_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.district} / {self.category}: {self.observed} (expected {self.expected:.1f})"
+
+
+# ─────────────────────────────────────────────────────────────
+# CRIME FORECASTS — written by apps.dashboard.forecasts
+# Expected crimes per week ahead for each district × category;
+# category '' is the district total. lower/upper bound the
+# FORECAST_INTERVAL prediction interval.
+# ─────────────────────────────────────────────────────────────
+class ForecastMethod(models.TextChoices):
+    HOLT_WINTERS   = 'holt_winters',   'Holt-Winters'
+    SEASONAL_NAIVE = 'seasonal_naive', 'Seasonal Naive'
+
+
+class CrimeForecast(models.Model):
+    district        = models.CharField(max_length=100)
+    category        = models.CharField(max_length=30, blank=True)
+    week_start      = models.DateField()
+    horizon         = models.PositiveSmallIntegerField()     # weeks ahead, 1 = current week
+    expected        = models.FloatField()
+    lower           = models.FloatField()
+    upper           = models.FloatField()
+    method          = models.CharField(max_length=20, choices=ForecastMethod.choices)
+    backtest_mae    = models.FloatField()
+    fitted_at       = models.DateTimeField()
+
+    class Meta:
+        db_table            = 'crime_forecasts'
+        verbose_name        = 'Crime Forecast'
+        verbose_name_plural = 'Crime Forecasts'
+        ordering            = ['district', 'category', 'week_start']
+        constraints         = [
+            models.UniqueConstraint(fields=['district', 'category', 'week_start'], name='crime_forecast_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.week_start} {self.district} / {self.category or 'all'}: {self.expected:.1f}"
@@ -0,0 +1,131 @@
+import logging
+from django.db                 import transaction
+from django.db.models.signals  import pre_save, post_save, post_delete
+from django.dispatch           import receiver
+
+from apps.accounts.models       import OfficerUser
+from apps.analysis.models       import AnalysisResult, AnalysisStatus
+from apps.crimes.data_version   import bump_data_version
+from apps.crimes.models         import CrimeReport
+from apps.reports.models        import GeneratedReport
+from apps.crimes.signals        import crimes_imported
+from .hotspots                  import add_crimes
+from .live                      import publish
+from .widgets                   import alert_item, feed_item, is_alert, label, recent_item
+
+logger = logging.getLogger('apps.dashboard')
+
+
+# ─────────────────────────────────────────────────────────────
+# LIVE FEED — publish crime and alert events as reports change
+# The stored severity/status (apps.crimes.signals reads the row
+# once in pre_save) tell an update apart from a report entering
+# or leaving the alert list.
+# ─────────────────────────────────────────────────────────────
+@receiver(post_save, sender=CrimeReport)
+def crime_report_live(sender, instance, created, **kwargs):
+    alert = is_alert(instance.severity, instance.status)
+    if created:
+        publish('crime', recent_item(instance))
+        if alert:
+            publish('alert', alert_item(instance))
+        return
+
+    before = getattr(instance, '_stored_row', None)
+    if not before:
+        return
+    if before['status'] != instance.status:
+        publish('status', {**feed_item(instance), 'previous_status': label(before['status'])})
+
+    was_alert = is_alert(before['severity'], before['status'])
+    if alert and not was_alert:
+        publish('alert', alert_item(instance))
+    elif was_alert and not alert:
+        publish('alert-resolved', feed_item(instance))
+
+
+@receiver(post_delete, sender=CrimeReport)
+def crime_report_live_deleted(sender, instance, **kwargs):
+    publish('crime-deleted', {'id': instance.id, 'case_number': instance.case_number})
+
+
+@receiver(crimes_imported)
+def crimes_imported_live(sender, crimes, **kwargs):
+    # One summary per import chunk rather than an event per row
+    publish('import', {
+        'created': len(crimes),
+        'alerts':  sum(is_alert(crime.severity, crime.status) for crime in crimes),
+    })
+
+
+# ─────────────────────────────────────────────────────────────
+# HOTSPOT SCORES — merge new crimes in after commit
+# Updates and deletes are picked up by the periodic refresh.
+# ─────────────────────────────────────────────────────────────
+def score_after_commit(crimes):
+    def merge():
+        try:
+            add_crimes(crimes)
+        except Exception as e:
+            logger.error(f"Hotspot score update failed: {e}")
+    transaction.on_commit(merge)
+
+
+@receiver(post_save, sender=CrimeReport)
+def crime_report_hotspots(sender, instance, created, **kwargs):
+    if created:
+        score_after_commit([instance])
+
+
+@receiver(crimes_imported)
+def crimes_imported_hotspots(sender, crimes, **kwargs):
+    score_after_commit(crimes)
+
+
+# ─────────────────────────────────────────────────────────────
+# DATA VERSION — other tables the cached widgets count
+# (CrimeReport writes bump it in apps.crimes.signals). Only
+# changes to a counted figure move it: completed analyses,
+# generated reports, active officers. Logins (last_login saves)
+# and analyses still in progress leave the cache alone.
+# ─────────────────────────────────────────────────────────────
+def saves_field(update_fields, field):
+    return update_fields is None or field in update_fields
+
+
+@receiver(post_save, sender=AnalysisResult)
+def analysis_saved_version(sender, instance, update_fields=None, **kwargs):
+    if instance.status == AnalysisStatus.COMPLETED and saves_field(update_fields, 'status'):
+        bump_data_version()
+
+
+@receiver(post_delete, sender=AnalysisResult)
+def analysis_deleted_version(sender, instance, **kwargs):
+    if instance.status == AnalysisStatus.COMPLETED:
+        bump_data_version()
+
+
+@receiver(post_save,   sender=GeneratedReport)
+@receiver(post_delete, sender=GeneratedReport)
+def generated_report_version(sender, **kwargs):
+    bump_data_version()
+
+
+@receiver(pre_save, sender=OfficerUser)
+def officer_saving(sender, instance, update_fields=None, **kwargs):
+    instance._stored_is_active = (
+        OfficerUser.objects.filter(pk=instance.pk).values_list('is_active', flat=True).first()
+        if instance.pk and saves_field(update_fields, 'is_active') else None
+    )
+
+
+@receiver(post_save, sender=OfficerUser)
+def officer_saved_version(sender, instance, created, **kwargs):
+    stored = getattr(instance, '_stored_is_active', None)
+    if created or (stored is not None and stored != instance.is_active):
+        bump_data_version()
+
+
+@receiver(post_delete, sender=OfficerUser)
+def officer_deleted_version(sender, instance, **kwargs):
+    bump_data_version()
@@ -0,0 +1,32 @@
+import json
+from rest_framework.renderers               import BaseRenderer
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+
+# ─────────────────────────────────────────────────────────────
+# SSE HELPERS
+# Browsers' EventSource can't set an Authorization header, so
+# the stream also accepts the access token as ?token=.
+# ─────────────────────────────────────────────────────────────
+class QueryTokenJWTAuthentication(JWTAuthentication):
+
+    def authenticate(self, request):
+        result = super().authenticate(request)
+        if result is not None:
+            return result
+        raw_token = request.query_params.get('token')
+        if not raw_token:
+            return None
+        validated_token = self.get_validated_token(raw_token.encode())
+        return self.get_user(validated_token), validated_token
+
+
+class EventStreamRenderer(BaseRenderer):
+    # Lets Accept: text/event-stream through content negotiation;
+    # only error bodies are rendered here (as JSON)
+    media_type = 'text/event-stream'
+    format     = 'sse'
+    charset    = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data).encode() if data is not None else b''
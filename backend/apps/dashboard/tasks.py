@@ -0,0 +1,32 @@
+import logging
+from celery                     import shared_task
+
+from .anomalies import detect_anomalies
+from .forecasts import refresh_forecasts
+from .hotspots  import refresh_hotspot_scores
+
+logger = logging.getLogger('apps.dashboard')
+
+
+# ─────────────────────────────────────────────────────────────
+# TASK — Rebuild hotspot risk scores (scheduled by Celery beat)
+# ─────────────────────────────────────────────────────────────
+@shared_task(name='dashboard.refresh_hotspot_scores')
+def refresh_hotspot_scores_task():
+    return refresh_hotspot_scores()
+
+
+# ─────────────────────────────────────────────────────────────
+# TASK — Flag district × category spikes (hourly, Celery beat)
+# ─────────────────────────────────────────────────────────────
+@shared_task(name='dashboard.detect_anomalies')
+def detect_anomalies_task():
+    return detect_anomalies()
+
+
+# ─────────────────────────────────────────────────────────────
+# TASK — Refit weekly crime forecasts (daily, Celery beat)
+# ─────────────────────────────────────────────────────────────
+@shared_task(name='dashboard.refresh_forecasts')
+def refresh_forecasts_task():
+    return refresh_forecasts()
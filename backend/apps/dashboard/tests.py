@@ -1,3 +1,564 @@
-from django.test import TestCase
+from datetime                   import timedelta
+from unittest                   import mock
+from django.core.cache          import cache
+from django.test                import TestCase, override_settings
+from django.urls                import reverse
+from django.utils               import timezone
+from rest_framework.test        import APIClient
 
-# Create your tests here.
+from apps.accounts.models       import OfficerUser
+from apps.analysis.models       import AnalysisResult, AnalysisStatus
+from apps.crimes.data_version   import data_version
+from apps.crimes.models         import CrimeDailyStat, CrimeReport
+from apps.crimes.rollup         import rebuild_daily_stats
+from apps.dashboard.anomalies   import detect_anomalies
+from apps.dashboard.cache       import cache_key
+from apps.dashboard.forecasts   import refresh_forecasts
+from apps.dashboard.hotspots    import refresh_hotspot_scores
+from apps.dashboard.live        import hub
+from apps.dashboard.models      import CrimeAnomaly, CrimeForecast, HotspotKind, HotspotScore
+from apps.reports.models        import GeneratedReport
+
+
+# ─────────────────────────────────────────────────────────────
+# DASHBOARD AGGREGATION — one query per table
+# ─────────────────────────────────────────────────────────────
+class DashboardAggregationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+        OfficerUser.objects.create_user(
+            'UPF-0002', 'inactive@police.go.ug', 'pass1234', first_name='Old', last_name='Account',
+            is_active=False,
+        )
+
+        rows = [
+            # status,               severity,   category,  district,  days ago
+            ('reported',            'critical', 'robbery', 'Kampala', 1),
+            ('reported',            'low',      'theft',   'Kampala', 3),
+            ('under_investigation', 'high',     'theft',   'Gulu',    10),
+            ('solved',              'medium',   'fraud',   'Gulu',    20),
+            ('solved',              'high',     'theft',   'Mbale',   40),
+            ('cold_case',           'low',      'arson',   'Mbale',   400),
+        ]
+        CrimeReport.objects.bulk_create([
+            CrimeReport(
+                case_number   = f'UPF-TEST-{i:03d}',
+                title         = f'Case {i}',
+                status        = status_,
+                severity      = severity,
+                category      = category,
+                district      = district,
+                description   = 'Test report',
+                location      = 'Test location',
+                date_occurred = timezone.now(),
+                reported_by   = cls.officer if i % 2 == 0 else None,
+            )
+            for i, (status_, severity, category, district, _) in enumerate(rows)
+        ])
+        now = timezone.now()
+        for i, row in enumerate(rows):
+            CrimeReport.objects.filter(case_number=f'UPF-TEST-{i:03d}').update(
+                date_reported=now - timedelta(days=row[4])
+            )
+        # bulk_create/update skip the signals that maintain the rollup
+        rebuild_daily_stats()
+
+        AnalysisResult.objects.create(requested_by=cls.officer, prompt='p', status='completed')
+        AnalysisResult.objects.create(requested_by=cls.officer, prompt='p', status='failed')
+        GeneratedReport.objects.create(generated_by=cls.officer, title='Weekly')
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def test_overview_uses_one_query_per_table(self):
+        # crime_daily_stats, AnalysisResult, GeneratedReport, OfficerUser
+        with self.assertNumQueries(4):
+            response = self.client.get(reverse('dashboard-overview'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['crimes'], {
+            'total':              6,
+            'this_week':          2,
+            'this_month':         4,
+            'high_priority':      2,
+            'solve_rate_percent': 33.3,
+        })
+        self.assertEqual(response.data['by_status'], {
+            'reported':            2,
+            'under_investigation': 1,
+            'solved':              2,
+            'cold_cases':          1,
+        })
+        self.assertEqual(response.data['system'], {
+            'total_analyses':  1,
+            'total_reports':   1,
+            'active_officers': 1,
+        })
+
+    def test_week_and_month_are_7_and_30_days(self):
+        now = timezone.now()
+        for days in (6, 7, 29, 30):
+            CrimeReport.objects.create(
+                title=f'{days} days ago', category='theft', severity='low', district='Gulu',
+                description='Test report', location='Test location', date_occurred=now,
+            )
+            CrimeReport.objects.filter(title=f'{days} days ago').update(date_reported=now - timedelta(days=days))
+        rebuild_daily_stats()
+
+        crimes = self.client.get(reverse('dashboard-overview')).data['crimes']
+        self.assertEqual((crimes['this_week'], crimes['this_month']), (2 + 1, 4 + 3))
+
+    def test_crime_stats_uses_one_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('crime-stats'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total_reports'], 6)
+        self.assertEqual(response.data['by_category'][0], {'category': 'theft', 'count': 3})
+        self.assertEqual(
+            {row['district']: row['count'] for row in response.data['by_district']},
+            {'Kampala': 2, 'Gulu': 2, 'Mbale': 2},
+        )
+        self.assertEqual(sum(row['count'] for row in response.data['by_severity']), 6)
+
+    def test_category_district_matrix_is_dense(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('category-district-matrix'), {'normalize': 'row'})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data
+        self.assertEqual(data['columns'], ['Gulu', 'Kampala', 'Mbale'])
+        self.assertEqual(data['shape'], [len(data['rows']), 3])
+        self.assertEqual(len(data['counts']), data['shape'][0] * 3)
+
+        theft = data['rows'].index('theft')
+        self.assertEqual(data['row_totals'][theft], 3)
+        self.assertEqual(data['counts'][theft * 3:theft * 3 + 3], [33.33, 33.33, 33.33])
+        self.assertEqual(data['column_totals'], [2, 2, 2])
+        self.assertEqual(data['total'], 6)
+
+    def test_officer_stats_uses_one_crime_query(self):
+        # CrimeReport breakdowns + AnalysisResult + GeneratedReport
+        with self.assertNumQueries(3):
+            response = self.client.get(reverse('my-stats'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['my_crimes']['total'], 3)
+        self.assertEqual(
+            {row['status']: row['count'] for row in response.data['my_crimes']['by_status']},
+            {'reported': 1, 'under_investigation': 1, 'solved': 1},
+        )
+        self.assertEqual(response.data['my_activity'], {
+            'total_analyses':          2,
+            'total_reports_generated': 1,
+        })
+
+
+# ─────────────────────────────────────────────────────────────
+# TRENDS — dense series over any range
+# ─────────────────────────────────────────────────────────────
+class TrendsTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+        now = timezone.now()
+        for i, days_ago in enumerate([0, 0, 2, 15]):
+            crime = CrimeReport.objects.create(
+                title='Case', category='fraud' if i else 'theft', severity='low', district='Gulu',
+                description='Test report', location='Test location', date_occurred=now,
+            )
+            CrimeReport.objects.filter(pk=crime.pk).update(date_reported=now - timedelta(days=days_ago))
+        rebuild_daily_stats()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def test_daily_series_is_zero_filled(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('dashboard-trends'))
+
+        self.assertEqual(response.status_code, 200)
+        data = response.data['data']
+        self.assertEqual(len(data), 30)
+        self.assertEqual(data[-1], {
+            'bucket': timezone.localdate().isoformat(),
+            'label':  timezone.localdate().isoformat(),
+            'count':  2,
+        })
+        self.assertEqual([item['count'] for item in data[-3:]], [1, 0, 2])
+        self.assertEqual(response.data['total'], 4)
+
+    def test_filters_and_validation(self):
+        response = self.client.get(reverse('dashboard-trends'), {'granularity': 'month', 'category': 'fraud'})
+        self.assertEqual(response.data['total'], 3)
+
+        for params in ({'granularity': 'year'}, {'category': 'nope'}, {'from': '2026-02-30'},
+                       {'granularity': 'hour', 'from': '2000-01-01'}):
+            self.assertEqual(self.client.get(reverse('dashboard-trends'), params).status_code, 400)
+
+
+# ─────────────────────────────────────────────────────────────
+# HOTSPOT RISK — severity-weighted and time-decayed
+# ─────────────────────────────────────────────────────────────
+@override_settings(HOTSPOT_HALF_LIFE_DAYS=30, HOTSPOT_GRID_DEGREES=0.05)
+class HotspotScoreTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+        now = timezone.now()
+        rows = [
+            # district, severity,   days ago, latitude, longitude
+            ('Gulu',    'critical', 120,      2.7746,   32.2990),
+            ('Gulu',    'critical', 120,      2.7746,   32.2990),
+            ('Gulu',    'critical', 120,      None,     None),
+            ('Kampala', 'medium',   1,        0.3476,   32.5825),
+            ('Kampala', 'low',      0,        0.3480,   32.5830),
+        ]
+        for district, severity, days_ago, latitude, longitude in rows:
+            crime = CrimeReport.objects.create(
+                title='Case', category='robbery', severity=severity, district=district,
+                description='Test report', location='Test location', date_occurred=now,
+                latitude=latitude, longitude=longitude,
+            )
+            CrimeReport.objects.filter(pk=crime.pk).update(date_reported=now - timedelta(days=days_ago))
+        rebuild_daily_stats()
+        refresh_hotspot_scores()
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def test_old_spikes_decay_below_recent_activity(self):
+        gulu    = HotspotScore.objects.get(kind=HotspotKind.DISTRICT, key='Gulu')
+        kampala = HotspotScore.objects.get(kind=HotspotKind.DISTRICT, key='Kampala')
+        # 3 critical crimes four half-lives old: 3 * 8 / 16
+        self.assertAlmostEqual(gulu.score, 1.5, places=2)
+        self.assertAlmostEqual(kampala.score, 2 * 2 ** (-1 / 30) + 1, places=2)
+
+        data = self.client.get(reverse('crime-hotspots')).data['data']
+        self.assertEqual([row['district'] for row in data], ['Kampala', 'Gulu'])
+        self.assertEqual(data[1]['high_severity'], 3)
+        self.assertEqual(data[1]['risk_level'], 'low')
+
+    def test_grid_cells_and_incremental_updates(self):
+        cells = {score.key: score for score in HotspotScore.objects.filter(kind=HotspotKind.GRID)}
+        self.assertEqual(len(cells), 2)
+        self.assertEqual(sum(cell.crime_count for cell in cells.values()), 4)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CrimeReport.objects.create(
+                title='Case', category='robbery', severity='critical', district='Gulu',
+                description='Test report', location='Test location', date_occurred=timezone.now(),
+                latitude=2.7746, longitude=32.2990,
+            )
+        gulu = HotspotScore.objects.get(kind=HotspotKind.DISTRICT, key='Gulu')
+        self.assertAlmostEqual(gulu.score, 9.5, places=2)
+        self.assertEqual(gulu.crime_count, 4)
+
+        top = self.client.get(reverse('grid-hotspots'), {'limit': 1}).data['data']
+        self.assertEqual(top[0]['crime_count'], 3)
+        self.assertAlmostEqual(top[0]['latitude'], 2.775)
+
+
+# ─────────────────────────────────────────────────────────────
+# RESPONSE CACHE — served until a write to the data it counts
+# ─────────────────────────────────────────────────────────────
+class DashboardCacheTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def report(self, **fields):
+        with self.captureOnCommitCallbacks(execute=True):
+            return CrimeReport.objects.create(
+                title='Case', category='theft', severity='high', district='Gulu',
+                description='Test report', location='Test location',
+                date_occurred=timezone.now(), **fields,
+            )
+
+    def test_repeat_requests_skip_the_database(self):
+        self.report()
+        url = reverse('crime-hotspots')
+        first = self.client.get(url, {'period': 'month'}).data
+        with self.assertNumQueries(0):
+            again = self.client.get(url, {'period': 'month'}).data
+        self.assertEqual(first, again)
+
+        # Other parameters are other entries (district totals + risk scores)
+        with self.assertNumQueries(2):
+            self.client.get(url, {'period': 'month', 'limit': 3})
+
+    def test_crime_writes_invalidate(self):
+        url = reverse('dashboard-overview')
+        self.assertEqual(self.client.get(url).data['crimes']['total'], 0)
+
+        crime = self.report()
+        self.assertEqual(self.client.get(url).data['crimes']['total'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            crime.delete()
+        self.assertEqual(self.client.get(url).data['crimes']['total'], 0)
+
+    def test_analysis_writes_invalidate(self):
+        url = reverse('dashboard-overview')
+        self.assertEqual(self.client.get(url).data['system']['total_analyses'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            AnalysisResult.objects.create(requested_by=self.officer, prompt='p', status='completed')
+        self.assertEqual(self.client.get(url).data['system']['total_analyses'], 1)
+
+    def version_after(self, change):
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        return data_version()
+
+    def assertChanged(self, version, change):
+        changed = self.version_after(change)
+        self.assertNotEqual(changed, version)
+        return changed
+
+    def test_only_counted_changes_move_the_version(self):
+        version  = data_version()
+        analysis = AnalysisResult.objects.create(requested_by=self.officer, prompt='p')
+
+        # A login, and an analysis that hasn't finished yet
+        self.officer.last_login = timezone.now()
+        self.assertEqual(self.version_after(lambda: self.officer.save(update_fields=['last_login'])), version)
+        analysis.status = AnalysisStatus.PROCESSING
+        self.assertEqual(self.version_after(lambda: analysis.save(update_fields=['status'])), version)
+        self.assertEqual(self.version_after(self.officer.save), version)
+
+        analysis.status = AnalysisStatus.COMPLETED
+        version = self.assertChanged(version, lambda: analysis.save(update_fields=['status']))
+        self.officer.is_active = False
+        version = self.assertChanged(version, self.officer.save)
+        self.assertChanged(version, lambda: GeneratedReport.objects.create(generated_by=self.officer, title='Weekly'))
+
+    def test_only_clock_relative_keys_use_the_time_bucket(self):
+        def keys():
+            return (
+                cache_key('recent', limit=10),
+                cache_key('by-category', period='all'),
+                cache_key('by-category', period='week'),
+                cache_key('overview'),
+            )
+
+        later  = timezone.now() + timedelta(hours=1)
+        before = keys()
+        with mock.patch('apps.dashboard.cache.bucket_now', return_value=later):
+            after = keys()
+
+        self.assertEqual(before[:2], after[:2])
+        self.assertNotEqual(before[2], after[2])
+        self.assertNotEqual(before[3], after[3])
+
+    def test_bundle_shares_entries_with_single_views(self):
+        self.report()
+        self.client.get(reverse('crimes-by-category'), {'period': 'week'})
+        response = self.client.get(reverse('dashboard-bundle'), {'widgets': 'by-category,by-severity', 'period': 'week'})
+        self.assertTrue(response.data['timings']['by-category']['cached'])
+        self.assertFalse(response.data['timings']['by-severity']['cached'])
+        self.assertEqual(response.data['widgets']['by-category']['data'][0]['count'], 1)
+
+
+# ─────────────────────────────────────────────────────────────
+# LIVE FEED — SSE events with Last-Event-ID resume
+# ─────────────────────────────────────────────────────────────
+@override_settings(LIVE_EVENTS_STREAM_SECONDS=0)
+class LiveFeedTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+
+    def stream(self, **headers):
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+        response = self.client.get(reverse('dashboard-live'), HTTP_ACCEPT='text/event-stream', **headers)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        return b''.join(response.streaming_content).decode()
+
+    def test_replays_events_after_last_event_id(self):
+        start = hub.last_id()
+        with self.captureOnCommitCallbacks(execute=True):
+            crime = CrimeReport.objects.create(
+                title='Armed robbery', category='robbery', severity='critical', district='Gulu',
+                description='Test report', location='Test location', date_occurred=timezone.now(),
+            )
+        with self.captureOnCommitCallbacks(execute=True):
+            crime.status = 'solved'
+            crime.save()
+
+        body = self.stream(HTTP_LAST_EVENT_ID=str(start))
+        events = [line.split(': ', 1)[1] for line in body.splitlines() if line.startswith('event: ')]
+        self.assertEqual(events, ['crime', 'alert', 'status', 'alert-resolved'])
+        self.assertIn(f'id: {start + 4}', body)
+
+        # Resuming after the last one replays nothing
+        self.assertNotIn('event: ', self.stream(HTTP_LAST_EVENT_ID=str(start + 4)))
+
+
+# ─────────────────────────────────────────────────────────────
+# DAILY STATS ROLLUP — incremental updates match a rebuild
+# ─────────────────────────────────────────────────────────────
+class DailyStatsRollupTests(TestCase):
+
+    def rollup(self):
+        return sorted(
+            CrimeDailyStat.objects.values_list(
+                'day', 'district', 'category', 'severity', 'status', 'crime_count', 'victim_count'
+            )
+        )
+
+    def assertMatchesRebuild(self):
+        incremental = self.rollup()
+        rebuild_daily_stats()
+        self.assertEqual(incremental, self.rollup())
+
+    def test_save_and_delete_keep_rollup_in_sync(self):
+        crimes = [
+            CrimeReport.objects.create(
+                title='Case', category='theft', severity='low', district='Gulu',
+                description='Test report', location='Test location',
+                date_occurred=timezone.now(), victim_count=index + 1,
+            )
+            for index in range(3)
+        ]
+        self.assertMatchesRebuild()
+        self.assertEqual(CrimeDailyStat.objects.get().crime_count, 3)
+
+        crimes[0].status = 'solved'
+        crimes[0].save()
+        crimes[1].victim_count = 10
+        crimes[1].save(update_fields=['victim_count'])
+        self.assertMatchesRebuild()
+
+        crimes[2].delete()
+        self.assertMatchesRebuild()
+        self.assertEqual(sum(row[5] for row in self.rollup()), 2)
+
+
+# ─────────────────────────────────────────────────────────────
+# ANOMALIES — spikes against a seasonal EWMA baseline
+# ─────────────────────────────────────────────────────────────
+class AnomalyDetectionTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+        cls.today = timezone.localdate()
+        rows = []
+        for days_ago in range(119):
+            day = cls.today - timedelta(days=days_ago)
+            # Kampala theft: 4 a day, 8 on Saturdays, 25 two days ago
+            theft = 8 if day.weekday() == 5 else 4
+            if days_ago == 2:
+                theft = 25
+            rows.append(CrimeDailyStat(
+                day=day, district='Kampala', category='theft', severity='low', status='reported',
+                crime_count=theft,
+            ))
+            # Gulu robbery: steady 5 a day, no spike
+            rows.append(CrimeDailyStat(
+                day=day, district='Gulu', category='robbery', severity='high', status='reported',
+                crime_count=5,
+            ))
+        CrimeDailyStat.objects.bulk_create(rows)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def test_spike_is_flagged_and_weekly_pattern_is_not(self):
+        self.assertEqual(detect_anomalies(self.today), 1)
+        anomaly = CrimeAnomaly.objects.get()
+        self.assertEqual((anomaly.district, anomaly.category), ('Kampala', 'theft'))
+        self.assertEqual(anomaly.day, self.today - timedelta(days=2))
+        self.assertEqual(anomaly.observed, 25)
+        self.assertGreater(anomaly.z_score, 3)
+
+        # Re-running replaces the detection window rather than duplicating it
+        detect_anomalies(self.today)
+        self.assertEqual(CrimeAnomaly.objects.count(), 1)
+
+        data = self.client.get(reverse('crime-anomalies')).data['data']
+        self.assertEqual([(row['district'], row['observed']) for row in data], [('Kampala', 25)])
+        self.assertEqual(self.client.get(reverse('crime-anomalies'), {'district': 'gulu'}).data['data'], [])
+        self.assertEqual(self.client.get(reverse('crime-anomalies'), {'days': 0}).status_code, 400)
+
+
+# ─────────────────────────────────────────────────────────────
+# FORECASTS — weekly, fitted in batch
+# ─────────────────────────────────────────────────────────────
+class ForecastTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.officer = OfficerUser.objects.create_user(
+            'UPF-0001', 'officer@police.go.ug', 'pass1234', first_name='Jane', last_name='Akello'
+        )
+        cls.today  = timezone.localdate()
+        cls.monday = cls.today - timedelta(days=cls.today.weekday())
+        rows = []
+        for weeks_ago in range(1, 105):
+            # Kampala: 10 thefts every Monday, 3 burglaries every Tuesday
+            day = cls.monday - timedelta(weeks=weeks_ago)
+            rows.append(CrimeDailyStat(
+                day=day, district='Kampala', category='theft', severity='low', status='reported', crime_count=10,
+            ))
+            rows.append(CrimeDailyStat(
+                day=day + timedelta(days=1), district='Kampala', category='burglary', severity='medium',
+                status='reported', crime_count=3,
+            ))
+        CrimeDailyStat.objects.bulk_create(rows)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.officer)
+
+    def test_steady_series_forecast_and_stored(self):
+        summary = refresh_forecasts(self.today)
+        self.assertEqual(summary['series'], 3)        # theft, burglary, Kampala total
+        self.assertAlmostEqual(summary['backtest_mae'], 0, places=3)
+        self.assertEqual(CrimeForecast.objects.count(), 3 * 4)
+
+        theft = CrimeForecast.objects.get(category='theft', horizon=1)
+        self.assertEqual(theft.week_start, self.monday)
+        self.assertAlmostEqual(theft.expected, 10, places=1)
+        self.assertLessEqual(theft.lower, theft.expected)
+        self.assertGreaterEqual(theft.upper, theft.expected)
+
+        response = self.client.get(reverse('crime-forecasts'), {'district': 'kampala'})
+        data     = response.data['data']
+        self.assertEqual([row['horizon'] for row in data], [1, 2, 3, 4])
+        self.assertAlmostEqual(data[0]['expected'], 13, places=1)
+        self.assertEqual(self.client.get(reverse('crime-forecasts'), {'category': 'nope'}).status_code, 400)
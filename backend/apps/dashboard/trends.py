@@ -0,0 +1,178 @@
+from datetime                   import datetime, time, timedelta
+from django.db.models           import Count
+from django.db.models.functions import Trunc, TruncHour
+from django.utils               import timezone
+from django.utils.dateparse     import parse_date, parse_datetime
+
+from apps.crimes.models         import CrimeCategory, CrimeReport, CrimeSeverity
+from apps.crimes.rollup         import daily_stats, total_crimes
+from .cache                     import bucket_now
+
+
+# ─────────────────────────────────────────────────────────────
+# TRENDS — dense, zero-filled series over any range
+# day / week / month buckets come from the crime_daily_stats
+# rollup; hour buckets need the raw reports. Either way it is one
+# grouped query, and buckets with no crimes are filled in here.
+# ─────────────────────────────────────────────────────────────
+GRANULARITIES       = ('hour', 'day', 'week', 'month')
+MAX_TREND_BUCKETS   = 1000
+DEFAULT_TREND_DAYS  = 30
+
+BUCKET_LABELS = {
+    'hour':  '%Y-%m-%d %H:00',
+    'day':   '%Y-%m-%d',
+    'week':  '%Y-%m-%d',
+    'month': '%b %Y',
+}
+
+
+class TrendQueryError(ValueError):
+    pass
+
+
+# ── Bucket arithmetic ────────────────────────────────────────
+def floor_bucket(moment, granularity):
+    # moment: aware datetime for 'hour', date otherwise
+    if granularity == 'hour':
+        return timezone.localtime(moment).replace(minute=0, second=0, microsecond=0)
+    if granularity == 'week':
+        return moment - timedelta(days=moment.weekday())
+    if granularity == 'month':
+        return moment.replace(day=1)
+    return moment
+
+
+def next_bucket(bucket, granularity):
+    if granularity == 'hour':
+        return bucket + timedelta(hours=1)
+    if granularity == 'week':
+        return bucket + timedelta(days=7)
+    if granularity == 'month':
+        return (bucket.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return bucket + timedelta(days=1)
+
+
+def bucket_starts(start, end, granularity):
+    """
+    Bucket starts covering [start, end). Raises TrendQueryError
+    past MAX_TREND_BUCKETS rather than building a huge series.
+    """
+    buckets = []
+    bucket  = floor_bucket(start, granularity)
+    while bucket < end:
+        if len(buckets) == MAX_TREND_BUCKETS:
+            raise TrendQueryError(
+                f'Range too long for {granularity} granularity (max {MAX_TREND_BUCKETS} buckets).'
+            )
+        buckets.append(bucket)
+        bucket = next_bucket(bucket, granularity)
+    return buckets
+
+
+# ── Parameters ───────────────────────────────────────────────
+def parse_bound(value, name):
+    if not value:
+        return None
+    try:
+        parsed = parse_datetime(value) or parse_date(value)
+    except ValueError:
+        parsed = None
+    if parsed is None:
+        raise TrendQueryError(f'{name} must be a date (YYYY-MM-DD) or an ISO datetime.')
+    return parsed
+
+
+def trend_range(raw_from, raw_to, granularity):
+    """
+    Half-open [start, end): aware datetimes for 'hour', dates
+    otherwise. A date `to` includes that whole day.
+    """
+    start = parse_bound(raw_from, 'from')
+    end   = parse_bound(raw_to, 'to')
+
+    if granularity == 'hour':
+        def moment(value, end_of_day=False):
+            if isinstance(value, datetime):
+                return value if timezone.is_aware(value) else timezone.make_aware(value)
+            day = value + timedelta(days=1) if end_of_day else value
+            return timezone.make_aware(datetime.combine(day, time.min))
+        end   = moment(end, end_of_day=True) if end else bucket_now()
+        start = moment(start) if start else end - timedelta(days=1)
+    else:
+        def day(value):
+            if not isinstance(value, datetime):
+                return value
+            return timezone.localdate(value) if timezone.is_aware(value) else value.date()
+        end   = day(end or bucket_now()) + timedelta(days=1)
+        start = day(start) if start else end - timedelta(days=DEFAULT_TREND_DAYS)
+
+    if start >= end:
+        raise TrendQueryError('from must be before to.')
+    return start, end
+
+
+def trend_filters(category=None, district=None, severity=None):
+    filters = {}
+    if category:
+        if category not in CrimeCategory.values:
+            raise TrendQueryError(f'Invalid category. Choose from: {CrimeCategory.values}')
+        filters['category'] = category
+    if severity:
+        if severity not in CrimeSeverity.values:
+            raise TrendQueryError(f'Invalid severity. Choose from: {CrimeSeverity.values}')
+        filters['severity'] = severity
+    if district:
+        filters['district__iexact'] = district
+    return filters
+
+
+# ── Series ───────────────────────────────────────────────────
+def trend_counts(start, end, granularity, filters):
+    if granularity == 'hour':
+        rows = (
+            CrimeReport.objects
+            .filter(date_reported__gte=start, date_reported__lt=end, **filters)
+            .annotate(bucket=TruncHour('date_reported'))
+            .values('bucket')
+            .annotate(count=Count('id'))
+            .order_by()
+        )
+        return {timezone.localtime(row['bucket']): row['count'] for row in rows}
+
+    stats = daily_stats().filter(day__gte=start, day__lt=end, **filters)
+    if granularity == 'day':
+        rows = stats.values('day').annotate(count=total_crimes()).order_by()
+        return {row['day']: row['count'] for row in rows}
+    rows = stats.annotate(bucket=Trunc('day', granularity)).values('bucket').annotate(count=total_crimes()).order_by()
+    return {row['bucket']: row['count'] for row in rows}
+
+
+def trend_series(raw_from=None, raw_to=None, granularity='day', category=None, district=None, severity=None):
+    if granularity not in GRANULARITIES:
+        raise TrendQueryError(f'Invalid granularity. Choose from: {list(GRANULARITIES)}')
+
+    start, end = trend_range(raw_from, raw_to, granularity)
+    filters    = trend_filters(category, district, severity)
+    buckets    = bucket_starts(start, end, granularity)
+    # The first bucket is counted whole, from its own start
+    start      = buckets[0]
+    counts     = trend_counts(start, end, granularity, filters)
+
+    data = [
+        {
+            'bucket': bucket.isoformat(),
+            'label':  bucket.strftime(BUCKET_LABELS[granularity]),
+            'count':  counts.get(bucket, 0),
+        }
+        for bucket in buckets
+    ]
+    return {
+        'granularity': granularity,
+        'from':        start.isoformat(),
+        # Exclusive end for hours, last included day otherwise
+        'to':          (timezone.localtime(end) if granularity == 'hour' else end - timedelta(days=1)).isoformat(),
+        'filters':     {'category': category, 'district': district, 'severity': severity},
+        'total':       sum(item['count'] for item in data),
+        'data':        data,
+    }
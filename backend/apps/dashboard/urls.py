@@ -3,6 +3,9 @@ from .views import (
     DashboardOverviewView,
     CrimesByCategoryView,
     CrimeHotspotsView,
+    GridHotspotsView,
+    AnomaliesView,
+    ForecastsView,
     MonthlyTrendsView,
     DailyTrendsView,
     CrimesBySeverityView,
@@ -10,27 +13,40 @@ from .views import (
     AlertsView,
     OfficerStatsView,
     CategoryDistrictView,
+    CategoryDistrictMatrixView,
+    DashboardBundleView,
+    LiveFeedView,
+    TrendsView,
 )
 
 urlpatterns = [
     # Main overview
     path('overview/',           DashboardOverviewView.as_view(),  name='dashboard-overview'),
 
+    # Several widgets in one request
+    path('bundle/',             DashboardBundleView.as_view(),    name='dashboard-bundle'),
+
     # Crime breakdowns
     path('crimes-by-category/', CrimesByCategoryView.as_view(),  name='crimes-by-category'),
     path('crimes-by-severity/', CrimesBySeverityView.as_view(),  name='crimes-by-severity'),
     path('category-district/',  CategoryDistrictView.as_view(),  name='category-district'),
+    path('category-district/matrix/', CategoryDistrictMatrixView.as_view(), name='category-district-matrix'),
 
     # Hotspots
     path('hotspots/',           CrimeHotspotsView.as_view(),     name='crime-hotspots'),
+    path('hotspots/grid/',      GridHotspotsView.as_view(),      name='grid-hotspots'),
+    path('anomalies/',          AnomaliesView.as_view(),         name='crime-anomalies'),
 
     # Trends
+    path('trends/',             TrendsView.as_view(),            name='dashboard-trends'),
     path('trends/monthly/',     MonthlyTrendsView.as_view(),     name='monthly-trends'),
     path('trends/daily/',       DailyTrendsView.as_view(),       name='daily-trends'),
+    path('forecasts/',          ForecastsView.as_view(),         name='crime-forecasts'),
 
     # Live feed
     path('recent-crimes/',      RecentCrimesView.as_view(),      name='recent-crimes'),
     path('alerts/',             AlertsView.as_view(),            name='alerts'),
+    path('live/',               LiveFeedView.as_view(),          name='dashboard-live'),
 
     # Officer personal stats
     path('my-stats/',           OfficerStatsView.as_view(),      name='my-stats'),
@@ -1,35 +1,50 @@
 import logging
+import time
 from datetime                   import timedelta
-from django.utils               import timezone
-from django.db.models           import Count, Q
+from itertools                  import chain
+from django.conf                import settings
+from django.db                  import connection
+from django.http                import StreamingHttpResponse
+from django.db.models           import Q
+from django.db.models.functions import TruncMonth
 from rest_framework             import status
 from rest_framework.views       import APIView
 from rest_framework.response    import Response
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.renderers   import JSONRenderer
 from drf_spectacular.utils      import extend_schema, OpenApiParameter
 
-from apps.crimes.models         import CrimeReport, CrimeCategory, CrimeSeverity, CrimeStatus
-from apps.analysis.models       import AnalysisResult
-from apps.reports.models        import GeneratedReport
-from apps.accounts.models       import OfficerUser
+from apps.crimes.models         import CrimeCategory
+from apps.crimes.rollup         import daily_stats, total_crimes
+from .cache                     import bucket_now, cached
+from .live                      import format_event, subscribe
+from .streaming                 import EventStreamRenderer, QueryTokenJWTAuthentication
+from .trends                    import MAX_TREND_BUCKETS, TrendQueryError, trend_series
+from .widgets                   import (
+    HIGH_SEVERITIES,
+    OPEN_STATUSES,
+    WIDGETS,
+    BundleContext,
+    build_bundle,
+    get_date_range,
+    category_rows,
+    severity_rows,
+    hotspot_rows,
+    overview_data,
+    recent_data,
+    alerts_data,
+    officer_stats_data,
+    category_district_data,
+    category_district_matrix,
+    grid_hotspots_data,
+    anomalies_data,
+    forecasts_data,
+    MATRIX_NORMALIZATIONS,
+)
 
 logger = logging.getLogger('apps.dashboard')
 
 
-# ─────────────────────────────────────────────────────────────
-# HELPER
-# ─────────────────────────────────────────────────────────────
-def get_date_range(period):
-    now = timezone.now()
-    if period == 'week':
-        return now - timedelta(days=7)
-    elif period == 'month':
-        return now - timedelta(days=30)
-    elif period == 'year':
-        return now - timedelta(days=365)
-    return None
-
-
 # ─────────────────────────────────────────────────────────────
 # OVERVIEW
 # ────────────────────────────────────────────────────���────────
@@ -42,46 +57,7 @@ class DashboardOverviewView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        now         = timezone.now()
-        last_7days  = now - timedelta(days=7)
-        last_30days = now - timedelta(days=30)
-
-        total_crimes        = CrimeReport.objects.count()
-        crimes_this_week    = CrimeReport.objects.filter(date_reported__gte=last_7days).count()
-        crimes_this_month   = CrimeReport.objects.filter(date_reported__gte=last_30days).count()
-        reported            = CrimeReport.objects.filter(status=CrimeStatus.REPORTED).count()
-        under_investigation = CrimeReport.objects.filter(status=CrimeStatus.UNDER_INVESTIGATION).count()
-        solved              = CrimeReport.objects.filter(status=CrimeStatus.SOLVED).count()
-        cold_cases          = CrimeReport.objects.filter(status=CrimeStatus.COLD_CASE).count()
-        high_priority       = CrimeReport.objects.filter(
-                                severity__in=['high', 'critical'],
-                                status__in=['reported', 'under_investigation']
-                              ).count()
-        total_analyses      = AnalysisResult.objects.filter(status='completed').count()
-        total_reports       = GeneratedReport.objects.count()
-        total_officers      = OfficerUser.objects.filter(is_active=True).count()
-        solve_rate          = round((solved / total_crimes * 100), 1) if total_crimes > 0 else 0
-
-        return Response({
-            'crimes': {
-                'total':              total_crimes,
-                'this_week':          crimes_this_week,
-                'this_month':         crimes_this_month,
-                'high_priority':      high_priority,
-                'solve_rate_percent': solve_rate,
-            },
-            'by_status': {
-                'reported':             reported,
-                'under_investigation':  under_investigation,
-                'solved':               solved,
-                'cold_cases':           cold_cases,
-            },
-            'system': {
-                'total_analyses':  total_analyses,
-                'total_reports':   total_reports,
-                'active_officers': total_officers,
-            },
-        }, status=status.HTTP_200_OK)
+        return Response(cached('overview', overview_data), status=status.HTTP_200_OK)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -99,20 +75,13 @@ class CrimesByCategoryView(APIView):
 
     def get(self, request):
         period = request.query_params.get('period', 'all')
+        return Response(cached('by-category', lambda: self.build(period), period=period), status=status.HTTP_200_OK)
+
+    def build(self, period):
         since  = get_date_range(period)
-        crimes = CrimeReport.objects.all()
-        if since:
-            crimes = crimes.filter(date_reported__gte=since)
-        data = crimes.values('category').annotate(count=Count('id')).order_by('-count')
-        result = [
-            {
-                'category': item['category'].replace('_', ' ').title(),
-                'value':    item['category'],
-                'count':    item['count'],
-            }
-            for item in data
-        ]
-        return Response({'period': period, 'data': result}, status=status.HTTP_200_OK)
+        data   = daily_stats(since).values_list('category').annotate(count=total_crimes()).order_by('-count')
+        result = category_rows(data)
+        return {'period': period, 'data': result}
 
 
 # ─────────────────────────────────────────────────────────────
@@ -121,6 +90,11 @@ class CrimesByCategoryView(APIView):
 @extend_schema(
     tags=['📊 Dashboard'],
     summary='Get crime hotspots by district',
+    description='''
+Districts ranked by risk score: each crime adds its severity weight (low 1, medium 2, high 4,
+critical 8), halving every HOTSPOT_HALF_LIFE_DAYS, so old spikes fade. `risk_level` is derived
+from the score; counts cover the requested period.
+    ''',
     parameters=[
         OpenApiParameter('period', str, description='Filter period: week, month, year, all'),
         OpenApiParameter('limit',  int, description='Number of top districts to return (default 10)'),
@@ -131,37 +105,128 @@ class CrimeHotspotsView(APIView):
 
     def get(self, request):
         period = request.query_params.get('period', 'all')
-        since  = get_date_range(period)
         limit  = int(request.query_params.get('limit', 10))
-        crimes = CrimeReport.objects.all()
-        if since:
-            crimes = crimes.filter(date_reported__gte=since)
-        data = (
-            crimes
+        return Response(
+            cached('hotspots', lambda: self.build(period, limit), period=period, limit=limit),
+            status=status.HTTP_200_OK
+        )
+
+    def build(self, period, limit):
+        since = get_date_range(period)
+        data  = (
+            daily_stats(since)
             .values('district')
             .annotate(
-                total         = Count('id'),
-                high_severity = Count('id', filter=Q(severity__in=['high', 'critical'])),
-                unsolved      = Count('id', filter=Q(status__in=['reported', 'under_investigation'])),
+                total         = total_crimes(),
+                high_severity = total_crimes(Q(severity__in=HIGH_SEVERITIES)),
+                unsolved      = total_crimes(Q(status__in=OPEN_STATUSES)),
             )
-            .order_by('-total')[:limit]
+            .order_by()
+        )
+        result = hotspot_rows(data, limit)
+        return {'period': period, 'data': result}
+
+
+@extend_schema(
+    tags=['📊 Dashboard'],
+    summary='Get crime hotspots by map grid cell',
+    description='''
+Grid cells (see HOTSPOT_GRID_DEGREES) ranked by a severity-weighted, time-decayed risk score.
+Only crimes with latitude/longitude are placed on the grid; `latitude`/`longitude` are cell centres.
+    ''',
+    parameters=[
+        OpenApiParameter('limit', int, description='Number of top cells to return (default 50)'),
+    ]
+)
+class GridHotspotsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            limit = int(request.query_params.get('limit', 50))
+        except ValueError:
+            return Response({'error': 'limit must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(cached('hotspot-grid', lambda: grid_hotspots_data(limit), limit=limit), status=status.HTTP_200_OK)
+
+
+# ─────────────────────────────────────────────────────────────
+# ANOMALIES
+# ─────────────────────────────────────────────────────────────
+@extend_schema(
+    tags=['📊 Dashboard'],
+    summary='Get unusual crime spikes by district and category',
+    description='''
+Days on which a district × category count was far above its expected value.
+Expected counts come from an EWMA baseline with a day-of-week profile; `z_score` is how many
+standard deviations the observed count sits above it. Detection runs hourly (see `detect_anomalies`).
+    ''',
+    parameters=[
+        OpenApiParameter('days',     int, description='Look back this many days (default 7, max 120)'),
+        OpenApiParameter('district', str, description='Filter by district'),
+        OpenApiParameter('category', str, description='Filter by crime category'),
+        OpenApiParameter('limit',    int, description='Maximum rows to return (default 50)'),
+    ]
+)
+class AnomaliesView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        try:
+            days  = int(request.query_params.get('days', 7))
+            limit = int(request.query_params.get('limit', 50))
+        except ValueError:
+            return Response({'error': 'days and limit must be integers.'}, status=status.HTTP_400_BAD_REQUEST)
+        if not 1 <= days <= 120:
+            return Response({'error': 'days must be between 1 and 120.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        district = request.query_params.get('district')
+        category = request.query_params.get('category')
+        if category and category not in CrimeCategory.values:
+            return Response(
+                {'error': f'Invalid category. Choose from: {CrimeCategory.values}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            cached(
+                'anomalies', lambda: anomalies_data(days, district, category, limit),
+                days=days, district=district, category=category, limit=limit,
+            ),
+            status=status.HTTP_200_OK
+        )
+
+
+# ─────────────────────────────────────────────────────────────
+# FORECASTS
+# ─────────────────────────────────────────────────────────────
+@extend_schema(
+    tags=['📊 Dashboard'],
+    summary='Get expected crimes per district for the coming weeks',
+    description='''
+Weekly forecasts fitted offline (daily, see `refresh_forecasts`): Holt-Winters or a seasonal naive
+model per series, whichever had the lower backtest error. `horizon` 1 is the current week;
+`lower`/`upper` bound the FORECAST_INTERVAL prediction interval. Without `category` the rows are
+district totals across all categories.
+    ''',
+    parameters=[
+        OpenApiParameter('district', str, description='Filter by district'),
+        OpenApiParameter('category', str, description='Crime category (default: all categories)'),
+    ]
+)
+class ForecastsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        district = request.query_params.get('district')
+        category = request.query_params.get('category')
+        if category and category not in CrimeCategory.values:
+            return Response(
+                {'error': f'Invalid category. Choose from: {CrimeCategory.values}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            cached('forecasts', lambda: forecasts_data(district, category), district=district, category=category),
+            status=status.HTTP_200_OK
         )
-        result = [
-            {
-                'district':      item['district'],
-                'total':         item['total'],
-                'high_severity': item['high_severity'],
-                'unsolved':      item['unsolved'],
-                'risk_level': (
-                    'critical' if item['high_severity'] >= 5
-                    else 'high'   if item['high_severity'] >= 3
-                    else 'medium' if item['total']        >= 3
-                    else 'low'
-                ),
-            }
-            for item in data
-        ]
-        return Response({'period': period, 'data': result}, status=status.HTTP_200_OK)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -176,15 +241,15 @@ class MonthlyTrendsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        from django.db.models.functions import TruncMonth
+        return Response(cached('monthly', self.build), status=status.HTTP_200_OK)
 
-        since = timezone.now() - timedelta(days=365)
+    def build(self):
+        since = bucket_now() - timedelta(days=365)
         data  = (
-            CrimeReport.objects
-            .filter(date_reported__gte=since)
-            .annotate(month=TruncMonth('date_reported'))
+            daily_stats(since)
+            .annotate(month=TruncMonth('day'))
             .values('month')
-            .annotate(count=Count('id'))
+            .annotate(count=total_crimes())
             .order_by('month')
         )
         result = [
@@ -194,7 +259,7 @@ class MonthlyTrendsView(APIView):
             }
             for item in data
         ]
-        return Response({'data': result}, status=status.HTTP_200_OK)
+        return {'data': result}
 
 
 # ─────────────────────────────────────────────────────────────
@@ -209,25 +274,66 @@ class DailyTrendsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        from django.db.models.functions import TruncDate
+        return Response(cached('daily', self.build), status=status.HTTP_200_OK)
 
-        since = timezone.now() - timedelta(days=30)
+    def build(self):
+        since = bucket_now() - timedelta(days=30)
         data  = (
-            CrimeReport.objects
-            .filter(date_reported__gte=since)
-            .annotate(date=TruncDate('date_reported'))
-            .values('date')
-            .annotate(count=Count('id'))
-            .order_by('date')
+            daily_stats(since)
+            .values('day')
+            .annotate(count=total_crimes())
+            .order_by('day')
         )
         result = [
             {
-                'date':  item['date'].strftime('%Y-%m-%d'),
+                'date':  item['day'].strftime('%Y-%m-%d'),
                 'count': item['count'],
             }
             for item in data
         ]
-        return Response({'data': result}, status=status.HTTP_200_OK)
+        return {'data': result}
+
+
+# ─────────────────────────────────────────────────────────────
+# TRENDS — any range and granularity, zero-filled
+# GET /api/dashboard/trends/?from=2025-01-01&to=2025-03-31&granularity=week
+# ─────────────────────────────────────────────────────────────
+@extend_schema(
+    tags=['📊 Dashboard'],
+    summary='Get a crime count series for any range and granularity',
+    description=f'''
+Returns one entry per bucket between `from` and `to` — buckets without crimes have `count: 0`,
+so charts can plot the series as-is. Weeks start on Monday; `to` dates are inclusive.
+
+Defaults: the last 30 days by day (the last 24 hours for `hour`). At most
+{MAX_TREND_BUCKETS} buckets per request.
+    ''',
+    parameters=[
+        OpenApiParameter('from',        str, description='Start date (YYYY-MM-DD) or ISO datetime'),
+        OpenApiParameter('to',          str, description='End date (inclusive) or ISO datetime'),
+        OpenApiParameter('granularity', str, description='hour, day, week or month (default day)'),
+        OpenApiParameter('category',    str, description='Filter by crime category'),
+        OpenApiParameter('district',    str, description='Filter by district name'),
+        OpenApiParameter('severity',    str, description='Filter by severity'),
+    ]
+)
+class TrendsView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        params = {
+            'raw_from':    request.query_params.get('from'),
+            'raw_to':      request.query_params.get('to'),
+            'granularity': request.query_params.get('granularity', 'day'),
+            'category':    request.query_params.get('category'),
+            'district':    request.query_params.get('district'),
+            'severity':    request.query_params.get('severity'),
+        }
+        try:
+            data = cached('trends', lambda: trend_series(**params), **params)
+        except TrendQueryError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(data, status=status.HTTP_200_OK)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -246,29 +352,13 @@ class CrimesBySeverityView(APIView):
 
     def get(self, request):
         period = request.query_params.get('period', 'all')
-        since  = get_date_range(period)
-        crimes = CrimeReport.objects.all()
-        if since:
-            crimes = crimes.filter(date_reported__gte=since)
-
-        data = crimes.values('severity').annotate(count=Count('id')).order_by('-count')
+        return Response(cached('by-severity', lambda: self.build(period), period=period), status=status.HTTP_200_OK)
 
-        color_map = {
-            'low':      '#16a34a',
-            'medium':   '#f97316',
-            'high':     '#dc2626',
-            'critical': '#7c3aed',
-        }
-        result = [
-            {
-                'severity': item['severity'].title(),
-                'value':    item['severity'],
-                'count':    item['count'],
-                'color':    color_map.get(item['severity'], '#6b7280'),
-            }
-            for item in data
-        ]
-        return Response({'period': period, 'data': result}, status=status.HTTP_200_OK)
+    def build(self, period):
+        since  = get_date_range(period)
+        data   = daily_stats(since).values_list('severity').annotate(count=total_crimes()).order_by('-count')
+        result = severity_rows(data)
+        return {'period': period, 'data': result}
 
 
 # ─────────────────────────────────────────────────────────────
@@ -286,28 +376,8 @@ class RecentCrimesView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        limit   = int(request.query_params.get('limit', 10))
-        reports = (
-            CrimeReport.objects
-            .select_related('reported_by')
-            .order_by('-date_reported')[:limit]
-        )
-        result = [
-            {
-                'id':            r.id,
-                'case_number':   r.case_number,
-                'title':         r.title,
-                'category':      r.category.replace('_', ' ').title(),
-                'severity':      r.severity,
-                'status':        r.status.replace('_', ' ').title(),
-                'district':      r.district,
-                'date_reported': r.date_reported.strftime('%Y-%m-%d %H:%M'),
-                'is_analyzed':   r.is_analyzed,
-                'reported_by':   r.reported_by.full_name if r.reported_by else 'Unknown',
-            }
-            for r in reports
-        ]
-        return Response({'data': result}, status=status.HTTP_200_OK)
+        limit = int(request.query_params.get('limit', 10))
+        return Response(cached('recent', lambda: recent_data(limit), limit=limit), status=status.HTTP_200_OK)
 
 
 # ─────────────────────────────────────────────────────────────
@@ -322,30 +392,63 @@ class AlertsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        alerts = (
-            CrimeReport.objects
-            .filter(
-                severity__in=['high', 'critical'],
-                status__in=['reported', 'under_investigation']
-            )
-            .select_related('reported_by')
-            .order_by('-date_reported')[:10]
+        return Response(cached('alerts', alerts_data), status=status.HTTP_200_OK)
+
+
+# ─────────────────────────────────────────────────────────────
+# LIVE STREAM — Server-Sent Events for the feed and alerts
+# GET /api/dashboard/live/   (Accept: text/event-stream)
+# ─────────────────────────────────────────────────────────────
+@extend_schema(
+    tags=['📊 Dashboard'],
+    summary='Stream new crimes and alerts (Server-Sent Events)',
+    description='''
+Pushes live feed events as they happen instead of polling recent-crimes and alerts:
+
+- `crime` — a new report (same fields as recent-crimes)
+- `alert` — a report became a high/critical open case (same fields as alerts)
+- `alert-resolved` — a report left the alert list
+- `status` — a report changed status (`previous_status` included)
+- `crime-deleted` — `{id, case_number}`
+- `import` — a bulk import chunk landed: `{created, alerts}`
+
+Each event has an `id`; reconnecting with `Last-Event-ID` (EventSource does this automatically)
+replays what was missed. Comment lines are sent as keep-alives, and the stream ends
+after a few minutes so the client reconnects. EventSource can't send headers, so the
+access token may be passed as `?token=`.
+    ''',
+    parameters=[
+        OpenApiParameter('token',         str, description='JWT access token (for EventSource clients)'),
+        OpenApiParameter('last_event_id', int, description='Resume after this event id (alternative to the Last-Event-ID header)'),
+    ]
+)
+class LiveFeedView(APIView):
+    permission_classes     = [IsAuthenticated]
+    authentication_classes = [QueryTokenJWTAuthentication]
+    renderer_classes       = [EventStreamRenderer, JSONRenderer]
+
+    def get(self, request):
+        raw = request.headers.get('Last-Event-ID') or request.query_params.get('last_event_id')
+        try:
+            last_id = int(raw) if raw else None
+        except ValueError:
+            return Response({'error': 'Last-Event-ID must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        events = subscribe(
+            last_id,
+            heartbeat = settings.LIVE_EVENTS_HEARTBEAT_SECONDS,
+            duration  = settings.LIVE_EVENTS_STREAM_SECONDS,
         )
-        result = [
-            {
-                'id':            r.id,
-                'case_number':   r.case_number,
-                'title':         r.title,
-                'category':      r.category.replace('_', ' ').title(),
-                'severity':      r.severity,
-                'status':        r.status.replace('_', ' ').title(),
-                'district':      r.district,
-                'date_reported': r.date_reported.strftime('%Y-%m-%d %H:%M'),
-                'days_open':     (timezone.now() - r.date_reported).days,
-            }
-            for r in alerts
-        ]
-        return Response({'count': len(result), 'data': result}, status=status.HTTP_200_OK)
+        # The stream never queries; don't hold this request's connection open
+        connection.close()
+
+        response = StreamingHttpResponse(
+            chain(['retry: 3000\n\n'], map(format_event, events)),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control']     = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
 
 
 # ─────────────────────────────────────────────────────────────
@@ -360,41 +463,11 @@ class OfficerStatsView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request):
-        officer        = request.user
-        my_reports     = CrimeReport.objects.filter(reported_by=officer)
-        my_analyses    = AnalysisResult.objects.filter(requested_by=officer)
-        my_gen_reports = GeneratedReport.objects.filter(generated_by=officer)
-
-        my_by_status = (
-            my_reports
-            .values('status')
-            .annotate(count=Count('id'))
-        )
-        my_by_category = (
-            my_reports
-            .values('category')
-            .annotate(count=Count('id'))
-            .order_by('-count')[:5]
+        return Response(
+            cached('my-stats', lambda: officer_stats_data(request.user), user=request.user.pk),
+            status=status.HTTP_200_OK
         )
 
-        return Response({
-            'officer': {
-                'name':         officer.full_name,
-                'badge_number': officer.badge_number,
-                'rank':         officer.rank,
-                'station':      officer.station,
-            },
-            'my_crimes': {
-                'total':       my_reports.count(),
-                'by_status':   list(my_by_status),
-                'by_category': list(my_by_category),
-            },
-            'my_activity': {
-                'total_analyses':          my_analyses.count(),
-                'total_reports_generated': my_gen_reports.count(),
-            },
-        }, status=status.HTTP_200_OK)
-
 
 # ──────────────────────────────────────────────────────���──────
 # CATEGORY VS DISTRICT
@@ -414,25 +487,110 @@ class CategoryDistrictView(APIView):
     def get(self, request):
         category = request.query_params.get('category')
         district = request.query_params.get('district')
+        return Response(
+            cached(
+                'category-district', lambda: category_district_data(category, district),
+                category=category, district=district,
+            ),
+            status=status.HTTP_200_OK
+        )
+
 
-        crimes = CrimeReport.objects.all()
-        if category:
-            crimes = crimes.filter(category=category)
-        if district:
-            crimes = crimes.filter(district__icontains=district)
-
-        data = (
-            crimes
-            .values('category', 'district')
-            .annotate(count=Count('id'))
-            .order_by('-count')[:20]
+# ─────────────────────────────────────────────────────────────
+# CATEGORY × DISTRICT MATRIX — the whole heatmap at once
+# ─────────────────────────────────────────────────────────────
+@extend_schema(
+    tags=['📊 Dashboard'],
+    summary='Get the full category × district crime matrix',
+    description='''
+Returns every category (rows) against every district with crimes in the period (columns).
+`counts` is row-major: the cell for `rows[i]`, `columns[j]` is `counts[i * shape[1] + j]`.
+With `normalize=row` or `normalize=column` each cell is its percentage of the row or column total.
+    ''',
+    parameters=[
+        OpenApiParameter('period',    str, description='Filter period: week, month, year, all'),
+        OpenApiParameter('normalize', str, description='none (counts), row or column (percentages)'),
+    ]
+)
+class CategoryDistrictMatrixView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        period    = request.query_params.get('period', 'all')
+        normalize = request.query_params.get('normalize', 'none')
+        if normalize not in MATRIX_NORMALIZATIONS:
+            return Response(
+                {'error': f'Invalid normalize. Choose from: {list(MATRIX_NORMALIZATIONS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return Response(
+            cached(
+                'category-district-matrix', lambda: category_district_matrix(period, normalize),
+                period=period, normalize=normalize,
+            ),
+            status=status.HTTP_200_OK
         )
-        result = [
-            {
-                'category': item['category'].replace('_', ' ').title(),
-                'district': item['district'],
-                'count':    item['count'],
-            }
-            for item in data
-        ]
-        return Response({'data': result}, status=status.HTTP_200_OK)
\ No newline at end of file
+
+
+# ─────────────────────────────────────────────────────────────
+# BUNDLE — several widgets in one request
+# GET /api/dashboard/bundle/?widgets=overview,hotspots&period=month
+# ─────────────────────────────────────────────────────────────
+@extend_schema(
+    tags=['📊 Dashboard'],
+    summary='Get several dashboard widgets in one request',
+    description='''
+Returns the payloads of the requested widgets, each identical to its single-widget endpoint,
+plus per-widget timing. Widgets reading the same rows share one grouped query
+(by-category, by-severity and hotspots; monthly and daily). Independent queries run in order on one
+connection, or concurrently when DASHBOARD_BUNDLE_WORKERS > 1.
+
+**Widgets:** overview, by-category, by-severity, hotspots, monthly, daily, recent, alerts,
+my-stats, category-district (default: all)
+    ''',
+    parameters=[
+        OpenApiParameter('widgets',  str, description='Comma-separated widget names (default: all)'),
+        OpenApiParameter('period',   str, description='Period for by-category, by-severity, hotspots: week, month, year, all'),
+        OpenApiParameter('limit',    int, description='Rows for hotspots and recent (default 10)'),
+        OpenApiParameter('category', str, description='category-district: filter by crime category'),
+        OpenApiParameter('district', str, description='category-district: filter by district name'),
+    ]
+)
+class DashboardBundleView(APIView):
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        started = time.perf_counter()
+        raw     = request.query_params.get('widgets', '')
+        widgets = [w.strip() for w in raw.split(',') if w.strip()] or list(WIDGETS)
+        unknown = [w for w in widgets if w not in WIDGETS]
+        if unknown:
+            return Response(
+                {'error': f'Unknown widgets: {unknown}', 'available': list(WIDGETS)},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            limit = int(request.query_params.get('limit', 10))
+        except ValueError:
+            return Response({'error': 'limit must be an integer.'}, status=status.HTTP_400_BAD_REQUEST)
+
+        ctx = BundleContext(
+            user     = request.user,
+            period   = request.query_params.get('period', 'all'),
+            limit    = limit,
+            category = request.query_params.get('category'),
+            district = request.query_params.get('district'),
+        )
+        payloads, timings, errors = build_bundle(dict.fromkeys(widgets), ctx)
+        total_ms = round((time.perf_counter() - started) * 1000, 2)
+
+        slowest = max(timings, key=lambda w: timings[w]['query_ms'] + timings[w]['build_ms'], default=None)
+        logger.info(f"Dashboard bundle: {len(widgets)} widgets in {total_ms} ms (slowest: {slowest})")
+        return Response({
+            'period':   ctx.period,
+            'widgets':  payloads,
+            'errors':   errors,
+            'timings':  timings,
+            'total_ms': total_ms,
+        }, status=status.HTTP_200_OK)
@@ -0,0 +1,594 @@
+import logging
+import threading
+import time
+import numpy as np
+from collections                import Counter, defaultdict
+from concurrent.futures         import ThreadPoolExecutor
+from datetime                   import timedelta
+from django.conf                import settings
+from django.db                  import close_old_connections, connection
+from django.db.models           import Q
+from django.utils               import timezone
+
+from apps.crimes.aggregates     import breakdowns
+from apps.crimes.models         import CrimeCategory, CrimeReport, CrimeStatus
+from apps.crimes.rollup         import daily_stats, total_crimes
+from apps.analysis.models       import AnalysisResult
+from apps.reports.models        import GeneratedReport
+from apps.accounts.models       import OfficerUser
+from apps.crimes.data_version   import data_version
+from .cache                     import bucket_now, cache_key, get_or_compute_many
+from .hotspots                  import current_scores, risk_level
+from .models                    import CrimeAnomaly, CrimeForecast, HotspotKind
+
+logger = logging.getLogger('apps.dashboard')
+
+
+# ─────────────────────────────────────────────────────────────
+# SHARED CONSTANTS & FORMATTERS
+# ─────────────────────────────────────────────────────────────
+HIGH_SEVERITIES = ['high', 'critical']
+OPEN_STATUSES   = ['reported', 'under_investigation']
+
+SEVERITY_COLORS = {
+    'low':      '#16a34a',
+    'medium':   '#f97316',
+    'high':     '#dc2626',
+    'critical': '#7c3aed',
+}
+
+
+def get_date_range(period):
+    now = bucket_now()
+    if period == 'week':
+        return now - timedelta(days=7)
+    elif period == 'month':
+        return now - timedelta(days=30)
+    elif period == 'year':
+        return now - timedelta(days=365)
+    return None
+
+
+def label(value):
+    return value.replace('_', ' ').title()
+
+
+def feed_item(report):
+    return {
+        'id':            report.id,
+        'case_number':   report.case_number,
+        'title':         report.title,
+        'category':      label(report.category),
+        'severity':      report.severity,
+        'status':        label(report.status),
+        'district':      report.district,
+        'date_reported': report.date_reported.strftime('%Y-%m-%d %H:%M'),
+    }
+
+
+def recent_item(report):
+    return {
+        **feed_item(report),
+        'is_analyzed': report.is_analyzed,
+        'reported_by': report.reported_by.full_name if report.reported_by else 'Unknown',
+    }
+
+
+def is_alert(severity, status):
+    return severity in HIGH_SEVERITIES and status in OPEN_STATUSES
+
+
+def alert_item(report, now=None):
+    now = now or timezone.now()
+    return {**feed_item(report), 'days_open': (now - report.date_reported).days}
+
+
+def category_rows(counts):
+    return [
+        {'category': label(category), 'value': category, 'count': count}
+        for category, count in counts
+    ]
+
+
+def severity_rows(counts):
+    return [
+        {
+            'severity': severity.title(),
+            'value':    severity,
+            'count':    count,
+            'color':    SEVERITY_COLORS.get(severity, '#6b7280'),
+        }
+        for severity, count in counts
+    ]
+
+
+def hotspot_rows(rows, limit):
+    """
+    rows: per-district totals for the period. Ranked by the current
+    time-decayed risk score (see apps.dashboard.hotspots), then total.
+    """
+    scores = current_scores(HotspotKind.DISTRICT)
+
+    def score_of(item):
+        return scores[item['district']][0] if item['district'] in scores else 0.0
+
+    ranked = sorted(rows, key=lambda item: (-score_of(item), -item['total']))[:limit]
+    return [
+        {
+            'district':      item['district'],
+            'total':         item['total'],
+            'high_severity': item['high_severity'],
+            'unsolved':      item['unsolved'],
+            'risk_score':    round(score_of(item), 2),
+            'risk_level':    risk_level(score_of(item)),
+        }
+        for item in ranked
+    ]
+
+
+# ─────────────────────────────────────────────────────────────
+# WIDGET PAYLOADS — the same bodies the single-widget views return
+# ─────────────────────────────────────────────────────────────
+def overview_data():
+    """
+    One aggregate query per table (crime_daily_stats, AnalysisResult,
+    GeneratedReport, OfficerUser) instead of a COUNT per figure.
+    this_week / this_month are the last 7 / 30 calendar days,
+    today included.
+    """
+    today  = timezone.localdate(bucket_now())
+    crimes = daily_stats().aggregate(
+        total               = total_crimes(),
+        this_week           = total_crimes(Q(day__gte=today - timedelta(days=6))),
+        this_month          = total_crimes(Q(day__gte=today - timedelta(days=29))),
+        reported            = total_crimes(Q(status=CrimeStatus.REPORTED)),
+        under_investigation = total_crimes(Q(status=CrimeStatus.UNDER_INVESTIGATION)),
+        solved              = total_crimes(Q(status=CrimeStatus.SOLVED)),
+        cold_cases          = total_crimes(Q(status=CrimeStatus.COLD_CASE)),
+        high_priority       = total_crimes(Q(severity__in=HIGH_SEVERITIES, status__in=OPEN_STATUSES)),
+    )
+    total_analyses = AnalysisResult.objects.filter(status='completed').count()
+    total_reports  = GeneratedReport.objects.count()
+    total_officers = OfficerUser.objects.filter(is_active=True).count()
+
+    total      = crimes['total']
+    solve_rate = round((crimes['solved'] / total * 100), 1) if total > 0 else 0
+
+    return {
+        'crimes': {
+            'total':              total,
+            'this_week':          crimes['this_week'],
+            'this_month':         crimes['this_month'],
+            'high_priority':      crimes['high_priority'],
+            'solve_rate_percent': solve_rate,
+        },
+        'by_status': {
+            'reported':             crimes['reported'],
+            'under_investigation':  crimes['under_investigation'],
+            'solved':               crimes['solved'],
+            'cold_cases':           crimes['cold_cases'],
+        },
+        'system': {
+            'total_analyses':  total_analyses,
+            'total_reports':   total_reports,
+            'active_officers': total_officers,
+        },
+    }
+
+
+def recent_data(limit=10):
+    reports = (
+        CrimeReport.objects
+        .select_related('reported_by')
+        .order_by('-date_reported')[:limit]
+    )
+    return {'data': [recent_item(r) for r in reports]}
+
+
+def alerts_data():
+    now    = bucket_now()
+    alerts = (
+        CrimeReport.objects
+        .filter(severity__in=HIGH_SEVERITIES, status__in=OPEN_STATUSES)
+        .order_by('-date_reported')[:10]
+    )
+    result = [alert_item(r, now) for r in alerts]
+    return {'count': len(result), 'data': result}
+
+
+def officer_stats_data(officer):
+    # Status and category breakdowns (and the total) in one pass
+    mine = breakdowns(CrimeReport.objects.filter(reported_by=officer), ['status', 'category'])
+    return {
+        'officer': {
+            'name':         officer.full_name,
+            'badge_number': officer.badge_number,
+            'rank':         officer.rank,
+            'station':      officer.station,
+        },
+        'my_crimes': {
+            'total':       mine['total'],
+            'by_status':   mine['status'],
+            'by_category': mine['category'][:5],
+        },
+        'my_activity': {
+            'total_analyses':          AnalysisResult.objects.filter(requested_by=officer).count(),
+            'total_reports_generated': GeneratedReport.objects.filter(generated_by=officer).count(),
+        },
+    }
+
+
+def category_district_data(category=None, district=None):
+    stats = daily_stats()
+    if category:
+        stats = stats.filter(category=category)
+    if district:
+        stats = stats.filter(district__icontains=district)
+    data = stats.values('category', 'district').annotate(count=total_crimes()).order_by('-count')[:20]
+    return {'data': [
+        {'category': label(item['category']), 'district': item['district'], 'count': item['count']}
+        for item in data
+    ]}
+
+
+def grid_hotspots_data(limit=50):
+    # Lat/long grid cells by current risk score (crimes with coordinates only)
+    scores = sorted(current_scores(HotspotKind.GRID).values(), key=lambda pair: -pair[0])[:limit]
+    return {'data': [
+        {
+            'cell':          stored.key,
+            'latitude':      stored.latitude,
+            'longitude':     stored.longitude,
+            'crime_count':   stored.crime_count,
+            'high_severity': stored.high_severity,
+            'unsolved':      stored.unsolved,
+            'last_crime_at': stored.last_crime_at.strftime('%Y-%m-%d %H:%M') if stored.last_crime_at else None,
+            'risk_score':    round(score, 2),
+            'risk_level':    risk_level(score),
+        }
+        for score, stored in scores
+    ]}
+
+
+def anomalies_data(days=7, district=None, category=None, limit=50):
+    # Flagged district × category spikes, latest and strongest first
+    since = timezone.localdate() - timedelta(days=days - 1)
+    rows  = CrimeAnomaly.objects.filter(day__gte=since)
+    if district:
+        rows = rows.filter(district__iexact=district)
+    if category:
+        rows = rows.filter(category=category)
+    return {'days': days, 'data': [
+        {
+            'district':       anomaly.district,
+            'category':       anomaly.category,
+            'category_label': label(anomaly.category),
+            'day':            anomaly.day.isoformat(),
+            'observed':       anomaly.observed,
+            'expected':       anomaly.expected,
+            'z_score':        anomaly.z_score,
+        }
+        for anomaly in rows[:limit]
+    ]}
+
+
+def forecasts_data(district=None, category=None):
+    # Stored weekly forecasts; without a category, district totals
+    rows = CrimeForecast.objects.filter(category=category or '')
+    if district:
+        rows = rows.filter(district__iexact=district)
+    rows = list(rows)
+    return {
+        'fitted_at': rows[0].fitted_at.strftime('%Y-%m-%d %H:%M') if rows else None,
+        'data': [
+            {
+                'district':     forecast.district,
+                'category':     forecast.category or None,
+                'week_start':   forecast.week_start.isoformat(),
+                'horizon':      forecast.horizon,
+                'expected':     forecast.expected,
+                'lower':        forecast.lower,
+                'upper':        forecast.upper,
+                'method':       forecast.method,
+                'backtest_mae': forecast.backtest_mae,
+            }
+            for forecast in rows
+        ],
+    }
+
+
+MATRIX_NORMALIZATIONS = ('none', 'row', 'column')
+
+
+def category_district_matrix(period='all', normalize='none'):
+    """
+    The full category × district matrix from one grouped query:
+    every category as a row (zeros included), every district with
+    crimes in the period as a column, counts row-major. 'row' and
+    'column' normalization give each cell's share (%) of its row or
+    column total.
+    """
+    rows = list(
+        daily_stats(get_date_range(period))
+        .values_list('category', 'district')
+        .annotate(count=total_crimes())
+        .order_by()
+    )
+    categories = list(CrimeCategory.values)
+    categories += sorted({category for category, _, _ in rows} - set(categories))
+    row_index  = {category: i for i, category in enumerate(categories)}
+    districts, column_index = np.unique(
+        np.array([district for _, district, _ in rows], dtype=object), return_inverse=True
+    )
+
+    shape  = (len(categories), len(districts))
+    cells  = np.fromiter((row_index[category] for category, _, _ in rows), dtype=np.int64, count=len(rows))
+    counts = np.fromiter((count for _, _, count in rows), dtype=np.int64, count=len(rows))
+    matrix = np.bincount(
+        cells * shape[1] + column_index.astype(np.int64), weights=counts, minlength=shape[0] * shape[1]
+    ).astype(np.int64).reshape(shape)
+
+    row_totals    = matrix.sum(axis=1)
+    column_totals = matrix.sum(axis=0)
+    values        = matrix
+    if normalize in ('row', 'column'):
+        totals = row_totals[:, None] if normalize == 'row' else column_totals[None, :]
+        values = np.divide(matrix * 100.0, totals, out=np.zeros(shape), where=totals > 0).round(2)
+
+    return {
+        'period':        period,
+        'normalize':     normalize,
+        'shape':         list(shape),
+        'rows':          categories,
+        'row_labels':    [label(category) for category in categories],
+        'columns':       districts.tolist(),
+        'counts':        values.ravel().tolist(),
+        'row_totals':    row_totals.tolist(),
+        'column_totals': column_totals.tolist(),
+        'total':         int(matrix.sum()),
+    }
+
+
+# ─────────────────────────────────────────────────────────────
+# BUNDLE — several widgets in one request
+# Widgets that read the same rows share one grouped query
+# ("source"); independent sources run concurrently.
+# ─────────────────────────────────────────────────────────────
+class BundleContext:
+
+    def __init__(self, user, period='all', limit=10, category=None, district=None):
+        self.user     = user
+        self.period   = period
+        self.since    = get_date_range(period)
+        self.limit    = limit
+        self.category = category
+        self.district = district
+
+
+# ── Sources ──────────────────────────────────────────────────
+def breakdown_source(ctx):
+    # One GROUP BY feeds by-category, by-severity and hotspots
+    return list(
+        daily_stats(ctx.since)
+        .values('category', 'severity', 'district', 'status')
+        .annotate(count=total_crimes())
+        .order_by()
+    )
+
+
+def timeline_source(ctx):
+    # One daily series for the last year feeds monthly and daily
+    return list(
+        daily_stats(bucket_now() - timedelta(days=365))
+        .values('day')
+        .annotate(count=total_crimes())
+        .order_by('day')
+    )
+
+
+# ── Builders over shared sources ─────────────────────────────
+def build_by_category(rows, ctx):
+    counts = Counter()
+    for row in rows:
+        counts[row['category']] += row['count']
+    return {'period': ctx.period, 'data': category_rows(counts.most_common())}
+
+
+def build_by_severity(rows, ctx):
+    counts = Counter()
+    for row in rows:
+        counts[row['severity']] += row['count']
+    return {'period': ctx.period, 'data': severity_rows(counts.most_common())}
+
+
+def build_hotspots(rows, ctx):
+    districts = defaultdict(lambda: {'total': 0, 'high_severity': 0, 'unsolved': 0})
+    for row in rows:
+        item = districts[row['district']]
+        item['total'] += row['count']
+        if row['severity'] in HIGH_SEVERITIES:
+            item['high_severity'] += row['count']
+        if row['status'] in OPEN_STATUSES:
+            item['unsolved'] += row['count']
+    rows = [{'district': name, **item} for name, item in districts.items()]
+    return {'period': ctx.period, 'data': hotspot_rows(rows, ctx.limit)}
+
+
+def build_monthly(days, ctx):
+    months = Counter()
+    for day in days:
+        months[day['day'].replace(day=1)] += day['count']
+    return {'data': [
+        {'month': month.strftime('%b %Y'), 'count': count}
+        for month, count in sorted(months.items())
+    ]}
+
+
+def build_daily(days, ctx):
+    since = timezone.localdate(bucket_now() - timedelta(days=30))
+    return {'data': [
+        {'date': day['day'].strftime('%Y-%m-%d'), 'count': day['count']}
+        for day in days if day['day'] >= since
+    ]}
+
+
+# ── Registry: widget → (source, builder) ─────────────────────
+SOURCES = {
+    'breakdown':         breakdown_source,
+    'timeline':          timeline_source,
+    'overview':          lambda ctx: overview_data(),
+    'recent':            lambda ctx: recent_data(ctx.limit),
+    'alerts':            lambda ctx: alerts_data(),
+    'my-stats':          lambda ctx: officer_stats_data(ctx.user),
+    'category-district': lambda ctx: category_district_data(ctx.category, ctx.district),
+}
+
+
+def passthrough(data, ctx):
+    return data
+
+
+WIDGETS = {
+    'overview':          ('overview',          passthrough),
+    'by-category':       ('breakdown',         build_by_category),
+    'by-severity':       ('breakdown',         build_by_severity),
+    'hotspots':          ('breakdown',         build_hotspots),
+    'monthly':           ('timeline',          build_monthly),
+    'daily':             ('timeline',          build_daily),
+    'recent':            ('recent',            passthrough),
+    'alerts':            ('alerts',            passthrough),
+    'my-stats':          ('my-stats',          passthrough),
+    'category-district': ('category-district', passthrough),
+}
+
+
+# Request parameters each widget's payload depends on — its cache key
+WIDGET_PARAMS = {
+    'overview':          (),
+    'by-category':       ('period',),
+    'by-severity':       ('period',),
+    'hotspots':          ('period', 'limit'),
+    'monthly':           (),
+    'daily':             (),
+    'recent':            ('limit',),
+    'alerts':            (),
+    'my-stats':          ('user',),
+    'category-district': ('category', 'district'),
+}
+
+
+def widget_params(widget, ctx):
+    params = {name: getattr(ctx, name) for name in WIDGET_PARAMS[widget]}
+    if 'user' in params:
+        params['user'] = params['user'].pk
+    return params
+
+
+def run_source(source, widgets, ctx):
+    """
+    Runs one source query and every widget built from it.
+    Returns (source ms, {widget: payload}, {widget: ms}, {widget: error}).
+    """
+    payloads, timings, errors = {}, {}, {}
+    started = time.perf_counter()
+    try:
+        data = SOURCES[source](ctx)
+    except Exception as e:
+        logger.error(f"Dashboard bundle source '{source}' failed: {e}")
+        return round((time.perf_counter() - started) * 1000, 2), {}, {}, {w: str(e) for w in widgets}
+    source_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    for widget in widgets:
+        started = time.perf_counter()
+        try:
+            payloads[widget] = WIDGETS[widget][1](data, ctx)
+        except Exception as e:
+            logger.error(f"Dashboard bundle widget '{widget}' failed: {e}")
+            errors[widget] = str(e)
+        timings[widget] = round((time.perf_counter() - started) * 1000, 2)
+    return source_ms, payloads, timings, errors
+
+
+def run_source_cached(source, widgets, ctx, version):
+    """
+    run_source() for only the widgets missing from the cache.
+    Adds the set of widgets served from cache to its result.
+    """
+    keys = {widget: cache_key(widget, version, **widget_params(widget, ctx)) for widget in widgets}
+    runs = []
+
+    def compute(missing):
+        runs.append((missing, run_source(source, missing, ctx)))
+        return runs[-1][1][1]
+
+    payloads = get_or_compute_many(keys, compute)
+    if not runs:
+        return 0.0, payloads, {}, {}, set(widgets)
+    missing, (source_ms, _, timings, errors) = runs[-1]
+    return source_ms, payloads, timings, errors, set(widgets) - set(missing)
+
+
+# ── Optional worker threads (DASHBOARD_BUNDLE_WORKERS > 1) ───
+# One long-lived pool per process. Each worker thread keeps its
+# own connection between requests (CONN_MAX_AGE applies, as for
+# request threads), so threading adds at most that many
+# connections per process rather than new ones per request.
+_pool_lock  = threading.Lock()
+_pool_cache = {'workers': 0, 'pool': None}
+
+
+def bundle_pool():
+    workers = settings.DASHBOARD_BUNDLE_WORKERS
+    with _pool_lock:
+        if _pool_cache['workers'] != workers:
+            # Running tasks finish on the old pool
+            if _pool_cache['pool']:
+                _pool_cache['pool'].shutdown(wait=False)
+            _pool_cache.update(
+                workers = workers,
+                pool    = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dashboard-bundle'),
+            )
+        return _pool_cache['pool']
+
+
+def run_source_in_thread(source, widgets, ctx, version):
+    # Same connection housekeeping as a request: drop only
+    # connections that are broken or past CONN_MAX_AGE
+    close_old_connections()
+    try:
+        return run_source_cached(source, widgets, ctx, version)
+    finally:
+        close_old_connections()
+
+
+def build_bundle(widgets, ctx):
+    groups = defaultdict(list)
+    for widget in widgets:
+        groups[WIDGETS[widget][0]].append(widget)
+
+    # Sequential on the request's own connection by default.
+    # SQLite serializes access (and test databases are per-connection)
+    version = data_version()
+    if settings.DASHBOARD_BUNDLE_WORKERS > 1 and len(groups) > 1 and connection.vendor != 'sqlite':
+        pool    = bundle_pool()
+        futures = {
+            source: pool.submit(run_source_in_thread, source, members, ctx, version)
+            for source, members in groups.items()
+        }
+        results = {source: future.result() for source, future in futures.items()}
+    else:
+        results = {source: run_source_cached(source, members, ctx, version) for source, members in groups.items()}
+
+    payloads, timings, errors = {}, {}, {}
+    for source, (source_ms, source_payloads, widget_ms, source_errors, hits) in results.items():
+        payloads.update(source_payloads)
+        errors.update(source_errors)
+        for widget in groups[source]:
+            timings[widget] = {
+                'query':     source,
+                'query_ms':  source_ms,
+                'build_ms':  widget_ms.get(widget, 0.0),
+                'shared':    len(groups[source]) > 1,
+                'cached':    widget in hits,
+            }
+    return payloads, timings, errors
@@ -1,4 +1,6 @@
-import api from './axios';
+import api, { refreshAccessToken } from './axios';
+
+const BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
 
 const analysisApi = {
 
@@ -14,6 +16,41 @@ const analysisApi = {
             ...(sessionId && { session_id: sessionId }),
         }),
 
+    // Streamed chat (SSE over POST): onEvent(event, data) for
+    // start / tool / token / done / error; resolves when the stream ends.
+    // fetch() bypasses the axios interceptor, so a 401 refreshes the
+    // token here and retries once.
+    chatStream: async (message, sessionId = null, onEvent = () => {}) => {
+        const send = (token) => fetch(`${BASE_URL}/api/analysis/chat/stream/`, {
+            method:  'POST',
+            headers: {
+                'Content-Type':  'application/json',
+                'Accept':        'text/event-stream',
+                'Authorization': `Bearer ${token || ''}`,
+            },
+            body: JSON.stringify({ message, ...(sessionId && { session_id: sessionId }) }),
+        });
+        let res = await send(localStorage.getItem('access_token'));
+        if (res.status === 401) res = await send(await refreshAccessToken());
+        if (!res.ok) throw new Error((await res.json().catch(() => ({}))).error || 'Agent failed to respond.');
+
+        const reader  = res.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer    = '';
+        for (;;) {
+            const { value, done } = await reader.read();
+            if (done) break;
+            buffer += decoder.decode(value, { stream: true });
+            const frames = buffer.split('\n\n');
+            buffer = frames.pop();
+            for (const frame of frames) {
+                const event = frame.match(/^event: (.*)$/m)?.[1];
+                const data  = frame.match(/^data: (.*)$/m)?.[1];
+                if (event && data) onEvent(event, JSON.parse(data));
+            }
+        }
+    },
+
     getChatHistory: (sessionId) =>
         api.get(`/api/analysis/chat/${sessionId}/`),
 
@@ -22,6 +59,25 @@ const analysisApi = {
 
     getResultById: (id) =>
         api.get(`/api/analysis/results/${id}/`),
+
+    // Analyses run in the background (202); poll until finished.
+    // Gives up if no worker picks the job up within queuedMs, or if
+    // it has not finished within timeoutMs — the result still shows
+    // up under results if it completes later.
+    waitForResult: async (id, { intervalMs = 2000, queuedMs = 60 * 1000, timeoutMs = 5 * 60 * 1000 } = {}) => {
+        const started = Date.now();
+        for (;;) {
+            const res     = await api.get(`/api/analysis/results/${id}/`);
+            const elapsed = Date.now() - started;
+            if (res.data.status === 'completed') return res.data;
+            if (res.data.status === 'failed') throw new Error(res.data.error_message || 'Analysis failed.');
+            if (res.data.status === 'pending' && elapsed >= queuedMs)
+                throw new Error('Analysis is still queued — no worker has picked it up yet. Check the results list later.');
+            if (elapsed >= timeoutMs)
+                throw new Error('Analysis timed out waiting for a result. Check the results list later.');
+            await new Promise((resolve) => setTimeout(resolve, intervalMs));
+        }
+    },
 };
 
 export default analysisApi;
\ No newline at end of file
@@ -26,6 +26,33 @@ api.interceptors.request.use(
     (error) => Promise.reject(error)
 );
 
+// ─────────────────────────────────────────────────────────────
+// TOKEN REFRESH — shared by the interceptor and fetch() callers
+// Concurrent 401s wait on one refresh: refresh tokens rotate and
+// the old one is blacklisted, so a second refresh would fail.
+// ─────────────────────────────────────────────────────────────
+let refreshing = null;
+
+export const refreshAccessToken = () => {
+    if (refreshing) return refreshing;
+    refreshing = axios.post(
+        `${BASE_URL}/api/auth/token/refresh/`,
+        { refresh: localStorage.getItem('refresh_token') }
+    ).then((response) => {
+        localStorage.setItem('access_token', response.data.access);
+        if (response.data.refresh) localStorage.setItem('refresh_token', response.data.refresh);
+        return response.data.access;
+    }).catch((refreshError) => {
+        // Refresh failed — clear storage and redirect to login
+        localStorage.clear();
+        window.location.href = '/login';
+        throw refreshError;
+    }).finally(() => {
+        refreshing = null;
+    });
+    return refreshing;
+};
+
 // ─────────────────────────────────────────────────────────────
 // RESPONSE INTERCEPTOR — Auto refresh token on 401
 // ─────────────────────────────────────────────────────────────
@@ -37,24 +64,9 @@ api.interceptors.response.use(
         if (error.response?.status === 401 && !originalRequest._retry) {
             originalRequest._retry = true;
 
-            try {
-                const refreshToken = localStorage.getItem('refresh_token');
-                const response     = await axios.post(
-                    `${BASE_URL}/api/auth/token/refresh/`,
-                    { refresh: refreshToken }
-                );
-
-                const newAccessToken = response.data.access;
-                localStorage.setItem('access_token', newAccessToken);
-                originalRequest.headers.Authorization = `Bearer ${newAccessToken}`;
-
-                return api(originalRequest);
-            } catch (refreshError) {
-                // Refresh failed — clear storage and redirect to login
-                localStorage.clear();
-                window.location.href = '/login';
-                return Promise.reject(refreshError);
-            }
+            const newAccessToken = await refreshAccessToken();
+            originalRequest.headers.Authorization = `Bearer ${newAccessToken}`;
+            return api(originalRequest);
         }
 
         return Promise.reject(error);
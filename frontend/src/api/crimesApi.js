@@ -17,8 +17,10 @@ const crimesApi = {
     delete: (id) =>
         api.delete(`/api/crimes/${id}/`),
 
-    getMyReports: () =>
-        api.get('/api/crimes/my-reports/'),
+    // Cursor-paged like getAll: pass { cursor } from the previous
+    // page's `next`, and { with_count: 1 } for the total
+    getMyReports: (params = {}) =>
+        api.get('/api/crimes/my-reports/', { params }),
 
     getStats: () =>
         api.get('/api/crimes/stats/'),
@@ -1,7 +1,14 @@
 import api from './axios';
 
+const BASE_URL = import.meta.env.VITE_API_URL || 'http://localhost:8000';
+
 const dashboardApi = {
 
+    // Several widgets in one request; response.data.widgets[name]
+    // holds the same payload as the matching single-widget call.
+    getBundle: (widgets = [], params = {}) =>
+        api.get('/api/dashboard/bundle/', { params: { widgets: widgets.join(','), ...params } }),
+
     getOverview: () =>
         api.get('/api/dashboard/overview/'),
 
@@ -20,17 +27,41 @@ const dashboardApi = {
     getDailyTrends: () =>
         api.get('/api/dashboard/trends/daily/'),
 
+    // Dense series: { from, to, granularity: hour|day|week|month,
+    // category, district, severity } → data[{ bucket, label, count }]
+    getTrends: (params = {}) =>
+        api.get('/api/dashboard/trends/', { params }),
+
     getRecentCrimes: (limit = 10) =>
         api.get('/api/dashboard/recent-crimes/', { params: { limit } }),
 
     getAlerts: () =>
         api.get('/api/dashboard/alerts/'),
 
+    // Server-Sent Events: crime, alert, alert-resolved, status,
+    // crime-deleted, import. EventSource can't send headers, so the
+    // token goes in the query string; it resumes via Last-Event-ID.
+    openLiveFeed: () =>
+        new EventSource(
+            `${BASE_URL}/api/dashboard/live/?token=${encodeURIComponent(localStorage.getItem('access_token') || '')}`
+        ),
+
     getMyStats: () =>
         api.get('/api/dashboard/my-stats/'),
 
     getCategoryDistrict: (params = {}) =>
         api.get('/api/dashboard/category-district/', { params }),
+
+    // Full heatmap: { rows, columns, shape, counts (row-major) };
+    // params: { period, normalize: none|row|column }
+    getCategoryDistrictMatrix: (params = {}) =>
+        api.get('/api/dashboard/category-district/matrix/', { params }),
+
+    getAnomalies: (params = {}) =>
+        api.get('/api/dashboard/anomalies/', { params }),
+
+    getForecasts: (params = {}) =>
+        api.get('/api/dashboard/forecasts/', { params }),
 };
 
 export default dashboardApi;
\ No newline at end of file
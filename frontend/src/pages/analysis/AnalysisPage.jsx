@@ -34,12 +34,13 @@ const AnalysisPage = () => {
     const handleGeneral = async () => {
         setRunning(true);
         try {
-            const res = await analysisApi.generalAnalysis(prompt);
+            const res      = await analysisApi.generalAnalysis(prompt);
+            const analysis = await analysisApi.waitForResult(res.data.analysis.id);
             toast.success('General analysis completed!');
-            setSelected(res.data.analysis);
+            setSelected(analysis);
             await fetchResults();
-        } catch {
-            toast.error('Analysis failed. Check your Gemini API key.');
+        } catch (err) {
+            toast.error(err.response?.data?.error || err.message || 'Analysis failed. Check your Gemini API key.');
         } finally {
             setRunning(false);
         }
@@ -49,12 +50,13 @@ const AnalysisPage = () => {
         if (!caseNo.trim()) { toast.error('Please enter a case number.'); return; }
         setRunning(true);
         try {
-            const res = await analysisApi.analyzeReport(caseNo.trim());
+            const res      = await analysisApi.analyzeReport(caseNo.trim());
+            const analysis = await analysisApi.waitForResult(res.data.analysis.id);
             toast.success('Case analysis completed!');
-            setSelected(res.data.analysis);
+            setSelected(analysis);
             await fetchResults();
         } catch (err) {
-            toast.error(err.response?.data?.error || 'Analysis failed.');
+            toast.error(err.response?.data?.error || err.message || 'Analysis failed.');
         } finally {
             setRunning(false);
         }
@@ -8,6 +8,7 @@ const ChatPage = () => {
     const [input,     setInput]     = useState('');
     const [loading,   setLoading]   = useState(false);
     const [sessionId, setSessionId] = useState(null);
+    const [progress,  setProgress]  = useState(null);
     const bottomRef                 = useRef(null);
 
     useEffect(() => {
@@ -23,17 +24,32 @@ const ChatPage = () => {
         setInput('');
         setLoading(true);
 
+        const replyId = Date.now() + 1;
+        let   failed  = null;
         try {
-            const res = await analysisApi.chat(text, sessionId);
-            if (!sessionId) setSessionId(res.data.session_id);
-            setMessages((prev) => [...prev, {
-                role: 'assistant', content: res.data.response, id: Date.now() + 1,
-            }]);
-        } catch {
-            toast.error('Agent failed to respond. Check your Gemini API key.');
-            setMessages((prev) => prev.filter((m) => m.id !== userMsg.id));
+            await analysisApi.chatStream(text, sessionId, (event, data) => {
+                if (event === 'start' && !sessionId) setSessionId(data.session_id);
+                if (event === 'tool') setProgress(data.label);
+                if (event === 'token') {
+                    setProgress(null);
+                    setMessages((prev) => prev.some((m) => m.id === replyId)
+                        ? prev.map((m) => m.id === replyId ? { ...m, content: m.content + data.text } : m)
+                        : [...prev, { role: 'assistant', content: data.text, id: replyId }]);
+                }
+                if (event === 'done') {
+                    setMessages((prev) => prev.some((m) => m.id === replyId)
+                        ? prev.map((m) => m.id === replyId ? { ...m, content: data.response } : m)
+                        : [...prev, { role: 'assistant', content: data.response, id: replyId }]);
+                }
+                if (event === 'error') failed = data.error;
+            });
+            if (failed) throw new Error(failed);
+        } catch (err) {
+            toast.error(err.message || 'Agent failed to respond. Check your Groq API key.');
+            setMessages((prev) => prev.filter((m) => m.id !== userMsg.id && m.id !== replyId));
         } finally {
             setLoading(false);
+            setProgress(null);
         }
     };
 
@@ -155,7 +171,7 @@ const ChatPage = () => {
                         ))}
 
                         {/* Typing indicator */}
-                        {loading && (
+                        {loading && messages[messages.length - 1]?.role !== 'assistant' && (
                             <div className="flex items-end gap-2.5">
                                 <div className="w-8 h-8 rounded-full bg-[#0f2744] flex items-center justify-center flex-shrink-0">
                                     <Bot size={16} className="text-blue-300" />
@@ -168,6 +184,7 @@ const ChatPage = () => {
                                             style={{ animationDelay: `${i * 0.15}s` }}
                                         />
                                     ))}
+                                    {progress && <span className="ml-2 text-xs text-slate-500">{progress}</span>}
                                 </div>
                             </div>
                         )}
@@ -38,12 +38,13 @@ const CrimeDetailPage = () => {
     const handleAnalyze = async () => {
         setAnalyzing(true);
         try {
-            await analysisApi.analyzeReport(crime.case_number);
+            const queued = await analysisApi.analyzeReport(crime.case_number);
+            await analysisApi.waitForResult(queued.data.analysis.id);
             toast.success('AI analysis completed!');
             const res = await crimesApi.getById(id);
             setCrime(res.data);
-        } catch {
-            toast.error('Analysis failed. Check your Gemini API key.');
+        } catch (err) {
+            toast.error(err.response?.data?.error || err.message || 'Analysis failed. Check your Gemini API key.');
         } finally {
             setAnalyzing(false);
         }
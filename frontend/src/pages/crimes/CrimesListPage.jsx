@@ -1,7 +1,7 @@
 import { useState, useEffect } from 'react';
 import { useNavigate }         from 'react-router-dom';
 import toast                   from 'react-hot-toast';
-import { ShieldAlert, Plus, Search, Filter, RotateCcw, Eye } from 'lucide-react';
+import { ShieldAlert, Plus, Search, Filter, RotateCcw, Eye, ChevronDown } from 'lucide-react';
 import crimesApi      from '../../api/crimesApi';
 import LoadingSpinner from '../../components/common/LoadingSpinner';
 import { getSeverityColor, getStatusColor, capitalize, truncate } from '../../utils/helpers';
@@ -12,23 +12,31 @@ const SEVERITIES = ['','low','medium','high','critical'];
 
 const CrimesListPage = () => {
     const navigate = useNavigate();
-    const [crimes,  setCrimes]  = useState([]);
-    const [loading, setLoading] = useState(true);
+    const [crimes,      setCrimes]      = useState([]);
+    const [count,       setCount]       = useState(null);
+    const [nextCursor,  setNextCursor]  = useState(null);
+    const [loading,     setLoading]     = useState(true);
+    const [loadingMore, setLoadingMore] = useState(false);
     const [filters, setFilters] = useState({ category: '', status: '', severity: '', district: '', search: '' });
 
-    const fetchCrimes = async () => {
-        setLoading(true);
+    // First page asks for the total; later pages follow the `next` cursor
+    const fetchCrimes = async (cursor = null) => {
+        cursor ? setLoadingMore(true) : setLoading(true);
         try {
             const params = Object.fromEntries(Object.entries(filters).filter(([, v]) => v));
-            const res    = await crimesApi.getAll(params);
-            setCrimes(res.data.results);
+            const res    = await crimesApi.getAll(cursor ? { ...params, cursor } : { ...params, with_count: 1 });
+            setCrimes((prev) => cursor ? [...prev, ...res.data.results] : res.data.results);
+            setNextCursor(res.data.next);
+            if (!cursor) setCount(res.data.count);
         } catch {
             toast.error('Failed to load crime reports.');
         } finally {
-            setLoading(false);
+            cursor ? setLoadingMore(false) : setLoading(false);
         }
     };
 
+    const total = count ?? crimes.length;
+
     useEffect(() => { fetchCrimes(); }, []);
 
     const handleFilter = (e) =>
@@ -99,7 +107,7 @@ const CrimesListPage = () => {
                 />
 
                 <button
-                    onClick={fetchCrimes}
+                    onClick={() => fetchCrimes()}
                     className="flex items-center gap-1.5 px-4 py-2 bg-blue-600 hover:bg-blue-700 text-white rounded-lg text-sm font-semibold transition"
                 >
                     <Filter size={13} /> Apply
@@ -116,7 +124,8 @@ const CrimesListPage = () => {
             {loading ? <LoadingSpinner /> : (
                 <div className="bg-white rounded-2xl border border-slate-100 shadow-sm overflow-hidden">
                     <div className="px-5 py-3 border-b border-slate-100 text-xs text-slate-400 font-medium">
-                        {crimes.length} report{crimes.length !== 1 ? 's' : ''} found
+                        {total} report{total !== 1 ? 's' : ''} found
+                        {crimes.length < total && ` · showing ${crimes.length}`}
                     </div>
                     <div className="overflow-x-auto">
                         <table className="w-full border-collapse">
@@ -187,6 +196,17 @@ const CrimesListPage = () => {
                             </tbody>
                         </table>
                     </div>
+                    {nextCursor && (
+                        <div className="px-5 py-3 border-t border-slate-100 flex justify-center">
+                            <button
+                                onClick={() => fetchCrimes(nextCursor)}
+                                disabled={loadingMore}
+                                className="flex items-center gap-1.5 px-4 py-2 bg-slate-100 hover:bg-slate-200 text-slate-600 rounded-lg text-sm font-medium transition disabled:opacity-50"
+                            >
+                                <ChevronDown size={13} /> {loadingMore ? 'Loading...' : 'Load more'}
+                            </button>
+                        </div>
+                    )}
                 </div>
             )}
         </div>
@@ -6,7 +6,15 @@ import {
     CheckCircle2, XCircle, SkipForward, Rows3,
     Loader2, ShieldAlert, BarChart3,
 } from 'lucide-react';
-import api from '../../api/axios';
+import api         from '../../api/axios';
+import analysisApi from '../../api/analysisApi';
+
+const SUPPORTED_EXTENSIONS = [
+    '.csv', '.csv.gz', '.csv.zst',
+    '.ndjson', '.ndjson.gz', '.ndjson.zst',
+    '.jsonl', '.jsonl.gz', '.jsonl.zst',
+    '.zip', '.xlsx', '.xls',
+];
 
 const UploadCrimesPage = () => {
     const navigate = useNavigate();
@@ -19,9 +27,9 @@ const UploadCrimesPage = () => {
 
     const handleFile = (selectedFile) => {
         if (!selectedFile) return;
-        const ext = selectedFile.name.split('.').pop().toLowerCase();
-        if (!['csv', 'xlsx', 'xls'].includes(ext)) {
-            toast.error('Only CSV and Excel files are supported.');
+        const name = selectedFile.name.toLowerCase();
+        if (!SUPPORTED_EXTENSIONS.some((ext) => name.endsWith(ext))) {
+            toast.error('Supported files: CSV, NDJSON, .gz/.zst, .zip and Excel.');
             return;
         }
         setFile(selectedFile);
@@ -38,8 +46,13 @@ const UploadCrimesPage = () => {
             const res = await api.post('/api/crimes/upload/', formData, {
                 headers: { 'Content-Type': 'multipart/form-data' },
             });
-            setResult(res.data);
-            toast.success(`${res.data.summary.created} crimes imported!`);
+            const job = await waitForImport(res.data.job.id);
+            setResult(job);
+            if (job.status === 'completed') {
+                toast.success(`${job.summary.created} crimes imported!`);
+            } else {
+                toast.error(job.error_message || `Import ${job.status}.`);
+            }
         } catch (err) {
             toast.error(err.response?.data?.error || 'Upload failed.');
         } finally {
@@ -47,6 +60,16 @@ const UploadCrimesPage = () => {
         }
     };
 
+    // Imports run in the background — poll the job until it finishes
+    const waitForImport = async (jobId) => {
+        const finished = ['completed', 'failed', 'cancelled'];
+        for (;;) {
+            const res = await api.get(`/api/crimes/upload/jobs/${jobId}/`);
+            if (finished.includes(res.data.status)) return res.data;
+            await new Promise((resolve) => setTimeout(resolve, 1500));
+        }
+    };
+
     const handleAnalyzeAll = async () => {
         setAnalyzing(true);
         setAnalysis(null);
@@ -54,10 +77,11 @@ const UploadCrimesPage = () => {
             const res = await api.post('/api/analysis/general/', {
                 prompt: `I just uploaded ${result?.summary?.created} new crime records. Please analyze ALL crime data in the database and provide: 1. Key patterns and trends 2. Most dangerous districts 3. Most common crime types 4. High priority cases needing attention 5. Recommendations for police deployment`
             });
-            setAnalysis(res.data.analysis.ai_summary);
+            const done = await analysisApi.waitForResult(res.data.analysis.id);
+            setAnalysis(done.ai_summary);
             toast.success('AI analysis complete!');
-        } catch {
-            toast.error('Analysis failed. Try again.');
+        } catch (err) {
+            toast.error(err.response?.data?.error || err.message || 'Analysis failed. Try again.');
         } finally {
             setAnalyzing(false);
         }
@@ -126,7 +150,9 @@ const UploadCrimesPage = () => {
                             <h3 className="text-sm font-bold text-[#0f2744]">Select File</h3>
                         </div>
                         <p className="text-xs text-slate-500">
-                            Supports <strong>CSV</strong> and <strong>Excel (.xlsx)</strong> files.
+                            Supports <strong>CSV</strong>, <strong>NDJSON</strong>, compressed
+                            (<strong>.gz</strong>, <strong>.zst</strong>) and <strong>.zip</strong> archives
+                            of those, and <strong>Excel (.xlsx)</strong> files.
                             Download the template above to see the correct format.
                         </p>
 
@@ -168,7 +194,7 @@ const UploadCrimesPage = () => {
                         <input
                             id="fileInput"
                             type="file"
-                            accept=".csv,.xlsx,.xls"
+                            accept={SUPPORTED_EXTENSIONS.join(',')}
                             onChange={(e) => handleFile(e.target.files[0])}
                             className="hidden"
                         />
@@ -223,6 +249,7 @@ const UploadCrimesPage = () => {
                                     { label: 'Imported',   value: result.summary.created,    icon: CheckCircle2, bg: 'bg-green-50',  text: 'text-green-700' },
                                     { label: 'Skipped',    value: result.summary.skipped,    icon: SkipForward,  bg: 'bg-orange-50', text: 'text-orange-600'},
                                     { label: 'Errors',     value: result.summary.errors,     icon: XCircle,      bg: 'bg-red-50',    text: 'text-red-600'   },
+                                    { label: 'Duplicates', value: result.summary.duplicates, icon: SkipForward,  bg: 'bg-slate-50',  text: 'text-slate-600' },
                                 ].map(({ label, value, icon: Icon, bg, text }) => (
                                     <div key={label} className={`${bg} rounded-xl p-3 flex items-center gap-3`}>
                                         <Icon size={18} className={text} />
@@ -27,22 +27,21 @@ const DashboardPage = () => {
     useEffect(() => {
         const fetchAll = async () => {
             try {
-                const [ov, cat, sev, tr, hot, rec, alt] = await Promise.all([
-                    dashboardApi.getOverview(),
-                    dashboardApi.getCrimesByCategory(),
-                    dashboardApi.getCrimesBySeverity(),
-                    dashboardApi.getMonthlyTrends(),
-                    dashboardApi.getHotspots(),
-                    dashboardApi.getRecentCrimes(5),
-                    dashboardApi.getAlerts(),
+                const res = await dashboardApi.getBundle([
+                    'overview', 'by-category', 'by-severity', 'monthly',
+                    'hotspots', 'recent', 'alerts',
                 ]);
-                setOverview(ov.data);
-                setCategories(cat.data.data);
-                setSeverity(sev.data.data);
-                setTrends(tr.data.data);
-                setHotspots(hot.data.data);
-                setRecent(rec.data.data);
-                setAlerts(alt.data.data);
+                const w = res.data.widgets;
+                if (Object.keys(res.data.errors).length) {
+                    toast.error('Some dashboard widgets failed to load.');
+                }
+                setOverview(w.overview);
+                setCategories(w['by-category']?.data ?? []);
+                setSeverity(w['by-severity']?.data ?? []);
+                setTrends(w.monthly?.data ?? []);
+                setHotspots(w.hotspots?.data ?? []);
+                setRecent((w.recent?.data ?? []).slice(0, 5));
+                setAlerts(w.alerts?.data ?? []);
             } catch {
                 toast.error('Failed to load dashboard data.');
             } finally {
@@ -52,6 +51,54 @@ const DashboardPage = () => {
         fetchAll();
     }, []);
 
+    // ── Live feed: new crimes and alerts pushed by the server ──
+    useEffect(() => {
+        let source;
+        let retry;
+        const parse  = (e) => JSON.parse(e.data);
+        const open   = () => {
+            source = dashboardApi.openLiveFeed();
+            source.addEventListener('crime', (e) => {
+                const crime = parse(e);
+                setRecent((prev) => [crime, ...prev.filter((c) => c.id !== crime.id)].slice(0, 5));
+            });
+            source.addEventListener('alert', (e) => {
+                const alert = parse(e);
+                setAlerts((prev) => [alert, ...prev.filter((a) => a.id !== alert.id)].slice(0, 10));
+            });
+            source.addEventListener('alert-resolved', (e) => {
+                const { id } = parse(e);
+                setAlerts((prev) => prev.filter((a) => a.id !== id));
+            });
+            source.addEventListener('status', (e) => {
+                const crime = parse(e);
+                setRecent((prev) => prev.map((c) => (c.id === crime.id ? { ...c, status: crime.status } : c)));
+            });
+            source.addEventListener('crime-deleted', (e) => {
+                const { id } = parse(e);
+                setRecent((prev) => prev.filter((c) => c.id !== id));
+                setAlerts((prev) => prev.filter((a) => a.id !== id));
+            });
+            source.addEventListener('import', async () => {
+                const res = await dashboardApi.getBundle(['recent', 'alerts']);
+                setRecent((res.data.widgets.recent?.data ?? []).slice(0, 5));
+                setAlerts(res.data.widgets.alerts?.data ?? []);
+            });
+            // A rejected (e.g. expired-token) stream isn't retried by the
+            // browser; reopen it with the current token
+            source.onerror = () => {
+                if (source.readyState === EventSource.CLOSED) {
+                    retry = setTimeout(open, 5000);
+                }
+            };
+        };
+        open();
+        return () => {
+            clearTimeout(retry);
+            source?.close();
+        };
+    }, []);
+
     if (loading) return <LoadingSpinner message="Loading dashboard..." />;
 
     const riskColor = {